@@ -0,0 +1,29 @@
+"""Unique hotel names
+
+Revision ID: 3f9a6c1d2e84
+Revises: b7e41c2a9d6f
+Create Date: 2026-10-18 14:31:09.662013
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a6c1d2e84'
+down_revision: Union[str, None] = 'b7e41c2a9d6f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Fails if duplicate names already exist; rename them before upgrading.
+    op.drop_index('ix_hotels_name', table_name='hotels')
+    op.create_index(op.f('ix_hotels_name'), 'hotels', ['name'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_hotels_name'), table_name='hotels')
+    op.create_index('ix_hotels_name', 'hotels', ['name'], unique=False)
@@ -0,0 +1,34 @@
+"""Trigram search on group contracts
+
+Revision ID: 40d2cd0f9427
+Revises: 9ca84d790c80
+Create Date: 2026-10-18 13:01:15.013173
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '40d2cd0f9427'
+down_revision: Union[str, None] = '9ca84d790c80'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_group_contracts_group_name_trgm', 'group_contracts', ['group_name'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'group_name': 'gin_trgm_ops'})
+    op.create_index('ix_group_contracts_customer_trgm', 'group_contracts', ['customer'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'customer': 'gin_trgm_ops'})
+    op.create_index('ix_group_contracts_travel_agent_trgm', 'group_contracts', ['travel_agent'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'travel_agent': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_group_contracts_travel_agent_trgm', table_name='group_contracts')
+    op.drop_index('ix_group_contracts_customer_trgm', table_name='group_contracts')
+    op.drop_index('ix_group_contracts_group_name_trgm', table_name='group_contracts')
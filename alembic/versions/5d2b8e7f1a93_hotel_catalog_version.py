@@ -0,0 +1,26 @@
+"""Hotel catalog version
+
+Revision ID: 5d2b8e7f1a93
+Revises: 3f9a6c1d2e84
+Create Date: 2026-10-18 16:02:47.218530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2b8e7f1a93'
+down_revision: Union[str, None] = '3f9a6c1d2e84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('hotels', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('hotels', 'version')
@@ -0,0 +1,30 @@
+"""Season date range GiST index
+
+Revision ID: 8095abf3ea5d
+Revises: 40d2cd0f9427
+Create Date: 2026-10-18 13:20:41.528302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8095abf3ea5d'
+down_revision: Union[str, None] = '40d2cd0f9427'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # btree_gist lets the integer hotel_id share a GiST index with the date range.
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    op.create_index('ix_seasons_hotel_id_date_range', 'seasons',
+                    ['hotel_id', sa.text("daterange(start_date, end_date, '[]')")],
+                    unique=False, postgresql_using='gist')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_seasons_hotel_id_date_range', table_name='seasons')
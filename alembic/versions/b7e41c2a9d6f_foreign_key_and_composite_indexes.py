@@ -0,0 +1,47 @@
+"""Foreign key and composite indexes
+
+Revision ID: b7e41c2a9d6f
+Revises: 8095abf3ea5d
+Create Date: 2026-10-18 14:02:37.184619
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e41c2a9d6f'
+down_revision: Union[str, None] = '8095abf3ea5d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_meal_options_hotel_id', 'meal_options', ['hotel_id']),
+    ('ix_room_types_hotel_id', 'room_types', ['hotel_id']),
+    ('ix_special_offers_hotel_id', 'special_offers', ['hotel_id']),
+    ('ix_booking_policies_hotel_id', 'booking_policies', ['hotel_id']),
+    ('ix_diving_packages_season_id', 'diving_packages', ['season_id']),
+    ('ix_occupancy_rates_room_type_id_season_id', 'occupancy_rates', ['room_type_id', 'season_id']),
+    ('ix_occupancy_rates_season_id', 'occupancy_rates', ['season_id']),
+    ('ix_group_contracts_hotel_id_start_date', 'group_contracts', ['hotel_id', 'start_date']),
+    ('ix_group_contracts_diving_package_id', 'group_contracts', ['diving_package_id']),
+    ('ix_seasons_hotel_id_start_date', 'seasons', ['hotel_id', 'start_date']),
+    ('ix_user_profiles_user_id', 'user_profiles', ['user_id']),
+    ('ix_user_preferences_user_id', 'user_preferences', ['user_id']),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block, and avoids locking out writes
+    # on populated tables while the indexes build.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,41 @@
+"""Room allocations
+
+Revision ID: c4e9a7d3b215
+Revises: 5d2b8e7f1a93
+Create Date: 2026-10-18 17:12:05.391844
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e9a7d3b215'
+down_revision: Union[str, None] = '5d2b8e7f1a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('room_allocations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('group_contract_id', sa.Integer(), nullable=False),
+    sa.Column('room_type_id', sa.Integer(), nullable=False),
+    sa.Column('rooms', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['group_contract_id'], ['group_contracts.id'], ),
+    sa.ForeignKeyConstraint(['room_type_id'], ['room_types.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_room_allocations_id'), 'room_allocations', ['id'], unique=False)
+    op.create_index(op.f('ix_room_allocations_group_contract_id'), 'room_allocations', ['group_contract_id'],
+                    unique=False)
+    op.create_index(op.f('ix_room_allocations_room_type_id'), 'room_allocations', ['room_type_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_room_allocations_room_type_id'), table_name='room_allocations')
+    op.drop_index(op.f('ix_room_allocations_group_contract_id'), table_name='room_allocations')
+    op.drop_index(op.f('ix_room_allocations_id'), table_name='room_allocations')
+    op.drop_table('room_allocations')
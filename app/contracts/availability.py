@@ -0,0 +1,186 @@
+"""Per-hotel room inventory: how many rooms of each type group contracts hold on every night.
+
+Each room type's allocations live in a segment tree over nights that supports "add n rooms
+to [start, end)" and "most rooms held on any night of [start, end)", both O(log n), so
+neither booking a contract nor asking what is free rescans the hotel's contracts.
+
+A hotel's inventory is built from the database on first use (two queries) and cached together
+with the hotel ``version`` it reflects. Every write under a hotel bumps that version, so a
+cached inventory is only used while it is current, and ``create_group_contract`` locks the
+hotel row before checking, which serializes bookings for one hotel across worker processes.
+"""
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import models
+from app.core.cache import TTLCache
+
+
+class NightTree:
+    """Range-add / range-max segment tree over ``size`` nights starting at ``origin``.
+
+    ``peak[node]`` is the maximum over the node's range including its own pending ``add``,
+    which is never pushed down: queries add it back on the way up instead.
+    """
+
+    def __init__(self, origin: date, size: int):
+        self.origin = origin
+        self.size = size
+        self.add = [0] * (2 * size)
+        self.peak = [0] * (2 * size)
+        self.intervals = []
+
+    def covers(self, start: date, end: date) -> bool:
+        return self.origin <= start and end <= self.origin + timedelta(days=self.size)
+
+    def allocate(self, start: date, end: date, rooms: int):
+        self.intervals.append((start, end, rooms))
+        self._update(1, 0, self.size, (start - self.origin).days, (end - self.origin).days, rooms)
+
+    def peak_between(self, start: date, end: date) -> int:
+        return max(self._query(1, 0, self.size, (start - self.origin).days, (end - self.origin).days), 0)
+
+    def _update(self, node: int, low: int, high: int, start: int, end: int, rooms: int):
+        if end <= low or high <= start:
+            return
+        if start <= low and high <= end:
+            self.add[node] += rooms
+            self.peak[node] += rooms
+            return
+        middle = (low + high) // 2
+        self._update(2 * node, low, middle, start, end, rooms)
+        self._update(2 * node + 1, middle, high, start, end, rooms)
+        self.peak[node] = max(self.peak[2 * node], self.peak[2 * node + 1]) + self.add[node]
+
+    def _query(self, node: int, low: int, high: int, start: int, end: int) -> int:
+        if end <= low or high <= start:
+            return 0
+        if start <= low and high <= end:
+            return self.peak[node]
+        middle = (low + high) // 2
+        return max(self._query(2 * node, low, middle, start, end),
+                   self._query(2 * node + 1, middle, high, start, end)) + self.add[node]
+
+
+def _tree_for(start: date, end: date, tree: Optional[NightTree] = None) -> NightTree:
+    """A tree covering [start, end) and everything ``tree`` covered, replaying its intervals."""
+    if tree is not None:
+        start = min(start, tree.origin)
+        end = max(end, tree.origin + timedelta(days=tree.size))
+    size = 64
+    while size < (end - start).days:
+        size *= 2
+    grown = NightTree(start, size)
+    for interval in tree.intervals if tree is not None else ():
+        grown.allocate(*interval)
+    return grown
+
+
+class HotelAvailability:
+    def __init__(self, version: int, capacities: Dict[int, Optional[int]], allocations: Iterable = ()):
+        self.version = version
+        self.capacities = capacities
+        self._trees: Dict[int, NightTree] = {}
+        for allocation in allocations:
+            self.allocate(allocation.room_type_id, allocation.start_date, allocation.end_date, allocation.rooms)
+
+    def allocate(self, room_type_id: int, start_date: date, end_date: date, rooms: int):
+        tree = self._trees.get(room_type_id)
+        if tree is None or not tree.covers(start_date, end_date):
+            # Doubling keeps regrowth rare; a tree usually spans a few years of nights.
+            tree = self._trees[room_type_id] = _tree_for(start_date, end_date, tree)
+        tree.allocate(start_date, end_date, rooms)
+
+    def booked(self, room_type_id: int, start_date: date, end_date: date) -> int:
+        tree = self._trees.get(room_type_id)
+        if tree is None:
+            return 0
+        # Nights outside the tree have no allocations; clamp to the range it covers.
+        start_date = max(start_date, tree.origin)
+        end_date = min(end_date, tree.origin + timedelta(days=tree.size))
+        return tree.peak_between(start_date, end_date) if start_date < end_date else 0
+
+    def free(self, room_type_id: int, start_date: date, end_date: date) -> Optional[int]:
+        """Rooms free on every night of [start_date, end_date); None if the capacity is not set."""
+        capacity = self.capacities.get(room_type_id)
+        if capacity is None:
+            return None
+        return capacity - self.booked(room_type_id, start_date, end_date)
+
+
+# Entries are checked against the hotel version on every use; the TTL only reclaims memory.
+_inventories = TTLCache(maxsize=1024, ttl=24 * 60 * 60)
+
+
+async def load_availability(db: AsyncSession, hotel_id: int, version: int) -> HotelAvailability:
+    cached = _inventories.get(hotel_id)
+    if cached is not None and cached.version == version:
+        return cached
+    result = await db.execute(select(models.RoomType.id, models.RoomType.number_of_rooms).filter(
+        models.RoomType.hotel_id == hotel_id))
+    capacities = dict(result.all())
+    result = await db.execute(select(models.RoomAllocation.room_type_id, models.RoomAllocation.rooms,
+                                     models.GroupContract.start_date, models.GroupContract.end_date).join(
+        models.GroupContract, models.RoomAllocation.group_contract_id == models.GroupContract.id).filter(
+        models.GroupContract.hotel_id == hotel_id, models.GroupContract.start_date < models.GroupContract.end_date))
+    availability = HotelAvailability(version, capacities, result.all())
+    _inventories.set(hotel_id, availability)
+    return availability
+
+
+async def reserve_rooms(db: AsyncSession, group_contract: models.GroupContract) -> HotelAvailability:
+    """Lock the contract's hotel and check that its allocations fit; 400/409 if they do not.
+
+    Call inside the transaction that inserts the contract, then ``record_rooms`` once committed.
+    """
+    if group_contract.end_date <= group_contract.start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_date must be after start_date"
+        )
+    result = await db.execute(select(models.Hotel.version).filter(
+        models.Hotel.id == group_contract.hotel_id).with_for_update())
+    version = result.scalar()
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Hotel not found"
+        )
+    availability = await load_availability(db, group_contract.hotel_id, version)
+    requested: Dict[int, int] = {}
+    for allocation in group_contract.room_allocations:
+        requested[allocation.room_type_id] = requested.get(allocation.room_type_id, 0) + allocation.rooms
+    for room_type_id, rooms in requested.items():
+        if room_type_id not in availability.capacities:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Room type {room_type_id} does not belong to this hotel"
+            )
+        free = availability.free(room_type_id, group_contract.start_date, group_contract.end_date)
+        if free is not None and free < rooms:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Room type {room_type_id} has {max(free, 0)} rooms free between "
+                       f"{group_contract.start_date} and {group_contract.end_date}, {rooms} requested"
+            )
+    return availability
+
+
+def record_rooms(availability: HotelAvailability, group_contract: models.GroupContract):
+    """Apply a committed contract's allocations to the inventory ``reserve_rooms`` checked."""
+    for allocation in group_contract.room_allocations:
+        availability.allocate(allocation.room_type_id, group_contract.start_date, group_contract.end_date,
+                              allocation.rooms)
+    # The commit bumped the hotel version exactly once while the row was locked.
+    availability.version += 1
+
+
+def availability_payload(availability: HotelAvailability, start_date: date, end_date: date) -> List[dict]:
+    return [{'room_type_id': room_type_id, 'number_of_rooms': capacity,
+             'booked': availability.booked(room_type_id, start_date, end_date),
+             'free': availability.free(room_type_id, start_date, end_date)}
+            for room_type_id, capacity in sorted(availability.capacities.items())]
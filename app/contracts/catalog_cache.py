@@ -0,0 +1,142 @@
+"""Read-through cache for the hotel catalog.
+
+Catalog reads are served from an in-process LRU of per-hotel buckets and, when
+``catalog_cache_redis_url`` is set, from a shared Redis hash per hotel behind it. Values are
+the response schemas rather than ORM objects, so they are safe to share between sessions and
+serialize as JSON for the shared tier.
+
+Every entry records the hotel ``version`` it was loaded at, and callers pass the version they
+just read (the one their ETag is built from), so an entry from before a write is a miss
+rather than a stale body under a new ETag, whichever process made the write. ``crud`` also
+drops a hotel's entries from both tiers after committing a write, which frees them early.
+Lookups are counted in ``catalog_cache_lookups_total``, which ``/metrics`` exposes.
+"""
+import logging
+from typing import Awaitable, Callable, Iterable, Optional
+
+from pydantic import TypeAdapter
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+CATALOG_CACHE_LOOKUPS = Counter('catalog_cache_lookups_total', 'Catalog cache lookups by the tier that served them.',
+                                ('resource', 'result'))
+
+
+class RedisTier:
+    """Shared tier: one hash per hotel, so invalidating a hotel is a single DEL. Fields carry the version.
+
+    ``client`` is any ``redis.asyncio``-compatible client with ``decode_responses=True``.
+    Errors are logged and treated as misses; the local tier and the database still answer.
+    """
+
+    def __init__(self, client, ttl: float):
+        from redis.exceptions import RedisError
+
+        self.client = client
+        self.ttl = int(ttl)
+        self._errors = (RedisError, OSError)
+
+    @staticmethod
+    def _key(hotel_id: int) -> str:
+        return f'catalog:hotel:{hotel_id}'
+
+    async def get(self, hotel_id: int, key: str) -> Optional[str]:
+        try:
+            return await self.client.hget(self._key(hotel_id), key)
+        except self._errors as error:
+            logger.warning('Catalog cache read failed: %s', error)
+            return None
+
+    async def set(self, hotel_id: int, key: str, payload: str):
+        try:
+            async with self.client.pipeline(transaction=True) as pipe:
+                # NX keeps the TTL from the hash's first entry, so no bucket outlives it.
+                await pipe.hset(self._key(hotel_id), key, payload).expire(
+                    self._key(hotel_id), self.ttl, nx=True).execute()
+        except self._errors as error:
+            logger.warning('Catalog cache write failed: %s', error)
+
+    async def delete(self, hotel_ids: Iterable[int]):
+        keys = [self._key(hotel_id) for hotel_id in hotel_ids]
+        if not keys:
+            return
+        try:
+            await self.client.delete(*keys)
+        except self._errors as error:
+            logger.warning('Catalog cache invalidation failed: %s', error)
+
+
+def redis_tier_from_url(url: str) -> RedisTier:
+    try:
+        from redis import asyncio as redis
+    except ImportError:
+        raise RuntimeError('catalog_cache_redis_url is set but the redis package is not installed')
+    return RedisTier(redis.from_url(url, decode_responses=True), ttl=settings.catalog_cache_ttl_seconds)
+
+
+_local = TTLCache(maxsize=settings.catalog_cache_size, ttl=settings.catalog_cache_ttl_seconds)
+_shared: Optional[RedisTier] = (redis_tier_from_url(settings.catalog_cache_redis_url)
+                                if settings.catalog_cache_redis_url else None)
+# Bumped by every invalidation. A load that started before one is returned but not stored,
+# so a read racing a write cannot put the pre-write value back.
+_generation = 0
+
+
+def configure_shared_tier(tier: Optional[RedisTier]):
+    """Replace the shared tier, e.g. with one backed by a local Redis stand-in; ``None`` disables it."""
+    global _shared
+    _shared = tier
+
+
+async def read_through(resource: str, hotel_id: int, version: Optional[int], params: tuple, adapter: TypeAdapter,
+                       load: Callable[[], Awaitable]):
+    """Return the cached ``resource`` of ``hotel_id`` at ``version`` for ``params``, loading it on a miss.
+
+    ``load`` returns ORM objects, or ``None`` for a missing resource, which is not cached. A
+    ``version`` of ``None`` (no such hotel) bypasses the cache.
+    """
+    key = ':'.join(str(param) for param in (resource, f'v{version}', *params))
+    cached = _local.get(hotel_id)
+    if cached is not None and cached[0] == version and key in cached[1]:
+        CATALOG_CACHE_LOOKUPS.inc(resource=resource, result='local_hit')
+        return cached[1][key]
+
+    generation = _generation
+    payload = await _shared.get(hotel_id, key) if _shared is not None and version is not None else None
+    if payload is not None:
+        CATALOG_CACHE_LOOKUPS.inc(resource=resource, result='shared_hit')
+        value = adapter.validate_json(payload)
+    else:
+        CATALOG_CACHE_LOOKUPS.inc(resource=resource, result='miss')
+        loaded = await load()
+        if loaded is None:
+            return None
+        value = adapter.validate_python(loaded, from_attributes=True)
+        if version is None:
+            return value
+        if _shared is not None and generation == _generation:
+            await _shared.set(hotel_id, key, adapter.dump_json(value).decode())
+
+    if generation == _generation:
+        # Local buckets hold one version per hotel; a newer one replaces the bucket.
+        cached = _local.get(hotel_id)
+        if cached is None or cached[0] < version:
+            cached = (version, {})
+            _local.set(hotel_id, cached)
+        if cached[0] == version:
+            cached[1][key] = value
+    return value
+
+
+async def invalidate_hotels(hotel_ids: Iterable[int]):
+    global _generation
+    hotel_ids = set(hotel_ids)
+    _generation += 1
+    for hotel_id in hotel_ids:
+        _local.pop(hotel_id)
+    if _shared is not None:
+        await _shared.delete(hotel_ids)
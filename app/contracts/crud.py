@@ -1,6 +1,52 @@
-from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, Optional, Set
+from fastapi import HTTPException, status
+from pydantic import TypeAdapter
+from sqlalchemy import func, insert, literal, literal_column, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from . import models, schemas
-from datetime import datetime
+from .catalog_cache import invalidate_hotels, read_through
+from . import rate_matrix
+from .availability import record_rooms, reserve_rooms
+from .season_index import SeasonInterval, invalidate_season_index
+from app.db.errors import violated_constraint
+from app.db.pagination import paginate
+from app.db.projection import child_rows, row_dicts, schema_columns
+from datetime import date, datetime
+
+
+# Loader strategies for the nested response schemas. Each collection is fetched
+# with a single SELECT ... WHERE <fk> IN (...) for the whole page, so the number
+# of queries stays fixed regardless of how many rows are returned. Relationships
+# cannot lazy-load on an AsyncSession, so anything a response serializes must be
+# covered here.
+ROOM_TYPE_LOADER_OPTIONS = (
+    selectinload(models.RoomType.occupancy_rates),
+)
+
+SEASON_LOADER_OPTIONS = (
+    selectinload(models.Season.diving_packages),
+)
+
+HOTEL_LOADER_OPTIONS = (
+    selectinload(models.Hotel.room_types).selectinload(models.RoomType.occupancy_rates),
+    selectinload(models.Hotel.meal_options),
+    selectinload(models.Hotel.special_offers),
+    selectinload(models.Hotel.booking_policies),
+    selectinload(models.Hotel.group_contracts),
+)
+
+# Everything documents.contract_inputs reads from a contract besides its columns.
+CONTRACT_DOCUMENT_LOADER_OPTIONS = (
+    selectinload(models.GroupContract.room_allocations),
+    selectinload(models.GroupContract.diving_package),
+)
+
+
+# asyncpg caps a statement at 32767 bind parameters; bulk inserts are chunked to stay below it.
+MAX_BULK_PARAMETERS = 30000
 
 
 # Helper function for updating models
@@ -10,187 +56,393 @@ def update_model_from_schema(model, schema):
             setattr(model, var, value)
 
 
+async def bulk_insert(db: AsyncSession, model, rows: List[dict]) -> List[int]:
+    """Insert ``rows`` with multi-row INSERT ... RETURNING id and commit them as one transaction.
+
+    Ids come back in input order. Nothing is committed if any chunk fails, or if ``rows`` is
+    empty, so callers must not bump versions or patch caches for an empty batch.
+    """
+    ids = []
+    if not rows:
+        return ids
+    chunk_size = max(MAX_BULK_PARAMETERS // len(rows[0]), 1)
+    try:
+        for start in range(0, len(rows), chunk_size):
+            result = await db.execute(insert(model).values(rows[start:start + chunk_size]).returning(model.id))
+            ids.extend(result.scalars().all())
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return ids
+
+
+async def get_missing_ids(db: AsyncSession, model, ids: Iterable[int]) -> Set[int]:
+    ids = set(ids)
+    if not ids:
+        return ids
+    result = await db.execute(select(model.id).filter(model.id.in_(ids)))
+    return ids - set(result.scalars().all())
+
+
+async def bump_hotel_version(db: AsyncSession, hotel_ids) -> Dict[int, int]:
+    """Invalidate the catalog ETags of ``hotel_ids`` (ids or a select of ids) in the caller's transaction.
+
+    Returns the new version of each hotel bumped, keyed by id; pass it to ``invalidate_hotels``
+    (and to any ``rate_matrix`` patch) once committed.
+    """
+    result = await db.execute(update(models.Hotel).where(models.Hotel.id.in_(hotel_ids)).values(
+        version=models.Hotel.version + 1, updated_at=func.current_date()).returning(
+        models.Hotel.id, models.Hotel.version).execution_options(synchronize_session=False))
+    return dict(result.all())
+
+
+async def get_hotel_versions_by_id(db: AsyncSession, hotel_ids: Iterable[int]) -> Dict[int, int]:
+    """The current version of each of ``hotel_ids`` that exists."""
+    hotel_ids = set(hotel_ids)
+    if not hotel_ids:
+        return {}
+    result = await db.execute(select(models.Hotel.id, models.Hotel.version).filter(models.Hotel.id.in_(hotel_ids)))
+    return dict(result.all())
+
+
 # Hotel Operations
-def get_hotel(db: Session, hotel_id: int):
-    return db.query(models.Hotel).filter(models.Hotel.id == hotel_id).first()
+async def get_hotel(db: AsyncSession, hotel_id: int, options=()):
+    result = await db.execute(select(models.Hotel).options(*options).filter(models.Hotel.id == hotel_id))
+    return result.scalars().first()
 
 
-def get_hotel_by_name(db: Session, name: str):
-    return db.query(models.Hotel).filter(models.Hotel.name == name).first()
+async def get_hotel_by_name(db: AsyncSession, name: str):
+    result = await db.execute(select(models.Hotel).filter(models.Hotel.name == name))
+    return result.scalars().first()
 
 
-def get_hotels(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Hotel).offset(skip).limit(limit).all()
+async def get_hotels(db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, options=()):
+    query = select(models.Hotel).options(*options)
+    result = await db.execute(paginate(query, models.Hotel.id, skip, limit, cursor))
+    return result.scalars().all()
 
 
-def create_hotel(db: Session, hotel: schemas.HotelCreate):
-    db_hotel = models.Hotel(**hotel.model_dump())
-    db.add(db_hotel)
-    db.commit()
-    db.refresh(db_hotel)
-    return db_hotel
+async def get_hotel_version(db: AsyncSession, hotel_id: int) -> Optional[int]:
+    result = await db.execute(select(models.Hotel.version).filter(models.Hotel.id == hotel_id))
+    return result.scalar()
 
 
-def update_hotel(db: Session, hotel_id: int, hotel_data: schemas.HotelUpdate):
-    db_hotel = get_hotel(db, hotel_id)
-    if not db_hotel:
-        return None
+async def get_hotel_versions(db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    """``(id, version)`` of the hotels ``get_hotels`` would return for the same page."""
+    result = await db.execute(paginate(select(models.Hotel.id, models.Hotel.version), models.Hotel.id,
+                                       skip, limit, cursor))
+    return result.all()
+
+
+async def create_hotel(db: AsyncSession, hotel: schemas.HotelCreate):
+    # The unique index on hotels.name detects duplicates in the INSERT itself: a conflicting
+    # name returns no row instead of needing a lookup beforehand.
+    result = await db.execute(pg_insert(models.Hotel).values(**hotel.model_dump()).on_conflict_do_nothing(
+        index_elements=[models.Hotel.name]).returning(models.Hotel.id))
+    hotel_id = result.scalar()
+    await db.commit()
+    if hotel_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Hotel name already exists"
+        )
+    return await get_hotel(db, hotel_id, options=HOTEL_LOADER_OPTIONS)
+
+
+async def update_hotel(db: AsyncSession, db_hotel: models.Hotel, hotel_data: schemas.HotelUpdate):
+    """Apply ``hotel_data`` to ``db_hotel``, which must be loaded with ``HOTEL_LOADER_OPTIONS`` to serialize it."""
     update_model_from_schema(db_hotel, hotel_data)
-    db.commit()
-    db.refresh(db_hotel)
+    hotel_ids = await bump_hotel_version(db, [db_hotel.id])
+    try:
+        await db.commit()
+    except IntegrityError as error:
+        await db.rollback()
+        if violated_constraint(error) != 'ix_hotels_name':
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Hotel name already exists"
+        )
+    await invalidate_hotels(hotel_ids)
     return db_hotel
 
 
 # Diving Package Operations
-def get_diving_package(db: Session, diving_package_id: int):
-    return db.query(models.DivingPackage).filter(models.DivingPackage.id == diving_package_id).first()
+async def get_diving_package(db: AsyncSession, diving_package_id: int):
+    result = await db.execute(select(models.DivingPackage).filter(models.DivingPackage.id == diving_package_id))
+    return result.scalars().first()
 
 
-def get_diving_packages(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.DivingPackage).offset(skip).limit(limit).all()
+async def get_diving_packages(db: AsyncSession, season_id: int, skip: int = 0, limit: int = 100,
+                              cursor: Optional[str] = None):
+    query = select(models.DivingPackage).filter(models.DivingPackage.season_id == season_id)
+    result = await db.execute(paginate(query, models.DivingPackage.id, skip, limit, cursor))
+    return result.scalars().all()
 
 
-def create_diving_package(db: Session, diving_package: schemas.DivingPackageCreate):
-    db_diving_package = models.DivingPackage(**diving_package.model_dump())
+async def create_diving_package(db: AsyncSession, diving_package: schemas.DivingPackageCreate, season_id: int):
+    db_diving_package = models.DivingPackage(**diving_package.model_dump(exclude={'season_id'}), season_id=season_id)
     db.add(db_diving_package)
-    db.commit()
-    db.refresh(db_diving_package)
+    hotel_ids = await bump_hotel_version(db, select(models.Season.hotel_id).filter(models.Season.id == season_id))
+    await db.commit()
+    await invalidate_hotels(hotel_ids)
+    await db.refresh(db_diving_package)
     return db_diving_package
 
 
 # Room Type Operations
-def get_room_type(db: Session, room_type_id: int):
-    return db.query(models.RoomType).filter(models.RoomType.id == room_type_id).first()
+async def get_room_type(db: AsyncSession, room_type_id: int, options=()):
+    result = await db.execute(select(models.RoomType).options(*options).filter(models.RoomType.id == room_type_id))
+    return result.scalars().first()
 
 
-def get_room_types(db: Session, hotel_id: int, skip: int = 0, limit: int = 100):
-    return db.query(models.RoomType).filter(models.RoomType.hotel_id == hotel_id).offset(skip).limit(limit).all()
+async def get_room_types(db: AsyncSession, hotel_id: int, skip: int = 0, limit: int = 100,
+                         cursor: Optional[str] = None, options=()):
+    query = select(models.RoomType).options(*options).filter(models.RoomType.hotel_id == hotel_id)
+    result = await db.execute(paginate(query, models.RoomType.id, skip, limit, cursor))
+    return result.scalars().all()
 
 
-def create_room_type(db: Session, room_type: schemas.RoomTypeCreate, hotel_id: int):
-    db_room_type = models.RoomType(**room_type.model_dump(), hotel_id=hotel_id)
+async def create_room_type(db: AsyncSession, room_type: schemas.RoomTypeCreate, hotel_id: int):
+    db_room_type = models.RoomType(**room_type.model_dump(exclude={'hotel_id'}), hotel_id=hotel_id)
     db.add(db_room_type)
-    db.commit()
-    db.refresh(db_room_type)
-    return db_room_type
+    hotel_versions = await bump_hotel_version(db, [hotel_id])
+    await db.commit()
+    await invalidate_hotels(hotel_versions)
+    rate_matrix.add_room_types(hotel_versions, [db_room_type.id])
+    return await get_room_type(db, db_room_type.id, options=ROOM_TYPE_LOADER_OPTIONS)
+
+
+async def create_room_types(db: AsyncSession, room_types: List[schemas.RoomTypeCreate], hotel_id: int):
+    if not room_types:
+        return []
+    hotel_versions = await bump_hotel_version(db, [hotel_id])
+    ids = await bulk_insert(db, models.RoomType, [
+        {**room_type.model_dump(), 'hotel_id': hotel_id} for room_type in room_types])
+    await invalidate_hotels(hotel_versions)
+    rate_matrix.add_room_types(hotel_versions, ids)
+    return ids
 
 
 # Meal Option Operations
-def get_meal_option(db: Session, meal_option_id: int):
-    return db.query(models.MealOption).filter(models.MealOption.id == meal_option_id).first()
+async def get_meal_option(db: AsyncSession, meal_option_id: int):
+    result = await db.execute(select(models.MealOption).filter(models.MealOption.id == meal_option_id))
+    return result.scalars().first()
 
 
-def get_meal_options(db: Session, hotel_id: int, skip: int = 0, limit: int = 100):
-    return db.query(models.MealOption).filter(models.MealOption.hotel_id == hotel_id).offset(skip).limit(limit).all()
+async def get_meal_options(db: AsyncSession, hotel_id: int, skip: int = 0, limit: int = 100,
+                           cursor: Optional[str] = None):
+    query = select(models.MealOption).filter(models.MealOption.hotel_id == hotel_id)
+    result = await db.execute(paginate(query, models.MealOption.id, skip, limit, cursor))
+    return result.scalars().all()
 
 
-def create_meal_option(db: Session, meal_option: schemas.MealOptionCreate):
-    db_meal_option = models.MealOption(**meal_option.model_dump())
+async def create_meal_option(db: AsyncSession, meal_option: schemas.MealOptionCreate, hotel_id: int):
+    db_meal_option = models.MealOption(**meal_option.model_dump(exclude={'hotel_id'}), hotel_id=hotel_id)
     db.add(db_meal_option)
-    db.commit()
-    db.refresh(db_meal_option)
+    hotel_ids = await bump_hotel_version(db, [db_meal_option.hotel_id])
+    await db.commit()
+    await invalidate_hotels(hotel_ids)
+    await db.refresh(db_meal_option)
     return db_meal_option
 
 
+async def create_meal_options(db: AsyncSession, meal_options: List[schemas.MealOptionCreate], hotel_id: int):
+    if not meal_options:
+        return []
+    hotel_ids = await bump_hotel_version(db, [hotel_id])
+    ids = await bulk_insert(db, models.MealOption, [
+        {**meal_option.model_dump(), 'hotel_id': hotel_id} for meal_option in meal_options])
+    await invalidate_hotels(hotel_ids)
+    return ids
+
+
 # Special Offer Operations
-def get_special_offer(db: Session, special_offer_id: int):
-    return db.query(models.SpecialOffer).filter(models.SpecialOffer.id == special_offer_id).first()
+async def get_special_offer(db: AsyncSession, special_offer_id: int):
+    result = await db.execute(select(models.SpecialOffer).filter(models.SpecialOffer.id == special_offer_id))
+    return result.scalars().first()
 
 
-def get_special_offers(db: Session, hotel_id: int, skip: int = 0, limit: int = 100):
-    return db.query(models.SpecialOffer).filter(models.SpecialOffer.hotel_id == hotel_id).offset(skip).limit(
-        limit).all()
+async def get_special_offers(db: AsyncSession, hotel_id: int, skip: int = 0, limit: int = 100,
+                             cursor: Optional[str] = None):
+    query = select(models.SpecialOffer).filter(models.SpecialOffer.hotel_id == hotel_id)
+    result = await db.execute(paginate(query, models.SpecialOffer.id, skip, limit, cursor))
+    return result.scalars().all()
 
 
-def create_special_offer(db: Session, special_offer: schemas.SpecialOfferCreate):
-    db_special_offer = models.SpecialOffer(**special_offer.model_dump())
+async def create_special_offer(db: AsyncSession, special_offer: schemas.SpecialOfferCreate, hotel_id: int):
+    db_special_offer = models.SpecialOffer(**special_offer.model_dump(exclude={'hotel_id'}), hotel_id=hotel_id)
     db.add(db_special_offer)
-    db.commit()
-    db.refresh(db_special_offer)
+    hotel_ids = await bump_hotel_version(db, [db_special_offer.hotel_id])
+    await db.commit()
+    await invalidate_hotels(hotel_ids)
+    await db.refresh(db_special_offer)
     return db_special_offer
 
 
 # Booking Policy Operations
-def get_booking_policy(db: Session, booking_policy_id: int):
-    return db.query(models.BookingPolicy).filter(models.BookingPolicy.id == booking_policy_id).first()
+async def get_booking_policy(db: AsyncSession, booking_policy_id: int):
+    result = await db.execute(select(models.BookingPolicy).filter(models.BookingPolicy.id == booking_policy_id))
+    return result.scalars().first()
 
 
-def get_booking_policies(db: Session, hotel_id: int, skip: int = 0, limit: int = 100):
-    return db.query(models.BookingPolicy).filter(models.BookingPolicy.hotel_id == hotel_id).offset(skip).limit(
-        limit).all()
+async def get_booking_policies(db: AsyncSession, hotel_id: int, skip: int = 0, limit: int = 100,
+                               cursor: Optional[str] = None):
+    query = select(models.BookingPolicy).filter(models.BookingPolicy.hotel_id == hotel_id)
+    result = await db.execute(paginate(query, models.BookingPolicy.id, skip, limit, cursor))
+    return result.scalars().all()
 
 
-def create_booking_policy(db: Session, booking_policy: schemas.BookingPolicyCreate):
-    db_booking_policy = models.BookingPolicy(**booking_policy.model_dump())
+async def create_booking_policy(db: AsyncSession, booking_policy: schemas.BookingPolicyCreate, hotel_id: int):
+    db_booking_policy = models.BookingPolicy(**booking_policy.model_dump(exclude={'hotel_id'}), hotel_id=hotel_id)
     db.add(db_booking_policy)
-    db.commit()
-    db.refresh(db_booking_policy)
+    hotel_ids = await bump_hotel_version(db, [db_booking_policy.hotel_id])
+    await db.commit()
+    await invalidate_hotels(hotel_ids)
+    await db.refresh(db_booking_policy)
     return db_booking_policy
 
 
-def update_booking_policy(db: Session, booking_policy_id: int, booking_policy_data: schemas.BookingPolicyUpdate):
-    db_booking_policy = get_booking_policy(db, booking_policy_id)
+async def update_booking_policy(db: AsyncSession, booking_policy_id: int,
+                                booking_policy_data: schemas.BookingPolicyUpdate):
+    db_booking_policy = await get_booking_policy(db, booking_policy_id)
     if not db_booking_policy:
         return None
+    previous_hotel_id = db_booking_policy.hotel_id
     update_model_from_schema(db_booking_policy, booking_policy_data)
-    db.commit()
-    db.refresh(db_booking_policy)
+    hotel_ids = await bump_hotel_version(db, {previous_hotel_id, db_booking_policy.hotel_id})
+    await db.commit()
+    await invalidate_hotels(hotel_ids)
+    await db.refresh(db_booking_policy)
     return db_booking_policy
 
 
-def delete_booking_policy(db: Session, booking_policy_id: int):
-    db_booking_policy = get_booking_policy(db, booking_policy_id)
+async def delete_booking_policy(db: AsyncSession, booking_policy_id: int):
+    db_booking_policy = await get_booking_policy(db, booking_policy_id)
     if not db_booking_policy:
         return None
-    db.delete(db_booking_policy)
-    db.commit()
+    await db.delete(db_booking_policy)
+    hotel_ids = await bump_hotel_version(db, [db_booking_policy.hotel_id])
+    await db.commit()
+    await invalidate_hotels(hotel_ids)
     return db_booking_policy
 
 
 # Season Operations
-def get_season(db: Session, season_id: int):
-    return db.query(models.Season).filter(models.Season.id == season_id).first()
+async def get_season(db: AsyncSession, season_id: int, options=()):
+    result = await db.execute(select(models.Season).options(*options).filter(models.Season.id == season_id))
+    return result.scalars().first()
+
+
+def season_date_range():
+    # Matches the expression of the (hotel_id, daterange) GiST index on seasons.
+    return func.daterange(models.Season.start_date, models.Season.end_date, literal_column("'[]'"))
 
 
-def get_seasons(db: Session, hotel_id: int, skip: int = 0, limit: int = 100):
-    return db.query(models.Season).filter(models.Season.hotel_id == hotel_id).offset(skip).limit(limit).all()
+async def get_seasons(db: AsyncSession, hotel_id: int, skip: int = 0, limit: int = 100,
+                      cursor: Optional[str] = None, start_date: date = None, end_date: date = None, options=()):
+    query = select(models.Season).options(*options).filter(models.Season.hotel_id == hotel_id)
+    if start_date is not None and end_date is not None:
+        # Seasons overlapping the stay [start_date, end_date), answered by the GiST index.
+        query = query.filter(season_date_range().op('&&')(func.daterange(start_date, end_date, '[)')))
+    result = await db.execute(paginate(query, models.Season.id, skip, limit, cursor))
+    return result.scalars().all()
 
 
-def create_season(db: Session, season: schemas.SeasonCreate):
-    db_season = models.Season(**season.model_dump())
+async def create_season(db: AsyncSession, season: schemas.SeasonCreate, hotel_id: int):
+    db_season = models.Season(**season.model_dump(exclude={'hotel_id'}), hotel_id=hotel_id)
     db.add(db_season)
-    db.commit()
-    db.refresh(db_season)
+    hotel_versions = await bump_hotel_version(db, [db_season.hotel_id])
+    await db.commit()
+    await invalidate_hotels(hotel_versions)
+    invalidate_season_index(db_season.hotel_id)
+    rate_matrix.add_seasons(hotel_versions, [db_season])
+    return await get_season(db, db_season.id, options=SEASON_LOADER_OPTIONS)
+
+
+async def create_seasons(db: AsyncSession, seasons: List[schemas.SeasonCreate], hotel_id: int):
+    if not seasons:
+        return []
+    hotel_versions = await bump_hotel_version(db, [hotel_id])
+    ids = await bulk_insert(db, models.Season, [{**season.model_dump(), 'hotel_id': hotel_id} for season in seasons])
+    await invalidate_hotels(hotel_versions)
+    invalidate_season_index(hotel_id)
+    rate_matrix.add_seasons(hotel_versions, [SeasonInterval(season_id, season.start_date, season.end_date)
+                                       for season_id, season in zip(ids, seasons)])
+    return ids
+
+
+async def update_season(db: AsyncSession, db_season: models.Season, season_data: schemas.SeasonUpdate):
+    """Apply ``season_data`` to ``db_season``, which must be loaded with ``SEASON_LOADER_OPTIONS`` to serialize it."""
+    previous_hotel_id = db_season.hotel_id
+    update_model_from_schema(db_season, season_data)
+    hotel_ids = await bump_hotel_version(db, {previous_hotel_id, db_season.hotel_id})
+    await db.commit()
+    await invalidate_hotels(hotel_ids)
+    for hotel_id in (previous_hotel_id, db_season.hotel_id):
+        invalidate_season_index(hotel_id)
+        rate_matrix.invalidate_rate_matrix(hotel_id)
     return db_season
 
 
 # Occupancy Rate Operations
-def get_occupancy_rate(db: Session, occupancy_rate_id: int):
-    return db.query(models.OccupancyRate).filter(models.OccupancyRate.id == occupancy_rate_id).first()
+async def get_occupancy_rate(db: AsyncSession, occupancy_rate_id: int):
+    result = await db.execute(select(models.OccupancyRate).filter(models.OccupancyRate.id == occupancy_rate_id))
+    return result.scalars().first()
 
 
-def get_occupancy_rates(db: Session, room_type_id: int, season_id: int, skip: int = 0, limit: int = 100):
-    return db.query(models.OccupancyRate).filter(models.OccupancyRate.room_type_id == room_type_id,
-                                                 models.OccupancyRate.season_id == season_id).offset(skip).limit(
-        limit).all()
+async def get_occupancy_rates(db: AsyncSession, room_type_id: int, season_id: int, skip: int = 0, limit: int = 100,
+                              cursor: Optional[str] = None):
+    query = select(models.OccupancyRate).filter(models.OccupancyRate.room_type_id == room_type_id,
+                                                models.OccupancyRate.season_id == season_id)
+    result = await db.execute(paginate(query, models.OccupancyRate.id, skip, limit, cursor))
+    return result.scalars().all()
 
 
-def create_occupancy_rate(db: Session, occupancy_rate: schemas.OccupancyRateCreate):
+async def create_occupancy_rate(db: AsyncSession, occupancy_rate: schemas.OccupancyRateCreate):
     db_occupancy_rate = models.OccupancyRate(**occupancy_rate.model_dump())
     db.add(db_occupancy_rate)
-    db.commit()
-    db.refresh(db_occupancy_rate)
+    hotel_versions = await bump_hotel_version(db, select(models.RoomType.hotel_id).filter(
+        models.RoomType.id == db_occupancy_rate.room_type_id))
+    await db.commit()
+    await invalidate_hotels(hotel_versions)
+    rate_matrix.set_rates(hotel_versions, [db_occupancy_rate])
+    await db.refresh(db_occupancy_rate)
     return db_occupancy_rate
 
 
+async def create_occupancy_rates(db: AsyncSession, occupancy_rates: List[schemas.OccupancyRateCreate]):
+    if not occupancy_rates:
+        return []
+    hotel_versions = await bump_hotel_version(db, select(models.RoomType.hotel_id).filter(
+        models.RoomType.id.in_({occupancy_rate.room_type_id for occupancy_rate in occupancy_rates})))
+    ids = await bulk_insert(db, models.OccupancyRate, [
+        occupancy_rate.model_dump() for occupancy_rate in occupancy_rates])
+    await invalidate_hotels(hotel_versions)
+    rate_matrix.set_rates(hotel_versions, occupancy_rates)
+    return ids
+
+
 # Group Contract Operations
-def get_group_contract(db: Session, group_contract_id: int):
-    return db.query(models.GroupContract).filter(models.GroupContract.id == group_contract_id).first()
+async def get_group_contract(db: AsyncSession, group_contract_id: int, options=()):
+    result = await db.execute(select(models.GroupContract).options(*options).filter(
+        models.GroupContract.id == group_contract_id))
+    return result.scalars().first()
+
 
+async def get_season_group_contracts(db: AsyncSession, season: models.Season, skip: int = 0, limit: int = 100,
+                                     cursor: Optional[str] = None, options=()):
+    """Contracts of the season's hotel with at least one night in the season."""
+    query = select(models.GroupContract).options(*options).filter(
+        models.GroupContract.hotel_id == season.hotel_id, models.GroupContract.start_date <= season.end_date,
+        models.GroupContract.end_date > season.start_date)
+    result = await db.execute(paginate(query, models.GroupContract.id, skip, limit, cursor))
+    return result.scalars().all()
 
-def get_group_contracts(db: Session, hotel_id: int = None, group_name: str = None, customer: str = None,
-                        start_date: str = None, travel_agent: str = None, skip: int = 0, limit: int = 10):
-    query = db.query(models.GroupContract)
+
+def filter_group_contracts(query, hotel_id: int = None, group_name: str = None, customer: str = None,
+                           start_date: str = None, travel_agent: str = None):
     if hotel_id is not None:
         query = query.filter(models.GroupContract.hotel_id == hotel_id)
     if group_name is not None:
@@ -206,12 +458,158 @@ def get_group_contracts(db: Session, hotel_id: int = None, group_name: str = Non
             pass
     if travel_agent is not None:
         query = query.filter(models.GroupContract.travel_agent.ilike(f'%{travel_agent}%'))
-    return query.offset(skip).limit(limit).all()
+    return query
+
+
+async def get_group_contracts(db: AsyncSession, hotel_id: int = None, group_name: str = None, customer: str = None,
+                              start_date: str = None, travel_agent: str = None, skip: int = 0, limit: int = 10,
+                              cursor: Optional[str] = None):
+    query = filter_group_contracts(select(models.GroupContract), hotel_id, group_name, customer, start_date,
+                                   travel_agent)
+    result = await db.execute(paginate(query, models.GroupContract.id, skip, limit, cursor))
+    return result.scalars().all()
+
+
+async def search_group_contracts(db: AsyncSession, term: str, hotel_id: int = None, limit: int = 20):
+    # Every predicate is served by the pg_trgm GIN indexes: ILIKE for substrings and the
+    # word-similarity operator (<%) for misspellings, ranked by the best matching column.
+    columns = (models.GroupContract.group_name, models.GroupContract.customer, models.GroupContract.travel_agent)
+    score = func.greatest(*(func.word_similarity(term, column) for column in columns))
+    query = select(models.GroupContract, score.label('score')).filter(
+        or_(*(column.ilike(f'%{term}%') for column in columns),
+            *(literal(term).op('<%')(column) for column in columns)))
+    if hotel_id is not None:
+        query = query.filter(models.GroupContract.hotel_id == hotel_id)
+    result = await db.execute(query.order_by(score.desc(), models.GroupContract.id).limit(limit))
+    return result.all()
 
 
-def create_group_contract(db: Session, group_contract: schemas.GroupContractCreate):
-    db_group_contract = models.GroupContract(**group_contract.model_dump())
+async def create_group_contract(db: AsyncSession, group_contract: schemas.GroupContractCreate, hotel_id: int):
+    db_group_contract = models.GroupContract(
+        **group_contract.model_dump(exclude={'hotel_id', 'room_allocations'}), hotel_id=hotel_id,
+        room_allocations=[models.RoomAllocation(**allocation.model_dump())
+                          for allocation in group_contract.room_allocations])
+    inventory = await reserve_rooms(db, db_group_contract) if db_group_contract.room_allocations else None
     db.add(db_group_contract)
-    db.commit()
-    db.refresh(db_group_contract)
+    hotel_ids = await bump_hotel_version(db, [db_group_contract.hotel_id])
+    await db.commit()
+    await invalidate_hotels(hotel_ids)
+    if inventory is not None:
+        record_rooms(inventory, db_group_contract)
+    await db.refresh(db_group_contract)
     return db_group_contract
+
+
+# Cached Catalog Reads
+# Read-through variants of the getters above for the GET endpoints (see catalog_cache.py).
+# They return response schemas instead of ORM objects, so never write through them. Pass the
+# hotel version the response's ETag was built from; entries from other versions are misses.
+HOTEL_ADAPTER = TypeAdapter(schemas.Hotel)
+ROOM_TYPES_ADAPTER = TypeAdapter(List[schemas.RoomType])
+MEAL_OPTIONS_ADAPTER = TypeAdapter(List[schemas.MealOption])
+SEASONS_ADAPTER = TypeAdapter(List[schemas.Season])
+BOOKING_POLICIES_ADAPTER = TypeAdapter(List[schemas.BookingPolicy])
+
+
+async def get_hotel_cached(db: AsyncSession, hotel_id: int, version: Optional[int]) -> Optional[schemas.Hotel]:
+    return await read_through('hotel', hotel_id, version, (), HOTEL_ADAPTER,
+                              lambda: get_hotel(db, hotel_id, options=HOTEL_LOADER_OPTIONS))
+
+
+async def get_room_types_cached(db: AsyncSession, hotel_id: int, version: Optional[int], skip: int = 0,
+                                limit: int = 100, cursor: Optional[str] = None) -> List[schemas.RoomType]:
+    return await read_through('room_types', hotel_id, version, (skip, limit, cursor), ROOM_TYPES_ADAPTER,
+                              lambda: get_room_types(db, hotel_id, skip, limit, cursor,
+                                                     options=ROOM_TYPE_LOADER_OPTIONS))
+
+
+async def get_meal_options_cached(db: AsyncSession, hotel_id: int, version: Optional[int], skip: int = 0,
+                                  limit: int = 100, cursor: Optional[str] = None) -> List[schemas.MealOption]:
+    return await read_through('meal_options', hotel_id, version, (skip, limit, cursor), MEAL_OPTIONS_ADAPTER,
+                              lambda: get_meal_options(db, hotel_id, skip, limit, cursor))
+
+
+async def get_seasons_cached(db: AsyncSession, hotel_id: int, version: Optional[int], skip: int = 0,
+                             limit: int = 100, cursor: Optional[str] = None, start_date: date = None,
+                             end_date: date = None) -> List[schemas.Season]:
+    return await read_through('seasons', hotel_id, version, (skip, limit, cursor, start_date, end_date),
+                              SEASONS_ADAPTER,
+                              lambda: get_seasons(db, hotel_id, skip, limit, cursor, start_date, end_date,
+                                                  options=SEASON_LOADER_OPTIONS))
+
+
+async def get_booking_policies_cached(db: AsyncSession, hotel_id: int, version: Optional[int], skip: int = 0,
+                                      limit: int = 100, cursor: Optional[str] = None) -> List[schemas.BookingPolicy]:
+    return await read_through('booking_policies', hotel_id, version, (skip, limit, cursor),
+                              BOOKING_POLICIES_ADAPTER,
+                              lambda: get_booking_policies(db, hotel_id, skip, limit, cursor))
+
+
+# Projected Reads
+# Plain column selects shaped like the response schemas (see app/db/projection.py) for list
+# endpoints that send them with FastJSONResponse instead of validating ORM objects.
+async def get_hotel_rows(db: AsyncSession, skip: int = 0, limit: int = 100,
+                         cursor: Optional[str] = None) -> List[dict]:
+    """The page ``get_hotels`` would return with ``HOTEL_LOADER_OPTIONS``, as ``schemas.Hotel`` dicts."""
+    result = await db.execute(paginate(select(*schema_columns(models.Hotel, schemas.Hotel)), models.Hotel.id,
+                                       skip, limit, cursor))
+    hotels = row_dicts(result)
+    hotel_ids = [hotel['id'] for hotel in hotels]
+    room_types = await child_rows(db, models.RoomType, schemas.RoomType, models.RoomType.hotel_id, hotel_ids)
+    occupancy_rates = await child_rows(db, models.OccupancyRate, schemas.OccupancyRate,
+                                       models.OccupancyRate.room_type_id,
+                                       [room_type['id'] for group in room_types.values() for room_type in group])
+    for group in room_types.values():
+        for room_type in group:
+            room_type['occupancy_rates'] = occupancy_rates[room_type['id']]
+    children = {
+        'room_types': room_types,
+        'meal_options': await child_rows(db, models.MealOption, schemas.MealOption, models.MealOption.hotel_id,
+                                         hotel_ids),
+        'special_offers': await child_rows(db, models.SpecialOffer, schemas.SpecialOffer,
+                                           models.SpecialOffer.hotel_id, hotel_ids),
+        'booking_policies': await child_rows(db, models.BookingPolicy, schemas.BookingPolicy,
+                                             models.BookingPolicy.hotel_id, hotel_ids),
+        'group_contracts': await child_rows(db, models.GroupContract, schemas.GroupContract,
+                                            models.GroupContract.hotel_id, hotel_ids),
+    }
+    for hotel in hotels:
+        for field, groups in children.items():
+            hotel[field] = groups[hotel['id']]
+    # Keys in the schema's field order, as response_model would emit them.
+    return [{field: hotel[field] for field in schemas.Hotel.model_fields} for hotel in hotels]
+
+
+async def get_group_contract_rows(db: AsyncSession, hotel_id: int = None, skip: int = 0, limit: int = 10,
+                                  cursor: Optional[str] = None) -> List[dict]:
+    query = filter_group_contracts(select(*schema_columns(models.GroupContract, schemas.GroupContract)), hotel_id)
+    return row_dicts(await db.execute(paginate(query, models.GroupContract.id, skip, limit, cursor)))
+
+
+# Export Queries
+# Plain column selects (no ORM entities) so streamed rows skip the identity map.
+def group_contract_export_query(hotel_id: int):
+    return select(*models.GroupContract.__table__.columns).filter(
+        models.GroupContract.hotel_id == hotel_id).order_by(models.GroupContract.id)
+
+
+def season_export_query(hotel_id: int):
+    return select(*models.Season.__table__.columns).filter(
+        models.Season.hotel_id == hotel_id).order_by(models.Season.start_date, models.Season.id)
+
+
+def occupancy_rate_export_query(hotel_id: int):
+    """One row per (season, room type, occupancy type) rate of the hotel's rate sheet."""
+    return select(
+        models.Season.id.label('season_id'),
+        models.Season.name.label('season_name'),
+        models.Season.start_date,
+        models.Season.end_date,
+        models.RoomType.id.label('room_type_id'),
+        models.RoomType.name.label('room_type_name'),
+        models.OccupancyRate.occupancy_type,
+        models.OccupancyRate.rate,
+    ).join(models.Season, models.OccupancyRate.season_id == models.Season.id).join(
+        models.RoomType, models.OccupancyRate.room_type_id == models.RoomType.id).filter(
+        models.Season.hotel_id == hotel_id).order_by(
+        models.Season.start_date, models.Season.id, models.RoomType.id, models.OccupancyRate.occupancy_type)
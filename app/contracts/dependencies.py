@@ -0,0 +1,65 @@
+from fastapi import Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import crud, models
+from app.dependencies import get_db
+
+
+class HotelById:
+    """Resolve the ``hotel_id`` path parameter to its hotel, loaded with ``options``, or 404.
+
+    FastAPI resolves a dependency once per request, so an endpoint and the dependencies it
+    shares an instance with all get the same object from a single lookup.
+    """
+
+    def __init__(self, options=()):
+        self.options = tuple(options)
+
+    async def __call__(self, hotel_id: int, db: AsyncSession = Depends(get_db)) -> models.Hotel:
+        db_hotel = await crud.get_hotel(db, hotel_id, options=self.options)
+        if db_hotel is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Hotel not found"
+            )
+        return db_hotel
+
+
+class SeasonById:
+    """Resolve the ``season_id`` path parameter to its season, loaded with ``options``, or 404."""
+
+    def __init__(self, options=()):
+        self.options = tuple(options)
+
+    async def __call__(self, season_id: int, db: AsyncSession = Depends(get_db)) -> models.Season:
+        db_season = await crud.get_season(db, season_id, options=self.options)
+        if db_season is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Season not found"
+            )
+        return db_season
+
+
+class GroupContractById:
+    """Resolve the ``group_contract_id`` path parameter to its contract, loaded with ``options``, or 404."""
+
+    def __init__(self, options=()):
+        self.options = tuple(options)
+
+    async def __call__(self, group_contract_id: int, db: AsyncSession = Depends(get_db)) -> models.GroupContract:
+        db_group_contract = await crud.get_group_contract(db, group_contract_id, options=self.options)
+        if db_group_contract is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Group contract not found"
+            )
+        return db_group_contract
+
+
+# Shared instances; a bare HotelById() is the existence guard for endpoints that only need the id.
+hotel_exists = HotelById()
+hotel_with_catalog = HotelById(crud.HOTEL_LOADER_OPTIONS)
+season_with_packages = SeasonById(crud.SEASON_LOADER_OPTIONS)
+season_by_id = SeasonById()
+group_contract_for_document = GroupContractById(crud.CONTRACT_DOCUMENT_LOADER_OPTIONS)
@@ -0,0 +1,168 @@
+"""Render group contract documents from plain input data.
+
+Documents are pure functions of the dict built by ``documents.contract_inputs``, which holds
+only strings, numbers, lists and dicts. This module imports nothing beyond the standard
+library, so process-pool workers start quickly and the inputs pickle cheaply.
+
+``html`` output is print-ready: an A4 page layout whose sections do not split across pages,
+for any HTML-to-PDF converter or a browser's print dialog.
+"""
+import html
+from enum import Enum
+from typing import List
+
+# Part of every cache key; bump it whenever the output of a template changes.
+TEMPLATE_VERSION = 1
+
+
+class DocumentFormat(str, Enum):
+    text = 'text'
+    html = 'html'
+
+
+MEDIA_TYPES = {
+    DocumentFormat.text: 'text/plain',
+    DocumentFormat.html: 'text/html',
+}
+
+
+def _money(value) -> str:
+    return '-' if value is None else f'{value:,.2f}'
+
+
+def _rate_rows(season: dict) -> List[List[str]]:
+    """One row per room type: its name, then the rate for each of the season's occupancy types."""
+    rows = {}
+    for rate in season['rates']:
+        rows.setdefault(rate['room_type'], {})[rate['occupancy_type']] = rate['rate']
+    return [[room_type] + [_money(rates.get(occupancy_type)) for occupancy_type in season['occupancy_types']]
+            for room_type, rates in rows.items()]
+
+
+def render_text(inputs: dict) -> str:
+    contract, hotel = inputs['contract'], inputs['hotel']
+    title = f"GROUP CONTRACT #{contract['id']}"
+    lines = [title, '=' * len(title), '',
+             f"Hotel: {hotel['name']}"]
+    lines += [f'{label}: {hotel[key]}' for label, key in (('Location', 'location'), ('Contact', 'contact_info'))
+              if hotel[key]]
+    lines += ['', f"Group: {contract['group_name']}", f"Customer: {contract['customer']}"]
+    if contract['travel_agent']:
+        lines.append(f"Travel agent: {contract['travel_agent']}")
+    lines.append(f"Stay: {contract['start_date']} to {contract['end_date']} ({inputs['nights']} nights)")
+
+    if inputs['allocations']:
+        lines += ['', 'Room allocations']
+        lines += [f"  {allocation['room_type']}: {allocation['rooms']} rooms" for allocation in inputs['allocations']]
+    if inputs['seasons']:
+        lines += ['', 'Seasons and rates (per room per night)']
+        for season in inputs['seasons']:
+            lines.append(f"  {season['name'] or ''} ({season['start_date']} to {season['end_date']}), "
+                         f"{season['nights']} nights of the stay")
+            for label, key in (('Hotel FOC', 'hotel_foc_slots'), ('Diving FOC', 'diving_foc_slots')):
+                if season[key]:
+                    lines.append(f'    {label}: {season[key]}')
+            if season['rates']:
+                lines.append('    ' + '  '.join(['Room type'] + season['occupancy_types']))
+                lines += ['    ' + '  '.join(row) for row in _rate_rows(season)]
+    if inputs['uncovered_nights']:
+        lines += ['', f"Nights without a season: {inputs['uncovered_nights']}"]
+    if inputs['diving_package']:
+        lines += ['', f"Diving package: {inputs['diving_package']['name']}, "
+                      f"{_money(inputs['diving_package']['price'])} per guest"]
+    if inputs['special_offers']:
+        lines += ['', 'Special offers']
+        lines += [f"  - {offer['name']}" + (f": {offer['description']}" if offer['description'] else '')
+                  for offer in inputs['special_offers']]
+    if inputs['booking_policies']:
+        lines += ['', 'Booking policies']
+        for policy in inputs['booking_policies']:
+            lines.append(f"  {policy['name']}")
+            if policy['text']:
+                lines += [f'    {line}' for line in policy['text'].splitlines()]
+    for heading, text in (('Hotel policies', hotel['policies']), ('Terms', contract['terms'])):
+        if text:
+            lines += ['', heading] + [f'  {line}' for line in text.splitlines()]
+    return '\n'.join(lines) + '\n'
+
+
+_STYLE = """@page { size: A4; margin: 20mm; }
+body { font-family: sans-serif; font-size: 10pt; }
+section { break-inside: avoid; margin-top: 1.5em; }
+table { border-collapse: collapse; }
+th, td { border: 1px solid #999; padding: 2px 6px; text-align: left; }
+td.rate { text-align: right; }"""
+
+
+def _paragraphs(text: str) -> str:
+    return ''.join(f'<p>{html.escape(line)}</p>' for line in text.splitlines() if line.strip())
+
+
+def render_html(inputs: dict) -> str:
+    escape = html.escape
+    contract, hotel = inputs['contract'], inputs['hotel']
+    title = f"Group contract #{contract['id']}"
+    details = [('Hotel', hotel['name']), ('Location', hotel['location']), ('Contact', hotel['contact_info']),
+               ('Group', contract['group_name']), ('Customer', contract['customer']),
+               ('Travel agent', contract['travel_agent']),
+               ('Stay', f"{contract['start_date']} to {contract['end_date']} ({inputs['nights']} nights)")]
+    parts = [f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{escape(title)}</title>'
+             f'<style>{_STYLE}</style></head><body><h1>{escape(title)}</h1><table>']
+    parts += [f'<tr><th>{label}</th><td>{escape(str(value))}</td></tr>' for label, value in details if value]
+    parts.append('</table>')
+
+    if inputs['allocations']:
+        parts.append('<section><h2>Room allocations</h2><table><tr><th>Room type</th><th>Rooms</th></tr>')
+        parts += [f"<tr><td>{escape(allocation['room_type'])}</td><td>{allocation['rooms']}</td></tr>"
+                  for allocation in inputs['allocations']]
+        parts.append('</table></section>')
+    for season in inputs['seasons']:
+        parts.append(f"<section><h2>{escape(season['name'] or '')}</h2>"
+                     f"<p>{season['start_date']} to {season['end_date']}, {season['nights']} nights of the stay</p>")
+        for label, key in (('Hotel FOC', 'hotel_foc_slots'), ('Diving FOC', 'diving_foc_slots')):
+            if season[key]:
+                parts.append(f'<p>{label}: {escape(season[key])}</p>')
+        if season['rates']:
+            parts.append('<table><tr><th>Room type</th>' + ''.join(
+                f'<th>{escape(occupancy_type)}</th>' for occupancy_type in season['occupancy_types']) + '</tr>')
+            for room_type, *rates in _rate_rows(season):
+                parts.append(f'<tr><td>{escape(room_type)}</td>' + ''.join(
+                    f'<td class="rate">{rate}</td>' for rate in rates) + '</tr>')
+            parts.append('</table><p>Rates are per room per night.</p>')
+        parts.append('</section>')
+    if inputs['uncovered_nights']:
+        parts.append(f"<section><p>Nights without a season: {inputs['uncovered_nights']}</p></section>")
+    if inputs['diving_package']:
+        parts.append(f"<section><h2>Diving package</h2><p>{escape(inputs['diving_package']['name'])}, "
+                     f"{_money(inputs['diving_package']['price'])} per guest</p></section>")
+    if inputs['special_offers']:
+        parts.append('<section><h2>Special offers</h2><ul>')
+        parts += [f"<li><strong>{escape(offer['name'])}</strong>"
+                  + (f": {escape(offer['description'])}" if offer['description'] else '') + '</li>'
+                  for offer in inputs['special_offers']]
+        parts.append('</ul></section>')
+    if inputs['booking_policies']:
+        parts.append('<section><h2>Booking policies</h2>')
+        parts += [f"<h3>{escape(policy['name'])}</h3>{_paragraphs(policy['text'] or '')}"
+                  for policy in inputs['booking_policies']]
+        parts.append('</section>')
+    for heading, text in (('Hotel policies', hotel['policies']), ('Terms', contract['terms'])):
+        if text:
+            parts.append(f'<section><h2>{heading}</h2>{_paragraphs(text)}</section>')
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+
+RENDERERS = {
+    DocumentFormat.text: render_text,
+    DocumentFormat.html: render_html,
+}
+
+
+def render_document(inputs: dict, document_format: DocumentFormat) -> str:
+    return RENDERERS[DocumentFormat(document_format)](inputs)
+
+
+def render_documents(inputs: List[dict], document_format: DocumentFormat) -> List[str]:
+    """Render a chunk of documents; the unit of work sent to a pool worker."""
+    return [render_document(document_inputs, document_format) for document_inputs in inputs]
@@ -0,0 +1,207 @@
+"""Group contract documents assembled from the hotel's catalog and rates.
+
+``contract_inputs`` collects everything a document shows (the contract and its allocations,
+the hotel with its booking policies and special offers, and the seasons the stay falls in
+with their rates from the hotel's rate matrix) as plain data. Rendering is a pure function
+of that data, so documents are cached under the SHA-256 of the inputs, the format and
+``TEMPLATE_VERSION``. Downloading a document again reuses the cached render, and clients
+holding its ETag get a 304. Any change to the underlying rows yields a new key rather than
+a stale document.
+
+A season's documents are rendered together. When enough of them are missing from the cache,
+they are spread over a process pool of ``contract_render_workers`` workers.
+"""
+import asyncio
+import hashlib
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import models
+from .document_render import TEMPLATE_VERSION, DocumentFormat, render_document, render_documents
+from .rate_matrix import get_rate_matrix
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import Counter
+from app.quotes.engine import OCCUPANCY_TYPES
+
+CONTRACT_DOCUMENT_RENDERS = Counter('contract_document_renders_total',
+                                    'Contract documents requested, by whether the render was cached.', ('result',))
+
+# Below this many missing documents, pickling them to the pool costs more than rendering inline.
+POOL_MIN_DOCUMENTS = 32
+
+_documents = TTLCache(maxsize=settings.contract_document_cache_size, ttl=24 * 60 * 60)
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+async def load_document_context(db: AsyncSession, hotel_id: int, start_date: date, end_date: date) -> dict:
+    """Hotel data shared by the documents of contracts staying within [start_date, end_date).
+
+    The rate matrix is fetched at the version of the hotel row read here, and the seasons and
+    room types are then looked up by the ids in it, so the rates and the rows describing them
+    always agree.
+    """
+    result = await db.execute(select(models.Hotel.name, models.Hotel.location, models.Hotel.contact_info,
+                                     models.Hotel.policies, models.Hotel.version).filter(models.Hotel.id == hotel_id))
+    hotel = result.first()
+    result = await db.execute(select(models.BookingPolicy.name, models.BookingPolicy.policy_text).filter(
+        models.BookingPolicy.hotel_id == hotel_id).order_by(models.BookingPolicy.id))
+    booking_policies = [{'name': name, 'text': text} for name, text in result.all()]
+    result = await db.execute(select(models.SpecialOffer.name, models.SpecialOffer.description).filter(
+        models.SpecialOffer.hotel_id == hotel_id).order_by(models.SpecialOffer.id))
+    special_offers = [{'name': name, 'description': description} for name, description in result.all()]
+    table = await get_rate_matrix(db, hotel_id, hotel.version)
+    positions, covered = table.covering(np.arange(np.datetime64(start_date, 'D'), np.datetime64(end_date, 'D')))
+    result = await db.execute(select(models.Season.id, models.Season.hotel_foc_slots,
+                                     models.Season.diving_foc_slots, models.Season.name).filter(
+        models.Season.id.in_(table.season_ids[np.unique(positions[covered])].tolist())))
+    seasons = {season.id: season for season in result.all()}
+    result = await db.execute(select(models.RoomType.id, models.RoomType.name).filter(
+        models.RoomType.id.in_(table.room_type_ids)))
+    return {
+        'hotel': {'name': hotel.name, 'location': hotel.location, 'contact_info': hotel.contact_info,
+                  'policies': hotel.policies},
+        'booking_policies': booking_policies,
+        'special_offers': special_offers,
+        'seasons': seasons,
+        'room_types': dict(result.all()),
+        'rates': table,
+    }
+
+
+def contract_inputs(context: dict, group_contract: models.GroupContract) -> dict:
+    """Everything the document of ``group_contract`` shows, as plain JSON-compatible data.
+
+    ``group_contract`` must be loaded with ``crud.CONTRACT_DOCUMENT_LOADER_OPTIONS``.
+    """
+    table = context['rates']
+    nights = np.arange(np.datetime64(group_contract.start_date, 'D'), np.datetime64(group_contract.end_date, 'D'))
+    positions, covered = table.covering(nights)
+    allocated = {allocation.room_type_id for allocation in group_contract.room_allocations}
+    # Rates are shown for the allocated room types, or for all of them when nothing is allocated.
+    room_type_positions = [position for position, room_type_id in enumerate(table.room_type_ids)
+                           if not allocated or room_type_id in allocated]
+
+    seasons = []
+    for position, night_count in zip(*np.unique(positions[covered], return_counts=True)):
+        season = context['seasons'][int(table.season_ids[position])]
+        rates = table.rates[position]
+        seasons.append({
+            'name': season.name,
+            'start_date': table.season_starts[position].item().isoformat(),
+            'end_date': table.season_ends[position].item().isoformat(),
+            'nights': int(night_count),
+            'hotel_foc_slots': season.hotel_foc_slots,
+            'diving_foc_slots': season.diving_foc_slots,
+            # Only the occupancy types priced for at least one of the shown room types get a column.
+            'occupancy_types': [occupancy_type.value for occupancy, occupancy_type in enumerate(OCCUPANCY_TYPES)
+                                if not np.isnan(rates[room_type_positions, occupancy]).all()],
+            'rates': [{'room_type': context['room_types'][table.room_type_ids[room_type]],
+                       'occupancy_type': occupancy_type.value, 'rate': float(rates[room_type, occupancy])}
+                      for room_type in room_type_positions
+                      for occupancy, occupancy_type in enumerate(OCCUPANCY_TYPES)
+                      if not np.isnan(rates[room_type, occupancy])],
+        })
+    diving_package = group_contract.diving_package
+    return {
+        'contract': {'id': group_contract.id, 'group_name': group_contract.group_name,
+                     'customer': group_contract.customer, 'travel_agent': group_contract.travel_agent,
+                     'start_date': group_contract.start_date.isoformat(),
+                     'end_date': group_contract.end_date.isoformat(), 'terms': group_contract.contract},
+        'hotel': context['hotel'],
+        'nights': len(nights),
+        'uncovered_nights': int((~covered).sum()),
+        'allocations': [{'room_type': context['room_types'][allocation.room_type_id], 'rooms': allocation.rooms}
+                        for allocation in group_contract.room_allocations],
+        'seasons': seasons,
+        'diving_package': {'name': diving_package.name, 'price': diving_package.price} if diving_package else None,
+        'booking_policies': context['booking_policies'],
+        'special_offers': context['special_offers'],
+    }
+
+
+def document_digest(inputs: dict, document_format: DocumentFormat) -> str:
+    payload = json.dumps([TEMPLATE_VERSION, document_format.value, inputs], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def document_etag(digest: str) -> str:
+    return f'"contract-{digest[:32]}"'
+
+
+def _pool() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # Spawned rather than forked: the server process runs an event loop and thread pools,
+        # and workers only need the standard-library rendering module.
+        _executor = ProcessPoolExecutor(max_workers=settings.contract_render_workers,
+                                        mp_context=multiprocessing.get_context('spawn'))
+    return _executor
+
+
+def shutdown_render_pool():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+async def _render_missing(inputs: List[dict], document_format: DocumentFormat) -> List[str]:
+    workers = settings.contract_render_workers
+    if workers < 1 or len(inputs) < POOL_MIN_DOCUMENTS:
+        return render_documents(inputs, document_format)
+    loop = asyncio.get_running_loop()
+    size = -(-len(inputs) // workers)
+    chunks = await asyncio.gather(*(loop.run_in_executor(_pool(), render_documents, inputs[start:start + size],
+                                                         document_format)
+                                    for start in range(0, len(inputs), size)))
+    return [document for chunk in chunks for document in chunk]
+
+
+async def get_contract_document(db: AsyncSession, group_contract: models.GroupContract,
+                                document_format: DocumentFormat) -> Tuple[str, str]:
+    """``(digest, document)`` for one contract; rendered inline, since one document is cheap."""
+    context = await load_document_context(db, group_contract.hotel_id, group_contract.start_date,
+                                          group_contract.end_date)
+    inputs = contract_inputs(context, group_contract)
+    digest = document_digest(inputs, document_format)
+    document = _documents.get(digest)
+    CONTRACT_DOCUMENT_RENDERS.inc(result='hit' if document is not None else 'miss')
+    if document is None:
+        document = render_document(inputs, document_format)
+        _documents.set(digest, document)
+    return digest, document
+
+
+async def get_contract_documents(db: AsyncSession, hotel_id: int, group_contracts: Sequence[models.GroupContract],
+                                 document_format: DocumentFormat) -> List[Tuple[int, str, str]]:
+    """``(group contract id, digest, document)`` for contracts of one hotel, in order."""
+    if not group_contracts:
+        return []
+    context = await load_document_context(db, hotel_id, min(contract.start_date for contract in group_contracts),
+                                          max(contract.end_date for contract in group_contracts))
+    digests, documents, missing = [], {}, {}
+    for group_contract in group_contracts:
+        inputs = contract_inputs(context, group_contract)
+        digest = document_digest(inputs, document_format)
+        digests.append(digest)
+        document = _documents.get(digest)
+        if document is not None:
+            documents[digest] = document
+        else:
+            missing[digest] = inputs
+    CONTRACT_DOCUMENT_RENDERS.inc(len(documents), result='hit')
+    CONTRACT_DOCUMENT_RENDERS.inc(len(missing), result='miss')
+    rendered = await _render_missing(list(missing.values()), document_format)
+    for digest, document in zip(missing, rendered):
+        _documents.set(digest, document)
+        documents[digest] = document
+    return [(group_contract.id, digest, documents[digest])
+            for group_contract, digest in zip(group_contracts, digests)]
@@ -1,64 +1,109 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-
-from . import crud, schemas
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
+from datetime import date
+
+from . import crud, models, schemas
+from .availability import availability_payload, load_availability
+from .dependencies import (group_contract_for_document, hotel_exists, hotel_with_catalog, season_by_id,
+                           season_with_packages)
+from .document_render import MEDIA_TYPES, DocumentFormat
+from .documents import document_etag, get_contract_document, get_contract_documents
+from .rate_matrix import get_rate_matrix, rate_matrix_payload
+from app.core.http_cache import check_etag, hotel_etag, hotels_etag
+from app.core.query_debug import query_budget
+from app.core.responses import fast_json_response
+from app.db.export import ExportFormat, export_response
+from app.db.pagination import set_next_cursor
 from app.dependencies import get_db
 
 router = APIRouter()
 
 
+async def hotel_not_modified(request: Request, response: Response, db: AsyncSession,
+                             hotel_id: int) -> Tuple[Optional[int], Optional[Response]]:
+    """ETag the catalog resources of ``hotel_id``.
+
+    Returns the hotel's version, ``None`` if there is no such hotel, and the 304 to send if
+    the client is current.
+
+    The ETag covers the query string too, so each page or date range is validated on its own.
+    The version is read before the resource itself, so a write landing in between leaves the
+    response newer than its ETag and the client merely refetches on its next request.
+    """
+    version = await crud.get_hotel_version(db, hotel_id)
+    if version is None:
+        return None, None
+    return version, check_etag(request, response, hotel_etag(hotel_id, version, request.query_params.multi_items()))
+
+
 @router.get('/hotels', response_model=List[schemas.Hotel], tags=['Group Contract Operations'])
-async def read_hotels(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_hotels(db, skip=skip, limit=limit)
+@query_budget(8)
+async def read_hotels(request: Request, response: Response, skip: int = 0, limit: int = 100,
+                      cursor: Optional[str] = None, db: AsyncSession = Depends(get_db)):
+    versions = await crud.get_hotel_versions(db, skip=skip, limit=limit, cursor=cursor)
+    not_modified = check_etag(request, response, hotels_etag(versions))
+    if not_modified:
+        return not_modified
+    hotels = await crud.get_hotel_rows(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, hotels, limit, cursor)
+    return fast_json_response(hotels, response)
 
 
 @router.get('/hotels/{hotel_id}', response_model=schemas.Hotel, tags=['Group Contract Operations'])
-async def read_hotel(hotel_id: int, db: Session = Depends(get_db)):
-    if not crud.get_hotel(db, hotel_id=hotel_id):
+@query_budget(8)
+async def read_hotel(hotel_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_db)):
+    version = await crud.get_hotel_version(db, hotel_id)
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Hotel not found"
+        )
+    not_modified = check_etag(request, response, hotel_etag(hotel_id, version))
+    if not_modified:
+        return not_modified
+    db_hotel = await crud.get_hotel_cached(db, hotel_id=hotel_id, version=version)
+    if not db_hotel:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Hotel not found"
         )
-    return crud.get_hotel(db, hotel_id=hotel_id)
+    return db_hotel
 
 
 @router.post('/hotels', response_model=schemas.Hotel, tags=['Group Contract Operations'])
-async def create_hotel(hotel: schemas.HotelCreate, db: Session = Depends(get_db)):
-    if crud.get_hotel_by_name(db, name=hotel.name):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Hotel name already exists"
-        )
-    return crud.create_hotel(db, hotel=hotel)
+async def create_hotel(hotel: schemas.HotelCreate, db: AsyncSession = Depends(get_db)):
+    return await crud.create_hotel(db, hotel=hotel)
 
 
 @router.put('/hotels/{hotel_id}', response_model=schemas.Hotel, tags=['Group Contract Operations'])
-async def update_hotel(hotel_id: int, hotel: schemas.HotelUpdate, db: Session = Depends(get_db)):
-    db_hotel = crud.get_hotel(db, hotel_id=hotel_id)
-    if not db_hotel:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Hotel not found"
-        )
-    return crud.update_hotel(db, hotel_id=hotel_id, hotel_data=hotel)
+@query_budget(9)
+async def update_hotel(hotel: schemas.HotelUpdate, db_hotel: models.Hotel = Depends(hotel_with_catalog),
+                       db: AsyncSession = Depends(get_db)):
+    return await crud.update_hotel(db, db_hotel=db_hotel, hotel_data=hotel)
 
 
 @router.get('/hotels/{hotel_id}/booking_policies', response_model=List[schemas.BookingPolicy],
             tags=['Group Contract Operations'])
-async def get_booking_policies(hotel_id: int, db: Session = Depends(get_db)):
-    policies = crud.get_booking_policies(db, hotel_id=hotel_id)
+async def get_booking_policies(hotel_id: int, request: Request, response: Response, skip: int = 0,
+                               limit: int = 100, cursor: Optional[str] = None, db: AsyncSession = Depends(get_db)):
+    version, not_modified = await hotel_not_modified(request, response, db, hotel_id)
+    if not_modified:
+        return not_modified
+    policies = await crud.get_booking_policies_cached(db, hotel_id=hotel_id, version=version, skip=skip,
+                                                      limit=limit, cursor=cursor)
     if not policies:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Booking policies not found"
         )
+    set_next_cursor(response, policies, limit, cursor)
     return policies
 
 
 @router.get('/hotels/booking_policy/{id}', response_model=schemas.BookingPolicy, tags=['Group Contract Operations'])
-async def get_booking_policy(booking_policy_id: int, db: Session = Depends(get_db)):
-    policy = crud.get_booking_policy(db, booking_policy_id=booking_policy_id)
+async def get_booking_policy(booking_policy_id: int, db: AsyncSession = Depends(get_db)):
+    policy = await crud.get_booking_policy(db, booking_policy_id=booking_policy_id)
     if not policy:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -68,93 +113,263 @@ async def get_booking_policy(booking_policy_id: int, db: Session = Depends(get_d
 
 
 @router.post('/hotels/{hotel_id}/booking_policies', response_model=schemas.BookingPolicy,
-             tags=['Group Contract Operations'])
-async def create_booking_policy(booking_policy: schemas.BookingPolicyCreate, db: Session = Depends(get_db)):
-    return crud.create_booking_policy(db, booking_policy=booking_policy)
+             tags=['Group Contract Operations'], dependencies=[Depends(hotel_exists)])
+async def create_booking_policy(hotel_id: int, booking_policy: schemas.BookingPolicyCreate,
+                                db: AsyncSession = Depends(get_db)):
+    return await crud.create_booking_policy(db, booking_policy=booking_policy, hotel_id=hotel_id)
 
 
 # Room Type Operations
 @router.get('/hotels/{hotel_id}/room_types', response_model=List[schemas.RoomType], tags=['Room Type Operations'])
-async def read_room_types(hotel_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_room_types(db, hotel_id=hotel_id, skip=skip, limit=limit)
+@query_budget(3)
+async def read_room_types(hotel_id: int, request: Request, response: Response, skip: int = 0, limit: int = 100,
+                          cursor: Optional[str] = None, db: AsyncSession = Depends(get_db)):
+    version, not_modified = await hotel_not_modified(request, response, db, hotel_id)
+    if not_modified:
+        return not_modified
+    room_types = await crud.get_room_types_cached(db, hotel_id=hotel_id, version=version, skip=skip, limit=limit,
+                                                  cursor=cursor)
+    set_next_cursor(response, room_types, limit, cursor)
+    return room_types
 
 
-@router.post('/hotels/{hotel_id}/room_types', response_model=schemas.RoomType, tags=['Room Type Operations'])
-async def create_room_type(hotel_id: int, room_type: schemas.RoomTypeCreate, db: Session = Depends(get_db)):
-    return crud.create_room_type(db, room_type=room_type, hotel_id=hotel_id)
+@router.post('/hotels/{hotel_id}/room_types', response_model=schemas.RoomType, tags=['Room Type Operations'],
+             dependencies=[Depends(hotel_exists)])
+async def create_room_type(hotel_id: int, room_type: schemas.RoomTypeCreate, db: AsyncSession = Depends(get_db)):
+    return await crud.create_room_type(db, room_type=room_type, hotel_id=hotel_id)
+
+
+@router.post('/hotels/{hotel_id}/room_types:bulk', response_model=schemas.BulkCreateResult,
+             tags=['Room Type Operations'], dependencies=[Depends(hotel_exists)])
+async def create_room_types(hotel_id: int, room_types: List[schemas.RoomTypeCreate] = Body(..., min_length=1),
+                            db: AsyncSession = Depends(get_db)):
+    return {'ids': await crud.create_room_types(db, room_types=room_types, hotel_id=hotel_id)}
 
 
 # Meal Option Operations
 @router.get('/hotels/{hotel_id}/meal_options', response_model=List[schemas.MealOption], tags=['Meal Option Operations'])
-async def get_meal_options(hotel_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_meal_options(db, hotel_id=hotel_id, skip=skip, limit=limit)
+async def get_meal_options(hotel_id: int, request: Request, response: Response, skip: int = 0, limit: int = 100,
+                           cursor: Optional[str] = None, db: AsyncSession = Depends(get_db)):
+    version, not_modified = await hotel_not_modified(request, response, db, hotel_id)
+    if not_modified:
+        return not_modified
+    meal_options = await crud.get_meal_options_cached(db, hotel_id=hotel_id, version=version, skip=skip,
+                                                      limit=limit, cursor=cursor)
+    set_next_cursor(response, meal_options, limit, cursor)
+    return meal_options
+
 
+@router.post('/hotels/{hotel_id}/meal_options', response_model=schemas.MealOption, tags=['Meal Option Operations'],
+             dependencies=[Depends(hotel_exists)])
+async def create_meal_option(hotel_id: int, meal_option: schemas.MealOptionCreate, db: AsyncSession = Depends(get_db)):
+    return await crud.create_meal_option(db, meal_option=meal_option, hotel_id=hotel_id)
 
-@router.post('/hotels/{hotel_id}/meal_options', response_model=schemas.MealOption, tags=['Meal Option Operations'])
-async def create_meal_option(hotel_id: int, meal_option: schemas.MealOptionCreate, db: Session = Depends(get_db)):
-    return crud.create_meal_option(db, meal_option=meal_option)
+
+@router.post('/hotels/{hotel_id}/meal_options:bulk', response_model=schemas.BulkCreateResult,
+             tags=['Meal Option Operations'], dependencies=[Depends(hotel_exists)])
+async def create_meal_options(hotel_id: int, meal_options: List[schemas.MealOptionCreate] = Body(..., min_length=1),
+                              db: AsyncSession = Depends(get_db)):
+    return {'ids': await crud.create_meal_options(db, meal_options=meal_options, hotel_id=hotel_id)}
 
 
 # Diving Package Operations
 @router.get('/seasons/{season_id}/diving_packages', response_model=List[schemas.DivingPackage],
             tags=['Diving Package Operations'])
-async def get_diving_packages(season_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_diving_packages(db, skip=skip, limit=limit)
+async def get_diving_packages(season_id: int, response: Response, skip: int = 0, limit: int = 100,
+                              cursor: Optional[str] = None, db: AsyncSession = Depends(get_db)):
+    diving_packages = await crud.get_diving_packages(db, season_id=season_id, skip=skip, limit=limit,
+                                                     cursor=cursor)
+    set_next_cursor(response, diving_packages, limit, cursor)
+    return diving_packages
 
 
 @router.post('/seasons/{season_id}/diving_packages', response_model=schemas.DivingPackage,
-             tags=['Diving Package Operations'])
+             tags=['Diving Package Operations'], dependencies=[Depends(season_by_id)])
 async def create_diving_package(season_id: int, diving_package: schemas.DivingPackageCreate,
-                                db: Session = Depends(get_db)):
-    return crud.create_diving_package(db, diving_package=diving_package)
+                                db: AsyncSession = Depends(get_db)):
+    return await crud.create_diving_package(db, diving_package=diving_package, season_id=season_id)
 
 
 # Special Offer Operations
 @router.get('/hotels/{hotel_id}/special_offers', response_model=List[schemas.SpecialOffer],
             tags=['Special Offer Operations'])
-async def get_special_offers(hotel_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_special_offers(db, hotel_id=hotel_id, skip=skip, limit=limit)
+async def get_special_offers(hotel_id: int, request: Request, response: Response, skip: int = 0,
+                             limit: int = 100, cursor: Optional[str] = None, db: AsyncSession = Depends(get_db)):
+    _, not_modified = await hotel_not_modified(request, response, db, hotel_id)
+    if not_modified:
+        return not_modified
+    special_offers = await crud.get_special_offers(db, hotel_id=hotel_id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, special_offers, limit, cursor)
+    return special_offers
 
 
 @router.post('/hotels/{hotel_id}/special_offers', response_model=schemas.SpecialOffer,
-             tags=['Special Offer Operations'])
-async def create_special_offer(hotel_id: int, special_offer: schemas.SpecialOfferCreate, db: Session = Depends(get_db)):
-    return crud.create_special_offer(db, special_offer=special_offer)
+             tags=['Special Offer Operations'], dependencies=[Depends(hotel_exists)])
+async def create_special_offer(hotel_id: int, special_offer: schemas.SpecialOfferCreate,
+                               db: AsyncSession = Depends(get_db)):
+    return await crud.create_special_offer(db, special_offer=special_offer, hotel_id=hotel_id)
 
 
 # Group Contract Operations
 @router.get('/hotels/{hotel_id}/group_contracts', response_model=List[schemas.GroupContract],
             tags=['Group Contract Operations'])
-async def get_group_contracts(hotel_id: int, skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    return crud.get_group_contracts(db, hotel_id=hotel_id, skip=skip, limit=limit)
+async def get_group_contracts(hotel_id: int, response: Response, skip: int = 0, limit: int = 10,
+                              cursor: Optional[str] = None, db: AsyncSession = Depends(get_db)):
+    group_contracts = await crud.get_group_contract_rows(db, hotel_id=hotel_id, skip=skip, limit=limit,
+                                                         cursor=cursor)
+    set_next_cursor(response, group_contracts, limit, cursor)
+    return fast_json_response(group_contracts, response)
+
+
+@router.get('/hotels/{hotel_id}/group_contracts/export', tags=['Group Contract Operations'],
+            dependencies=[Depends(hotel_exists)])
+async def export_group_contracts(hotel_id: int, format: ExportFormat = ExportFormat.csv):
+    return export_response(crud.group_contract_export_query(hotel_id), format,
+                           filename=f'hotel_{hotel_id}_group_contracts')
+
+
+@router.get('/group_contracts/search', response_model=List[schemas.GroupContractSearchResult],
+            tags=['Group Contract Operations'])
+async def search_group_contracts(q: str = Query(..., min_length=3), hotel_id: Optional[int] = None,
+                                 limit: int = Query(20, le=100), db: AsyncSession = Depends(get_db)):
+    rows = await crud.search_group_contracts(db, term=q, hotel_id=hotel_id, limit=limit)
+    return [schemas.GroupContractSearchResult(**schemas.GroupContract.model_validate(
+        group_contract, from_attributes=True).model_dump(), score=score) for group_contract, score in rows]
 
 
 @router.post('/hotels/{hotel_id}/group_contracts', response_model=schemas.GroupContract,
-             tags=['Group Contract Operations'])
+             tags=['Group Contract Operations'], dependencies=[Depends(hotel_exists)])
 async def create_group_contract(hotel_id: int, group_contract: schemas.GroupContractCreate,
-                                db: Session = Depends(get_db)):
-    return crud.create_group_contract(db, group_contract=group_contract)
+                                db: AsyncSession = Depends(get_db)):
+    return await crud.create_group_contract(db, group_contract=group_contract, hotel_id=hotel_id)
+
+
+@router.get('/group_contracts/{group_contract_id}/document', response_class=Response,
+            responses={200: {'content': {media_type: {} for media_type in MEDIA_TYPES.values()}}},
+            tags=['Group Contract Operations'])
+@query_budget(11)
+async def read_contract_document(request: Request, format: DocumentFormat = DocumentFormat.html,
+                                 db_group_contract: models.GroupContract = Depends(group_contract_for_document),
+                                 db: AsyncSession = Depends(get_db)):
+    """The contract document, assembled from the hotel's policies, offers, seasons and rates."""
+    digest, document = await get_contract_document(db, db_group_contract, format)
+    response = Response(document, media_type=MEDIA_TYPES[format])
+    return check_etag(request, response, document_etag(digest)) or response
+
+
+@router.get('/hotels/{hotel_id}/availability', response_model=List[schemas.RoomTypeAvailability],
+            tags=['Group Contract Operations'])
+@query_budget(3)
+async def read_availability(start_date: date, end_date: date, db_hotel: models.Hotel = Depends(hotel_exists),
+                            db: AsyncSession = Depends(get_db)):
+    """Rooms of each type held by group contracts, and still free, on every night of [start_date, end_date)."""
+    if end_date <= start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_date must be after start_date"
+        )
+    availability = await load_availability(db, db_hotel.id, db_hotel.version)
+    return availability_payload(availability, start_date, end_date)
 
 
 # Occupancy Rate Operations
 @router.get('/room_types/{room_type_id}/seasons/{season_id}/occupancy_rates',
             response_model=List[schemas.OccupancyRate], tags=['Occupancy Rate Operations'])
-async def get_occupancy_rates(room_type_id: int, season_id: int, skip: int = 0, limit: int = 100,
-                              db: Session = Depends(get_db)):
-    return crud.get_occupancy_rates(db, room_type_id=room_type_id, season_id=season_id, skip=skip, limit=limit)
+async def get_occupancy_rates(room_type_id: int, season_id: int, response: Response, skip: int = 0, limit: int = 100,
+                              cursor: Optional[str] = None, db: AsyncSession = Depends(get_db)):
+    occupancy_rates = await crud.get_occupancy_rates(db, room_type_id=room_type_id, season_id=season_id, skip=skip,
+                                                     limit=limit, cursor=cursor)
+    set_next_cursor(response, occupancy_rates, limit, cursor)
+    return occupancy_rates
+
+
+@router.get('/hotels/{hotel_id}/occupancy_rates/export', tags=['Occupancy Rate Operations'],
+            dependencies=[Depends(hotel_exists)])
+async def export_occupancy_rates(hotel_id: int, format: ExportFormat = ExportFormat.csv):
+    return export_response(crud.occupancy_rate_export_query(hotel_id), format,
+                           filename=f'hotel_{hotel_id}_rate_sheet')
+
+
+@router.get('/hotels/{hotel_id}/rate_matrix', response_model=schemas.RateMatrix, tags=['Occupancy Rate Operations'])
+@query_budget(4)
+async def read_rate_matrix(request: Request, response: Response, db_hotel: models.Hotel = Depends(hotel_exists),
+                           db: AsyncSession = Depends(get_db)):
+    """Every rate of the hotel as one dense season x room type x occupancy type grid."""
+    not_modified = check_etag(request, response, hotel_etag(db_hotel.id, db_hotel.version))
+    if not_modified:
+        return not_modified
+    return rate_matrix_payload(db_hotel.id, await get_rate_matrix(db, db_hotel.id, db_hotel.version))
 
 
 @router.post('/occupancy_rates', response_model=schemas.OccupancyRate, tags=['Occupancy Rate Operations'])
-async def create_occupancy_rate(occupancy_rate: schemas.OccupancyRateCreate, db: Session = Depends(get_db)):
-    return crud.create_occupancy_rate(db, occupancy_rate=occupancy_rate)
+async def create_occupancy_rate(occupancy_rate: schemas.OccupancyRateCreate, db: AsyncSession = Depends(get_db)):
+    return await crud.create_occupancy_rate(db, occupancy_rate=occupancy_rate)
 
 
-# Season Operations
-@router.get('/hotels/{hotel_id}/seasons', response_model=List[schemas.Season], tags=['Season Operations'])
-async def get_seasons(hotel_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_seasons(db, hotel_id=hotel_id, skip=skip, limit=limit)
+@router.post('/occupancy_rates:bulk', response_model=schemas.BulkCreateResult, tags=['Occupancy Rate Operations'])
+async def create_occupancy_rates(occupancy_rates: List[schemas.OccupancyRateCreate] = Body(..., min_length=1),
+                                 db: AsyncSession = Depends(get_db)):
+    missing_room_types = await crud.get_missing_ids(db, models.RoomType, {r.room_type_id for r in occupancy_rates})
+    missing_seasons = await crud.get_missing_ids(db, models.Season, {r.season_id for r in occupancy_rates})
+    if missing_room_types or missing_seasons:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown room types {sorted(missing_room_types)} or seasons {sorted(missing_seasons)}"
+        )
+    return {'ids': await crud.create_occupancy_rates(db, occupancy_rates=occupancy_rates)}
 
 
-@router.post('/hotels/{hotel_id}/seasons', response_model=schemas.Season, tags=['Season Operations'])
-async def create_season(hotel_id: int, season: schemas.SeasonCreate, db: Session = Depends(get_db)):
-    return crud.create_season(db, season=season)
+# Season Operations
+@router.get('/hotels/{hotel_id}/seasons', response_model=List[schemas.Season], tags=['Season Operations'])
+@query_budget(3)
+async def get_seasons(hotel_id: int, request: Request, response: Response, skip: int = 0, limit: int = 100,
+                      cursor: Optional[str] = None, start_date: Optional[date] = None,
+                      end_date: Optional[date] = None, db: AsyncSession = Depends(get_db)):
+    version, not_modified = await hotel_not_modified(request, response, db, hotel_id)
+    if not_modified:
+        return not_modified
+    seasons = await crud.get_seasons_cached(db, hotel_id=hotel_id, version=version, skip=skip, limit=limit,
+                                            cursor=cursor, start_date=start_date, end_date=end_date)
+    set_next_cursor(response, seasons, limit, cursor)
+    return seasons
+
+
+@router.get('/hotels/{hotel_id}/seasons/export', tags=['Season Operations'], dependencies=[Depends(hotel_exists)])
+async def export_seasons(hotel_id: int, format: ExportFormat = ExportFormat.csv):
+    return export_response(crud.season_export_query(hotel_id), format, filename=f'hotel_{hotel_id}_seasons')
+
+
+@router.post('/hotels/{hotel_id}/seasons', response_model=schemas.Season, tags=['Season Operations'],
+             dependencies=[Depends(hotel_exists)])
+async def create_season(hotel_id: int, season: schemas.SeasonCreate, db: AsyncSession = Depends(get_db)):
+    return await crud.create_season(db, season=season, hotel_id=hotel_id)
+
+
+@router.post('/hotels/{hotel_id}/seasons:bulk', response_model=schemas.BulkCreateResult, tags=['Season Operations'],
+             dependencies=[Depends(hotel_exists)])
+async def create_seasons(hotel_id: int, seasons: List[schemas.SeasonCreate] = Body(..., min_length=1),
+                         db: AsyncSession = Depends(get_db)):
+    return {'ids': await crud.create_seasons(db, seasons=seasons, hotel_id=hotel_id)}
+
+
+@router.get('/seasons/{season_id}/contract_documents', response_model=List[schemas.ContractDocument],
+            tags=['Season Operations'])
+@query_budget(12)
+async def read_season_contract_documents(response: Response, format: DocumentFormat = DocumentFormat.html,
+                                         skip: int = 0, limit: int = Query(100, le=1000),
+                                         cursor: Optional[str] = None,
+                                         db_season: models.Season = Depends(season_by_id),
+                                         db: AsyncSession = Depends(get_db)):
+    """Documents of every contract with nights in the season, rendered as one batch."""
+    group_contracts = await crud.get_season_group_contracts(db, db_season, skip=skip, limit=limit, cursor=cursor,
+                                                            options=crud.CONTRACT_DOCUMENT_LOADER_OPTIONS)
+    set_next_cursor(response, group_contracts, limit, cursor)
+    documents = await get_contract_documents(db, db_season.hotel_id, group_contracts, format)
+    return [{'group_contract_id': group_contract_id, 'etag': document_etag(digest), 'content': document}
+            for group_contract_id, digest, document in documents]
+
+
+@router.put('/seasons/{season_id}', response_model=schemas.Season, tags=['Season Operations'])
+async def update_season(season: schemas.SeasonUpdate, db_season: models.Season = Depends(season_with_packages),
+                        db: AsyncSession = Depends(get_db)):
+    return await crud.update_season(db, db_season=db_season, season_data=season)
@@ -1,6 +1,6 @@
 from enum import Enum as PyEnum
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, ForeignKey, Float, Date, Boolean, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, Date, Boolean, Enum, Index, func, literal_column
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import JSONB
 from app.db.base_class import Base
@@ -8,7 +8,7 @@ from app.db.base_class import Base
 utc_now = datetime.now(timezone.utc)
 
 
-class OccupancyType(PyEnum):
+class OccupancyType(str, PyEnum):
     SINGLE = 'single'
     DOUBLE = 'double'
     TRIPLE = 'triple'
@@ -19,7 +19,7 @@ class Hotel(Base):
     __tablename__ = 'hotels'
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, index=True, nullable=False)
+    name = Column(String, unique=True, index=True, nullable=False)
     location = Column(String)
     description = Column(String, nullable=True)
     contact_info = Column(String, nullable=True)
@@ -29,6 +29,8 @@ class Hotel(Base):
     created_at = Column(Date, nullable=False, default=utc_now)
     updated_at = Column(Date, nullable=False, default=utc_now)
     is_deleted = Column(Boolean, nullable=False, default=False)
+    # Bumped by crud on every write to the hotel or anything nested under it; catalog ETags derive from it.
+    version = Column(Integer, nullable=False, default=1, server_default='1')
 
     meal_options = relationship('MealOption', back_populates='hotel', cascade='all, delete-orphan')
     room_types = relationship('RoomType', back_populates='hotel', cascade='all, delete-orphan')
@@ -42,7 +44,7 @@ class MealOption(Base):
     __tablename__ = 'meal_options'
 
     id = Column(Integer, primary_key=True, index=True)
-    hotel_id = Column(Integer, ForeignKey('hotels.id'))
+    hotel_id = Column(Integer, ForeignKey('hotels.id'), index=True)
     name = Column(String, index=True, nullable=False)
     description = Column(String, nullable=True)
     price = Column(Float)
@@ -53,7 +55,7 @@ class RoomType(Base):
     __tablename__ = 'room_types'
 
     id = Column(Integer, primary_key=True, index=True)
-    hotel_id = Column(Integer, ForeignKey('hotels.id'))
+    hotel_id = Column(Integer, ForeignKey('hotels.id'), index=True)
     name = Column(String, index=True, nullable=False)
     number_of_rooms = Column(Integer, nullable=True)
 
@@ -64,10 +66,14 @@ class RoomType(Base):
 
 class OccupancyRate(Base):
     __tablename__ = 'occupancy_rates'
+    __table_args__ = (
+        # Leads with room_type_id, so it also serves the room_type_id foreign key on its own.
+        Index('ix_occupancy_rates_room_type_id_season_id', 'room_type_id', 'season_id'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     room_type_id = Column(Integer, ForeignKey('room_types.id'))
-    season_id = Column(Integer, ForeignKey('seasons.id'))
+    season_id = Column(Integer, ForeignKey('seasons.id'), index=True)
     occupancy_type = Column(Enum(OccupancyType), nullable=False)
     rate = Column(Float, nullable=False)
 
@@ -79,7 +85,7 @@ class DivingPackage(Base):
     __tablename__ = 'diving_packages'
 
     id = Column(Integer, primary_key=True, index=True)
-    season_id = Column(Integer, ForeignKey('seasons.id'))
+    season_id = Column(Integer, ForeignKey('seasons.id'), index=True)
     name = Column(String, index=True, nullable=False)
     price = Column(Float, nullable=False)
 
@@ -90,7 +96,7 @@ class SpecialOffer(Base):
     __tablename__ = 'special_offers'
 
     id = Column(Integer, primary_key=True, index=True)
-    hotel_id = Column(Integer, ForeignKey('hotels.id'))
+    hotel_id = Column(Integer, ForeignKey('hotels.id'), index=True)
     name = Column(String, index=True, nullable=False)
     description = Column(String, nullable=True)
     hotel = relationship('Hotel', back_populates='special_offers')
@@ -100,7 +106,7 @@ class BookingPolicy(Base):
     __tablename__ = 'booking_policies'
 
     id = Column(Integer, primary_key=True, index=True)
-    hotel_id = Column(Integer, ForeignKey('hotels.id'))
+    hotel_id = Column(Integer, ForeignKey('hotels.id'), index=True)
     name = Column(String, index=True, nullable=False)
     policy_text = Column(String)
     hotel = relationship('Hotel', back_populates='booking_policies')
@@ -108,6 +114,16 @@ class BookingPolicy(Base):
 
 class GroupContract(Base):
     __tablename__ = 'group_contracts'
+    __table_args__ = (
+        # pg_trgm GIN indexes serve both ILIKE '%term%' filters and the ranked similarity search.
+        Index('ix_group_contracts_group_name_trgm', 'group_name',
+              postgresql_using='gin', postgresql_ops={'group_name': 'gin_trgm_ops'}),
+        Index('ix_group_contracts_customer_trgm', 'customer',
+              postgresql_using='gin', postgresql_ops={'customer': 'gin_trgm_ops'}),
+        Index('ix_group_contracts_travel_agent_trgm', 'travel_agent',
+              postgresql_using='gin', postgresql_ops={'travel_agent': 'gin_trgm_ops'}),
+        Index('ix_group_contracts_hotel_id_start_date', 'hotel_id', 'start_date'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     hotel_id = Column(Integer, ForeignKey('hotels.id'))
@@ -118,12 +134,28 @@ class GroupContract(Base):
     travel_agent = Column(String, nullable=True)
     contract = Column(String)
     hotel = relationship('Hotel', back_populates='group_contracts')
-    diving_package_id = Column(Integer, ForeignKey('diving_packages.id'))
+    diving_package_id = Column(Integer, ForeignKey('diving_packages.id'), index=True)
     diving_package = relationship('DivingPackage')
+    room_allocations = relationship('RoomAllocation', back_populates='group_contract', cascade='all, delete-orphan')
+
+
+class RoomAllocation(Base):
+    """Rooms of one type a group contract holds for every night of its stay, [start_date, end_date)."""
+    __tablename__ = 'room_allocations'
+
+    id = Column(Integer, primary_key=True, index=True)
+    group_contract_id = Column(Integer, ForeignKey('group_contracts.id'), nullable=False, index=True)
+    room_type_id = Column(Integer, ForeignKey('room_types.id'), nullable=False, index=True)
+    rooms = Column(Integer, nullable=False)
+
+    group_contract = relationship('GroupContract', back_populates='room_allocations')
 
 
 class Season(Base):
     __tablename__ = 'seasons'
+    __table_args__ = (
+        Index('ix_seasons_hotel_id_start_date', 'hotel_id', 'start_date'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     hotel_id = Column(Integer, ForeignKey('hotels.id'))
@@ -136,3 +168,8 @@ class Season(Base):
     hotel = relationship('Hotel', back_populates='seasons')
     occupancy_rates = relationship('OccupancyRate', back_populates='season')
     diving_packages = relationship('DivingPackage', back_populates='season')
+
+
+# Serves "which seasons of this hotel overlap these dates" as a single index probe.
+Index('ix_seasons_hotel_id_date_range', Season.hotel_id,
+      func.daterange(Season.start_date, Season.end_date, literal_column("'[]'")), postgresql_using='gist')
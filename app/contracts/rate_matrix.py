@@ -0,0 +1,109 @@
+"""Per-hotel dense rate matrices kept in memory.
+
+A hotel's matrix is a ``RateTable`` over all of its dated seasons and its room types,
+``rates[season, room_type, occupancy_type]``, built on first use; ``get_rate_matrices`` loads
+every missing hotel with the same three queries.
+
+Each matrix is stored with the hotel ``version`` it reflects and callers pass the version they
+read, so a matrix that missed a write, including one made through another worker process, is
+reloaded. ``crud`` patches cached matrices in place as rates, room types and seasons are added,
+advancing them to the version its write committed, and drops them when a season is edited.
+Entries expire after ``rate_matrix_ttl_seconds``, which only reclaims memory.
+"""
+from typing import Dict, Iterable
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.quotes.crud import get_rate_tables
+from app.quotes.engine import OCCUPANCY_TYPES, RateTable
+
+_matrices = TTLCache(maxsize=1024, ttl=settings.rate_matrix_ttl_seconds)
+# Bumped by every change; a matrix whose load started before one is returned but not cached.
+_generation = 0
+
+
+async def get_rate_matrix(db: AsyncSession, hotel_id: int, version: int) -> RateTable:
+    return (await get_rate_matrices(db, {hotel_id: version}))[hotel_id]
+
+
+async def get_rate_matrices(db: AsyncSession, versions: Dict[int, int]) -> Dict[int, RateTable]:
+    """The matrices of the hotels in ``versions``, which maps each hotel id to its current version."""
+    cached = {hotel_id: _matrices.get(hotel_id) for hotel_id in versions}
+    tables = {hotel_id: entry[1] for hotel_id, entry in cached.items()
+              if entry is not None and entry[0] == versions[hotel_id]}
+    missing = [hotel_id for hotel_id in versions if hotel_id not in tables]
+    if missing:
+        generation = _generation
+        loaded = await get_rate_tables(db, missing)
+        if generation == _generation:
+            for hotel_id, table in loaded.items():
+                _matrices.set(hotel_id, (versions[hotel_id], table))
+        tables.update(loaded)
+    return tables
+
+
+def rate_matrix_payload(hotel_id: int, table: RateTable) -> dict:
+    return {
+        'hotel_id': hotel_id,
+        'season_ids': table.season_ids.tolist(),
+        'room_type_ids': list(table.room_type_ids),
+        'occupancy_types': OCCUPANCY_TYPES,
+        'rates': np.where(np.isnan(table.rates), None, table.rates).tolist(),
+    }
+
+
+def _changed():
+    global _generation
+    _generation += 1
+
+
+def _advance(versions: Dict[int, int]) -> Dict[int, RateTable]:
+    """Cached matrices to patch for a write that committed ``versions`` (hotel id -> new version).
+
+    Only a matrix of the version right before the write can be patched, and is moved to the new
+    one. Any other missed a write made elsewhere and is dropped.
+    """
+    _changed()
+    tables = {}
+    for hotel_id, version in versions.items():
+        entry = _matrices.get(hotel_id)
+        if entry is None:
+            continue
+        if entry[0] == version - 1:
+            _matrices.set(hotel_id, (version, entry[1]))
+            tables[hotel_id] = entry[1]
+        else:
+            _matrices.pop(hotel_id)
+    return tables
+
+
+# A load that overlapped the write may already hold its rows, so rows already in a matrix are skipped.
+def add_room_types(versions: Dict[int, int], room_type_ids: Iterable[int]):
+    for table in _advance(versions).values():
+        for room_type_id in room_type_ids:
+            if room_type_id not in table.room_type_index:
+                table.add_room_type(room_type_id)
+
+
+def add_seasons(versions: Dict[int, int], seasons: Iterable):
+    for table in _advance(versions).values():
+        for season in seasons:
+            if season.start_date is not None and season.end_date is not None and season.id not in table.season_ids:
+                table.add_season(season)
+
+
+def set_rates(versions: Dict[int, int], rates: Iterable):
+    """Apply new rates to the cached matrices of the hotels in ``versions``; each rate lands in its hotel's."""
+    tables = list(_advance(versions).values())
+    for rate in rates:
+        for table in tables:
+            if table.set_rate(rate):
+                break
+
+
+def invalidate_rate_matrix(hotel_id: int):
+    _changed()
+    _matrices.pop(hotel_id)
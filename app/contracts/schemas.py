@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import date
 from enum import Enum
@@ -70,6 +70,11 @@ class GroupContractBase(BaseModel):
     contract: Optional[str] = None
 
 
+class RoomAllocationBase(BaseModel):
+    room_type_id: int
+    rooms: int = Field(..., ge=1)
+
+
 class SeasonBase(BaseModel):
     hotel_id: int
     name: str
@@ -107,7 +112,8 @@ class BookingPolicyCreate(BookingPolicyBase):
 
 
 class GroupContractCreate(GroupContractBase):
-    pass
+    # Rooms held for every night of the stay; checked against the hotel's free inventory.
+    room_allocations: List[RoomAllocationBase] = []
 
 
 class SeasonCreate(SeasonBase):
@@ -149,6 +155,10 @@ class GroupContract(GroupContractBase):
     id: int
 
 
+class GroupContractSearchResult(GroupContract):
+    score: float
+
+
 class Hotel(HotelBase):
     id: int
     room_types: List[RoomType]
@@ -159,6 +169,33 @@ class Hotel(HotelBase):
     is_active: bool
 
 
+class BulkCreateResult(BaseModel):
+    ids: List[int]
+
+
+class RoomTypeAvailability(BaseModel):
+    room_type_id: int
+    number_of_rooms: Optional[int]
+    # Most rooms allocated on any night of the range; free is None when the capacity is unknown.
+    booked: int
+    free: Optional[int]
+
+
+class ContractDocument(BaseModel):
+    group_contract_id: int
+    etag: str
+    content: str
+
+
+class RateMatrix(BaseModel):
+    hotel_id: int
+    season_ids: List[int]
+    room_type_ids: List[int]
+    occupancy_types: List[OccupancyType]
+    # rates[season][room_type][occupancy_type], in the order of the id lists; null where unset.
+    rates: List[List[List[Optional[float]]]]
+
+
 # Update Schemas
 class HotelUpdate(HotelBase):
     is_active: Optional[bool] = None
@@ -0,0 +1,81 @@
+"""Per-hotel in-memory interval index over ``Season`` date ranges.
+
+Each hotel's seasons are kept sorted by ``start_date`` so that the season covering a night is
+one ``bisect`` away. Indexes are built lazily from the database and stored with the hotel
+``version`` they were loaded for, so an index that predates a season write, including one made
+through another worker process, is never used for a later version. ``crud`` also drops a
+hotel's index whenever a season is written, and entries expire after
+``season_index_ttl_seconds`` to reclaim memory.
+"""
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from datetime import date, timedelta
+from itertools import accumulate
+from typing import Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import models
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+SeasonInterval = namedtuple('SeasonInterval', ['id', 'start_date', 'end_date'])
+
+
+class SeasonIndex:
+    """Sorted season boundaries for one hotel. Of the seasons covering a night, the latest start wins."""
+
+    def __init__(self, seasons: Iterable):
+        self.seasons: List[SeasonInterval] = sorted(
+            (SeasonInterval(season.id, season.start_date, season.end_date) for season in seasons
+             if season.start_date is not None and season.end_date is not None),
+            key=lambda season: (season.start_date, season.id))
+        self._starts = [season.start_date for season in self.seasons]
+        # _reach[i] is the latest end date among the first i + 1 seasons; it never decreases.
+        self._reach = list(accumulate((season.end_date for season in self.seasons), max))
+
+    def season_for(self, night: date) -> Optional[SeasonInterval]:
+        position = bisect_right(self._starts, night) - 1
+        if position < 0 or self._reach[position] < night:
+            return None
+        # The latest season to start may have ended inside a longer one that started earlier;
+        # the reach guarantees that one of the earlier seasons still runs.
+        while self.seasons[position].end_date < night:
+            position -= 1
+        return self.seasons[position]
+
+    def seasons_for_stay(self, start_date: date, end_date: date) -> List[Optional[SeasonInterval]]:
+        """Resolve every night of ``[start_date, end_date)``."""
+        return [self.season_for(start_date + timedelta(days=offset))
+                for offset in range((end_date - start_date).days)]
+
+    def overlapping(self, start_date: date, end_date: date) -> List[SeasonInterval]:
+        """Seasons overlapping ``[start_date, end_date)``, which include every season its nights resolve to."""
+        low = bisect_left(self._reach, start_date)
+        high = bisect_right(self._starts, end_date - timedelta(days=1))
+        return [season for season in self.seasons[low:high] if season.end_date >= start_date]
+
+
+# Entries are checked against the hotel version on every use; the TTL only reclaims memory.
+_indexes = TTLCache(maxsize=1024, ttl=settings.season_index_ttl_seconds)
+
+
+async def get_season_index(db: AsyncSession, hotel_id: int, version: int) -> SeasonIndex:
+    """The season index of ``hotel_id`` as of ``version``, the hotel version the caller read."""
+    cached = _indexes.get(hotel_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    result = await db.execute(select(models.Season.id, models.Season.start_date, models.Season.end_date).filter(
+        models.Season.hotel_id == hotel_id))
+    index = SeasonIndex(result.all())
+    # A load racing a season write may hold either side of it, but it is only served for the
+    # version read before the write; readers of the bumped version miss and reload.
+    cached = _indexes.get(hotel_id)
+    if cached is None or cached[0] <= version:
+        _indexes.set(hotel_id, (version, index))
+    return index
+
+
+def invalidate_season_index(hotel_id: int):
+    _indexes.pop(hotel_id)
@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings
+from typing import Optional
 import os
 from pathlib import Path
 
@@ -9,6 +10,50 @@ class Settings(BaseSettings):
     algorithm: str
     access_token_expire_minutes: int
 
+    # bcrypt runs on a dedicated thread pool; requests beyond the queue limit get a 503.
+    password_hash_workers: int = 4
+    password_hash_queue_limit: int = 64
+
+    # Authenticated principals are cached per process; the TTL bounds staleness across workers.
+    principal_cache_size: int = 10000
+    principal_cache_ttl_seconds: int = 60
+
+    # Per-hotel season interval indexes are checked against the hotel version; this TTL only reclaims memory.
+    season_index_ttl_seconds: int = 300
+
+    # Per-hotel rate matrices are checked against the hotel version; this TTL only reclaims memory.
+    rate_matrix_ttl_seconds: int = 300
+
+    # Catalog GETs carry ETags; clients may reuse a response this long before revalidating.
+    catalog_cache_max_age_seconds: int = 0
+
+    # Read-through catalog cache: a per-process LRU of hotels, backed by a shared Redis tier when
+    # a URL is given. Writes invalidate both; the TTL bounds staleness of other processes' LRUs.
+    catalog_cache_size: int = 1024
+    catalog_cache_ttl_seconds: int = 60
+    catalog_cache_redis_url: Optional[str] = None
+
+    # Rendered contract documents are cached per process under a hash of their inputs. Batch
+    # renders use a process pool of this many workers; 0 renders everything inline.
+    contract_document_cache_size: int = 4096
+    contract_render_workers: int = 2
+
+    # Connection pool per worker process. Statements running longer than the timeout are
+    # cancelled by Postgres; 0 disables it.
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 30000
+
+    # Development and test only: record every statement per request and report N+1 patterns,
+    # slow statements and exceeded @query_budget limits (strict mode raises instead).
+    query_debug: bool = False
+    query_debug_strict: bool = False
+    query_debug_slow_ms: float = 100
+    query_debug_repeat_threshold: int = 5
+
     class Config:
         env_file = os.path.join(Path(__file__).parent.parent.parent.absolute(), '.env')
 
@@ -0,0 +1,48 @@
+"""ETag / ``If-None-Match`` handling for conditional GETs."""
+import hashlib
+from typing import Iterable, Optional, Tuple
+from urllib.parse import urlencode
+
+from fastapi import Request, Response, status
+
+from .config import settings
+
+
+def cache_control() -> str:
+    # Clients may reuse a response for max-age seconds, then must revalidate with If-None-Match.
+    return f'public, max-age={settings.catalog_cache_max_age_seconds}, must-revalidate'
+
+
+def hotel_etag(hotel_id: int, version: int, query_params: Iterable[Tuple[str, str]] = ()) -> str:
+    """ETag of a resource derived from one hotel's catalog.
+
+    Responses that depend on the query (pages, cursors, date filters) add a digest of its
+    parameters, sorted so that their order in the URL does not matter.
+    """
+    query = urlencode(sorted(query_params))
+    if not query:
+        return f'"hotel-{hotel_id}-v{version}"'
+    return f'"hotel-{hotel_id}-v{version}-{hashlib.sha1(query.encode()).hexdigest()[:12]}"'
+
+
+def hotels_etag(versions: Iterable[Tuple[int, int]]) -> str:
+    digest = hashlib.sha1(','.join(f'{hotel_id}:{version}' for hotel_id, version in versions).encode())
+    return f'"hotels-{digest.hexdigest()[:20]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip() for candidate in if_none_match.split(',')}
+    # If-None-Match uses the weak comparison: a W/ prefix does not prevent a match.
+    return '*' in candidates or etag in {candidate[2:] if candidate.startswith('W/') else candidate
+                                         for candidate in candidates}
+
+
+def check_etag(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """Return a 304 response if the client already holds ``etag``, else tag ``response`` with it."""
+    headers = {'ETag': etag, 'Cache-Control': cache_control()}
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,79 @@
+"""Opt-in per-request SQL inspection for development and tests.
+
+With ``QUERY_DEBUG=true`` every statement a request sends is recorded (see
+``app/core/request_metrics.py``) and checked when the response completes:
+
+* the same statement shape repeated ``query_debug_repeat_threshold`` times or more is
+  reported as a likely N+1;
+* statements slower than ``query_debug_slow_ms`` are reported;
+* endpoints decorated with ``@query_budget(n)`` that send more than ``n`` statements are
+  reported. With ``QUERY_DEBUG_STRICT=true`` the budget is enforced before the response
+  starts instead: ``QueryBudgetExceeded`` turns the response into a 500, so the request
+  fails the test that made it.
+"""
+import logging
+import re
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r'\bIN \([^()]*\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_budget(max_queries: int):
+    """Declare the most statements an endpoint may send per request."""
+    def decorator(endpoint):
+        endpoint.query_budget = max_queries
+        return endpoint
+    return decorator
+
+
+def statement_shape(statement: str) -> str:
+    """Collapse whitespace and expanded IN lists so repeats of one query compare equal."""
+    return _IN_LIST.sub('IN (...)', _WHITESPACE.sub(' ', statement).strip())
+
+
+def inspect_request(method: str, route, statements: List[Tuple[str, float]]):
+    path = getattr(route, 'path', 'unmatched')
+    slow_seconds = settings.query_debug_slow_ms / 1000
+
+    for shape, count in Counter(statement_shape(statement) for statement, _ in statements).items():
+        if count >= settings.query_debug_repeat_threshold:
+            logger.warning('%s %s: possible N+1, %d x %s', method, path, count, shape)
+    for statement, seconds in statements:
+        if seconds >= slow_seconds:
+            logger.warning('%s %s: slow statement (%.1f ms) %s', method, path, seconds * 1000,
+                           statement_shape(statement))
+    logger.info('%s %s: %d statements in %.1f ms', method, path, len(statements),
+                sum(seconds for _, seconds in statements) * 1000)
+
+    message = budget_overrun(method, route, len(statements))
+    if message:
+        logger.warning(message)
+
+
+def budget_overrun(method: str, route, query_count: int) -> Optional[str]:
+    """Describe how ``route``'s endpoint exceeded its ``@query_budget``, or None if it did not."""
+    budget = getattr(getattr(route, 'endpoint', None), 'query_budget', None)
+    if budget is not None and query_count > budget:
+        return f"{method} {getattr(route, 'path', 'unmatched')} sent {query_count} statements, budget is {budget}"
+    return None
+
+
+def enforce_query_budget(method: str, route, query_count: int):
+    """In strict mode, raise ``QueryBudgetExceeded`` for an endpoint over its budget.
+
+    Called when the response starts, before anything reaches the client.
+    """
+    if settings.query_debug_strict:
+        message = budget_overrun(method, route, query_count)
+        if message:
+            raise QueryBudgetExceeded(message)
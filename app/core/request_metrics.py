@@ -0,0 +1,101 @@
+"""Per-request HTTP and database metrics.
+
+``MetricsMiddleware`` is plain ASGI (no ``BaseHTTPMiddleware`` task or body buffering) and
+labels everything by route template, so ``/hotels/1`` and ``/hotels/2`` share a series.
+Database statements are attributed to the current request through a context variable that
+SQLAlchemy's cursor events update (see ``app/db/session.py``). With ``query_debug`` enabled
+the statements themselves are kept as well and handed to ``app/core/query_debug.py``.
+"""
+import time
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from .config import settings
+from .metrics import Counter, Gauge, Histogram
+from .query_debug import enforce_query_budget, inspect_request
+
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+HTTP_REQUESTS = Counter('http_requests_total', 'Requests served.', ('method', 'route', 'status'))
+HTTP_REQUEST_SECONDS = Histogram('http_request_duration_seconds', 'Request latency until the response is sent.',
+                                 ('method', 'route'))
+HTTP_REQUESTS_IN_FLIGHT = Gauge('http_requests_in_flight', 'Requests currently being served.')
+HTTP_RESPONSE_BYTES = Histogram('http_response_size_bytes', 'Response body size.', ('method', 'route'),
+                                buckets=SIZE_BUCKETS)
+DB_QUERIES = Counter('db_queries_total', 'Statements sent to the database.', ('route',))
+DB_REQUEST_QUERIES = Histogram('db_request_queries', 'Statements sent to the database per request.',
+                               ('method', 'route'), buckets=QUERY_COUNT_BUCKETS)
+DB_REQUEST_SECONDS = Histogram('db_request_query_seconds', 'Time spent in database statements per request.',
+                               ('method', 'route'))
+
+
+class RequestStats:
+    __slots__ = ('queries', 'query_seconds', 'statements')
+
+    def __init__(self, record_statements: bool = False):
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.statements: Optional[List[Tuple[str, float]]] = [] if record_statements else None
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar('request_stats', default=None)
+
+
+def record_query(seconds: float, statement: str):
+    """Attribute one database statement to the current request, if there is one."""
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.query_seconds += seconds
+        if stats.statements is not None:
+            stats.statements.append((statement, seconds))
+
+
+def route_template(scope) -> str:
+    route = scope.get('route')
+    return getattr(route, 'path', 'unmatched')
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(record_statements=settings.query_debug)
+        token = _request_stats.set(stats)
+        status_code = 500
+        response_bytes = 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, response_bytes
+            if message['type'] == 'http.response.start':
+                if stats.statements is not None:
+                    # Raised here, the error reaches ServerErrorMiddleware while it can still send a 500.
+                    enforce_query_budget(scope['method'], scope.get('route'), stats.queries)
+                status_code = message['status']
+            elif message['type'] == 'http.response.body':
+                response_bytes += len(message.get('body', b''))
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            _request_stats.reset(token)
+            method, route = scope['method'], route_template(scope)
+            HTTP_REQUESTS.inc(method=method, route=route, status=status_code)
+            HTTP_REQUEST_SECONDS.observe(elapsed, method=method, route=route)
+            HTTP_RESPONSE_BYTES.observe(response_bytes, method=method, route=route)
+            DB_QUERIES.inc(stats.queries, route=route)
+            DB_REQUEST_QUERIES.observe(stats.queries, method=method, route=route)
+            DB_REQUEST_SECONDS.observe(stats.query_seconds, method=method, route=route)
+        if stats.statements is not None:
+            inspect_request(scope['method'], scope.get('route'), stats.statements)
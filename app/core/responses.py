@@ -0,0 +1,20 @@
+"""Response classes for payloads that need no validation on the way out."""
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON encoded by pydantic-core's native encoder instead of ``json.dumps``.
+
+    Handles dates, enums and the other types rows come back with. Returning it from an
+    endpoint bypasses ``response_model`` validation, so the content must already match it.
+    """
+
+    def render(self, content) -> bytes:
+        return to_json(content)
+
+
+def fast_json_response(content, response: Response) -> FastJSONResponse:
+    """Send ``content`` as is, keeping the headers the endpoint set on its injected ``response``."""
+    return FastJSONResponse(content, headers=dict(response.headers))
@@ -1,14 +1,19 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from .cache import TTLCache
 from .config import settings
+from .metrics import Counter, Gauge, Histogram
 from app.users import crud
 from app.dependencies import get_db
-from app.users.schemas import TokenData
+from app.users.schemas import TokenData, ReturnUser
 
 SECRET_KEY = settings.secret_key
 ALGORITHM = settings.algorithm
@@ -18,13 +23,45 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# bcrypt releases the GIL while hashing, so a small thread pool keeps it off the event loop
+# without the pickling overhead of a process pool.
+password_executor = ThreadPoolExecutor(max_workers=settings.password_hash_workers,
+                                       thread_name_prefix='password-hash')
+_password_jobs = 0
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+PASSWORD_HASH_SECONDS = Histogram('password_hash_seconds',
+                                  'Time spent waiting for and running bcrypt work.', ['operation'])
+PASSWORD_POOL_PENDING = Gauge('password_pool_pending', 'Password jobs queued or running on the pool.')
+PASSWORD_POOL_REJECTED = Counter('password_pool_rejected_total',
+                                 'Password jobs rejected because the pool queue was full.', ['operation'])
 
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+async def _run_password_job(operation: str, func, *args):
+    global _password_jobs
+    if _password_jobs >= settings.password_hash_queue_limit:
+        PASSWORD_POOL_REJECTED.inc(operation=operation)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is temporarily overloaded, please retry",
+            headers={"Retry-After": "1"},
+        )
+    _password_jobs += 1
+    PASSWORD_POOL_PENDING.set(_password_jobs)
+    start = time.perf_counter()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(password_executor, func, *args)
+    finally:
+        _password_jobs -= 1
+        PASSWORD_POOL_PENDING.set(_password_jobs)
+        PASSWORD_HASH_SECONDS.observe(time.perf_counter() - start, operation=operation)
+
+
+async def verify_password(plain_password, hashed_password):
+    return await _run_password_job('verify', pwd_context.verify, plain_password, hashed_password)
+
+
+async def get_password_hash(password):
+    return await _run_password_job('hash', pwd_context.hash, password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -39,12 +76,34 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt, expire
 
 
-async def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
+# Authenticated principals keyed by bearer token. Entries never outlive the token, and bumping a
+# user's generation through invalidate_principal() retires every snapshot taken before the change.
+principal_cache = TTLCache(maxsize=settings.principal_cache_size, ttl=settings.principal_cache_ttl_seconds)
+_principal_generations: Dict[int, int] = {}
+# Bumped by every invalidation. A lookup that started before one is returned but not cached, since
+# the token only names the user and its generation cannot be read before the lookup.
+_invalidations = 0
+
+
+def invalidate_principal(user_id: int):
+    global _invalidations
+    _principal_generations[user_id] = _principal_generations.get(user_id, 0) + 1
+    _invalidations += 1
+
+
+async def get_current_user(db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    # Only tokens that were decoded and verified are cached, and an entry expires with its token,
+    # so a hit needs neither the JWT decode nor the user lookup.
+    cached = principal_cache.get(token)
+    if cached is not None:
+        principal, generation = cached
+        if _principal_generations.get(principal.id, 0) == generation:
+            return principal
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
@@ -52,7 +111,13 @@ async def get_current_user(db: Session = Depends(get_db), token: str = Depends(o
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = crud.get_user_by_username(db, username=username)
+    invalidations = _invalidations
+    user = await crud.get_user_by_username(db, username=username, options=crud.USER_LOADER_OPTIONS)
     if user is None:
         raise credentials_exception
-    return user
+    # The nested profile and preferences schemas are validated from ORM objects as well.
+    principal = ReturnUser.model_validate(user, from_attributes=True)
+    if invalidations == _invalidations:
+        principal_cache.set(token, (principal, _principal_generations.get(user.id, 0)),
+                            ttl=payload["exp"] - time.time())
+    return principal
@@ -0,0 +1,11 @@
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+
+
+def violated_constraint(error: IntegrityError) -> Optional[str]:
+    """Name of the constraint or unique index that rejected the statement.
+
+    asyncpg reports it on the driver exception, which SQLAlchemy chains as the cause of ``orig``.
+    """
+    return getattr(error.orig.__cause__, 'constraint_name', None)
@@ -0,0 +1,49 @@
+import base64
+import json
+from typing import Optional, Sequence
+
+from fastapi import HTTPException, Response, status
+
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+# Keyset columns are INTEGER primary keys; a key outside their range would fail in the driver.
+KEY_RANGE = range(-2 ** 31, 2 ** 31)
+
+
+def encode_cursor(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        value = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        value = None
+    # bool is an int subclass, but true/false are not keys a cursor was ever encoded from.
+    if type(value) is not int or value not in KEY_RANGE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return value
+
+
+def paginate(query, key_column, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    """Apply OFFSET/LIMIT paging, or keyset paging on ``key_column`` when a cursor is given.
+
+    Keyset mode is opt-in: pass ``cursor=''`` for the first page and the ``X-Next-Cursor``
+    value for every following one. Each page is an index range scan starting after the last
+    key seen, so page 10,000 costs the same as page 1.
+    """
+    if cursor is None:
+        return query.offset(skip).limit(limit)
+    query = query.order_by(key_column).limit(limit)
+    if cursor:
+        query = query.filter(key_column > decode_cursor(cursor))
+    return query
+
+
+def set_next_cursor(response: Response, rows: Sequence, limit: int, cursor: Optional[str], key: str = 'id'):
+    """Advertise the cursor for the page after ``rows`` (ORM objects or dicts) when the request used keyset mode."""
+    if cursor is not None and rows and len(rows) >= limit:
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last[key] if isinstance(last, dict) else getattr(last, key))
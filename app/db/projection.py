@@ -0,0 +1,44 @@
+"""Column projections for list endpoints that skip ORM loading and response validation.
+
+``schema_columns`` selects only the columns behind a response schema's fields, labelled with
+the field names, so rows come back as plain tuples that never enter the identity map.
+``child_rows`` loads a relationship for a page of parents with one ``IN`` query, as
+``selectinload`` would. The resulting dicts are already shaped like the schema. Endpoints
+send them with ``app.core.responses.FastJSONResponse`` instead of having ``response_model``
+validate them field by field.
+
+Only use this for data read straight from the database, whose column types the schemas mirror.
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Type
+
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Label of the foreign key that child rows are grouped by; dropped from the dicts.
+PARENT_KEY = '_parent'
+
+
+def schema_columns(model, schema: Type[BaseModel]) -> list:
+    """``model``'s columns for every field of ``schema`` that is a column, labelled with the field name."""
+    columns = model.__table__.columns
+    return [getattr(model, name).label(name) for name in schema.model_fields if name in columns]
+
+
+def row_dicts(result) -> List[dict]:
+    return [row._asdict() for row in result]
+
+
+async def child_rows(db: AsyncSession, model, schema: Type[BaseModel], parent_column,
+                     parent_ids: Iterable) -> Dict[object, List[dict]]:
+    """``schema``-shaped rows of ``model`` whose ``parent_column`` is in ``parent_ids``, grouped by it."""
+    parent_ids = list(parent_ids)
+    children = defaultdict(list)
+    if not parent_ids:
+        return children
+    result = await db.execute(select(*schema_columns(model, schema), parent_column.label(PARENT_KEY)).filter(
+        parent_column.in_(parent_ids)).order_by(model.id))
+    for child in row_dicts(result):
+        children[child.pop(PARENT_KEY)].append(child)
+    return children
@@ -1,12 +1,87 @@
-from databases import Database
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.metrics import Gauge, Histogram
+from app.core.request_metrics import record_query
 
 DATABASE_URL = settings.database_url
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+POOL_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+DB_POOL_CHECKOUT_WAIT_SECONDS = Histogram('db_pool_checkout_wait_seconds',
+                                          'Time spent waiting for a pooled connection, including connecting.',
+                                          buckets=POOL_BUCKETS)
+DB_CONNECTION_HOLD_SECONDS = Histogram('db_connection_hold_seconds',
+                                       'Time a connection stays checked out of the pool.', buckets=POOL_BUCKETS)
+DB_POOL_CHECKED_OUT = Gauge('db_pool_checked_out', 'Connections currently checked out of the pool.')
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waits for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT_SECONDS.observe(time.perf_counter() - start)
+
+
+def get_async_database_url(url: str):
+    """Point a plain ``postgresql://`` URL at the asyncpg driver."""
+    url = make_url(url)
+    if url.drivername in ('postgresql', 'postgresql+psycopg2'):
+        url = url.set(drivername='postgresql+asyncpg')
+    return url
+
+
+def get_engine_options(url) -> dict:
+    """Pool and timeout settings for Postgres; other backends keep their dialect defaults."""
+    if url.get_backend_name() != 'postgresql':
+        return {}
+    options = {
+        'poolclass': InstrumentedPool,
+        'pool_size': settings.db_pool_size,
+        'max_overflow': settings.db_max_overflow,
+        'pool_timeout': settings.db_pool_timeout_seconds,
+        'pool_recycle': settings.db_pool_recycle_seconds,
+        'pool_pre_ping': settings.db_pool_pre_ping,
+    }
+    if settings.db_statement_timeout_ms:
+        options['connect_args'] = {'server_settings': {'statement_timeout': str(settings.db_statement_timeout_ms)}}
+    return options
+
+
+ASYNC_DATABASE_URL = get_async_database_url(DATABASE_URL)
+engine = create_async_engine(ASYNC_DATABASE_URL, **get_engine_options(ASYNC_DATABASE_URL))
+SessionLocal = sessionmaker(bind=engine, class_=AsyncSession, autocommit=False, autoflush=False,
+                            expire_on_commit=False)
+
+
+@event.listens_for(engine.sync_engine, 'checkout')
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    connection_record.info['checked_out_at'] = time.perf_counter()
+    DB_POOL_CHECKED_OUT.inc()
+
+
+@event.listens_for(engine.sync_engine, 'checkin')
+def _on_checkin(dbapi_connection, connection_record):
+    checked_out_at = connection_record.info.pop('checked_out_at', None)
+    if checked_out_at is not None:
+        DB_CONNECTION_HOLD_SECONDS.observe(time.perf_counter() - checked_out_at)
+        DB_POOL_CHECKED_OUT.dec()
+
+
+@event.listens_for(engine.sync_engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context.query_started_at = time.perf_counter()
+
 
-# For async SQL operations
-database = Database(DATABASE_URL)
+@event.listens_for(engine.sync_engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    record_query(time.perf_counter() - context.query_started_at, statement)
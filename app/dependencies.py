@@ -1,8 +1,9 @@
-from db.session import SessionLocal
+from app.db.session import SessionLocal
 
-def get_db():
-    db = SessionLocal()
-    try:
+
+async def get_db():
+    # The session checks a connection out of the pool on its first statement and returns it on
+    # commit, rollback or close; db_pool_checkout_wait_seconds and db_connection_hold_seconds
+    # (app/db/session.py) time both ends of that per request.
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
@@ -1,8 +1,34 @@
+import gc
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from app.core.metrics import REGISTRY
+from app.core.request_metrics import MetricsMiddleware
+from app.contracts.documents import shutdown_render_pool
 from app.users.endpoints import router as user_router
 from app.contracts.endpoints import router as contract_router
+from app.quotes.endpoints import router as quote_router
 
 app = FastAPI()
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(user_router)
 app.include_router(contract_router)
+app.include_router(quote_router)
+
+
+@app.on_event('startup')
+async def freeze_startup_objects():
+    # Modules, routes and schemas live as long as the process. Moving them out of the
+    # collector's generations keeps full collections from rescanning them under load.
+    gc.freeze()
+
+
+@app.on_event('shutdown')
+async def stop_render_pool():
+    shutdown_render_pool()
+
+
+@app.get('/metrics', response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type='text/plain; version=0.0.4')
@@ -0,0 +1,103 @@
+"""Quote many scenarios in one request.
+
+Everything the scenarios reference is loaded set-based: hotel versions in one query, the hotels'
+rate matrices from ``app.contracts.rate_matrix`` (three queries for all the hotels not cached
+yet), and meal and diving prices in one query each. Each hotel's scenarios are then priced
+together by ``engine.price_stays``.
+
+A scenario that cannot be priced gets an ``error`` instead of ``quotes`` and does not fail
+the batch. ``elapsed_ms`` per scenario is the time spent on its own input and output plus an
+even share of its hotel's vectorized pass.
+"""
+from collections import defaultdict, namedtuple
+from time import perf_counter
+from typing import Dict, List, Sequence
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import crud, engine, schemas
+from app.contracts import crud as contracts_crud
+from app.contracts.rate_matrix import get_rate_matrices
+
+_Stay = namedtuple('_Stay', ['position', 'nights', 'counts', 'meal_prices', 'diving_prices', 'elapsed'])
+
+
+def _error(scenario: schemas.QuoteRequest, message: str, elapsed: float) -> dict:
+    return {'hotel_id': scenario.hotel_id, 'start_date': scenario.start_date, 'end_date': scenario.end_date,
+            'error': message, 'elapsed_ms': elapsed * 1000}
+
+
+def _prices(scenario: schemas.QuoteRequest, meal_prices: Dict, diving_prices: Dict):
+    """Per-configuration meal and diving prices, checking each option belongs to the scenario's hotel."""
+    meals, diving = [], []
+    for configuration in scenario.configurations:
+        meal_option = meal_prices.get(configuration.meal_option_id) if configuration.meal_option_id else (
+            scenario.hotel_id, 0.0)
+        if meal_option is None or meal_option[0] != scenario.hotel_id:
+            raise engine.QuoteError(f'Meal option {configuration.meal_option_id} does not belong to this hotel')
+        diving_package = diving_prices.get(configuration.diving_package_id) if configuration.diving_package_id else (
+            scenario.hotel_id, 0.0)
+        if diving_package is None or diving_package[0] != scenario.hotel_id:
+            raise engine.QuoteError(
+                f'Diving package {configuration.diving_package_id} does not belong to this hotel')
+        meals.append(meal_option[1])
+        diving.append(diving_package[1])
+    return meals, diving
+
+
+async def quote_scenarios(db: AsyncSession, scenarios: Sequence[schemas.QuoteRequest],
+                          nightly: bool = False) -> List[dict]:
+    """Price ``scenarios`` and return one ``ScenarioQuotes`` dict per scenario, in input order."""
+    hotel_ids = {scenario.hotel_id for scenario in scenarios}
+    versions = await contracts_crud.get_hotel_versions_by_id(db, hotel_ids)
+    missing_hotels = hotel_ids - versions.keys()
+    tables = await get_rate_matrices(db, versions)
+    configurations = [configuration for scenario in scenarios for configuration in scenario.configurations]
+    meal_prices = await crud.get_meal_prices_by_id(
+        db, [c.meal_option_id for c in configurations if c.meal_option_id])
+    diving_prices = await crud.get_diving_prices_by_id(
+        db, [c.diving_package_id for c in configurations if c.diving_package_id])
+
+    results: List[dict] = [None] * len(scenarios)
+    stays: Dict[int, List[_Stay]] = defaultdict(list)
+    for position, scenario in enumerate(scenarios):
+        started = perf_counter()
+        if scenario.hotel_id in missing_hotels:
+            results[position] = _error(scenario, 'Hotel not found', perf_counter() - started)
+            continue
+        table = tables[scenario.hotel_id]
+        try:
+            nights = engine.stay_nights(scenario.start_date, scenario.end_date)
+            counts = engine.room_counts(table, scenario.configurations)
+            meals, diving = _prices(scenario, meal_prices, diving_prices)
+        except engine.QuoteError as error:
+            results[position] = _error(scenario, str(error), perf_counter() - started)
+            continue
+        stays[scenario.hotel_id].append(_Stay(position, nights, counts, meals, diving, perf_counter() - started))
+
+    for hotel_id, hotel_stays in stays.items():
+        started = perf_counter()
+        priced_stays = engine.price_stays(
+            tables[hotel_id], [stay.nights for stay in hotel_stays],
+            np.repeat(np.arange(len(hotel_stays)), [len(stay.counts) for stay in hotel_stays]),
+            np.concatenate([stay.counts for stay in hotel_stays]),
+            np.array([price for stay in hotel_stays for price in stay.meal_prices], dtype=float),
+            np.array([price for stay in hotel_stays for price in stay.diving_prices], dtype=float))
+        share = (perf_counter() - started) / len(hotel_stays)
+        for stay, priced in zip(hotel_stays, priced_stays):
+            started = perf_counter()
+            scenario = scenarios[stay.position]
+            elapsed = stay.elapsed + share
+            if isinstance(priced, engine.QuoteError):
+                results[stay.position] = _error(scenario, str(priced), elapsed + perf_counter() - started)
+                continue
+            quotes = engine.build_quotes(stay.nights, priced, nightly=nightly)
+            results[stay.position] = {
+                'hotel_id': scenario.hotel_id,
+                'start_date': scenario.start_date,
+                'end_date': scenario.end_date,
+                'quotes': quotes,
+                'elapsed_ms': (elapsed + perf_counter() - started) * 1000,
+            }
+    return results
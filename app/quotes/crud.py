@@ -0,0 +1,88 @@
+from collections import defaultdict
+from typing import Dict, Iterable, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.contracts import models
+from .engine import RateTable
+
+
+async def get_rate_table(db: AsyncSession, hotel_id: int, seasons: Sequence) -> RateTable:
+    """Load the hotel's room types and their rates for ``seasons`` in two queries."""
+    room_types = (await db.execute(select(models.RoomType).filter(
+        models.RoomType.hotel_id == hotel_id).order_by(models.RoomType.id))).scalars().all()
+    occupancy_rates = []
+    if seasons and room_types:
+        occupancy_rates = (await db.execute(select(models.OccupancyRate).filter(
+            models.OccupancyRate.season_id.in_([season.id for season in seasons]),
+            models.OccupancyRate.room_type_id.in_([room_type.id for room_type in room_types])))).scalars().all()
+    return RateTable(seasons, room_types, occupancy_rates)
+
+
+async def get_rate_tables(db: AsyncSession, hotel_ids: Iterable[int]) -> Dict[int, RateTable]:
+    """Load the rate tables of several hotels over all their dated seasons in three queries."""
+    hotel_ids = set(hotel_ids)
+    if not hotel_ids:
+        return {}
+    seasons, room_types, occupancy_rates = defaultdict(list), defaultdict(list), defaultdict(list)
+    result = await db.execute(select(models.Season.id, models.Season.start_date, models.Season.end_date,
+                                     models.Season.hotel_id).filter(
+        models.Season.hotel_id.in_(hotel_ids), models.Season.start_date.isnot(None),
+        models.Season.end_date.isnot(None)))
+    for season in result.all():
+        seasons[season.hotel_id].append(season)
+    result = await db.execute(select(models.RoomType.id, models.RoomType.hotel_id).filter(
+        models.RoomType.hotel_id.in_(hotel_ids)).order_by(models.RoomType.id))
+    for room_type in result.all():
+        room_types[room_type.hotel_id].append(room_type)
+    result = await db.execute(select(models.OccupancyRate.room_type_id, models.OccupancyRate.season_id,
+                                     models.OccupancyRate.occupancy_type, models.OccupancyRate.rate,
+                                     models.RoomType.hotel_id).join(
+        models.RoomType, models.OccupancyRate.room_type_id == models.RoomType.id).filter(
+        models.RoomType.hotel_id.in_(hotel_ids)))
+    for rate in result.all():
+        occupancy_rates[rate.hotel_id].append(rate)
+    return {hotel_id: RateTable(seasons[hotel_id], room_types[hotel_id], occupancy_rates[hotel_id])
+            for hotel_id in hotel_ids}
+
+
+async def get_meal_prices(db: AsyncSession, hotel_id: int, meal_option_ids: Iterable[int]) -> Dict[int, float]:
+    meal_option_ids = set(meal_option_ids)
+    if not meal_option_ids:
+        return {}
+    result = await db.execute(select(models.MealOption.id, models.MealOption.price).filter(
+        models.MealOption.hotel_id == hotel_id, models.MealOption.id.in_(meal_option_ids)))
+    return {meal_option_id: price or 0.0 for meal_option_id, price in result.all()}
+
+
+async def get_diving_prices(db: AsyncSession, hotel_id: int, diving_package_ids: Iterable[int]) -> Dict[int, float]:
+    diving_package_ids = set(diving_package_ids)
+    if not diving_package_ids:
+        return {}
+    result = await db.execute(select(models.DivingPackage.id, models.DivingPackage.price).join(
+        models.Season, models.DivingPackage.season_id == models.Season.id).filter(
+        models.Season.hotel_id == hotel_id, models.DivingPackage.id.in_(diving_package_ids)))
+    return dict(result.all())
+
+
+async def get_meal_prices_by_id(db: AsyncSession, meal_option_ids: Iterable[int]) -> Dict[int, Tuple[int, float]]:
+    """``{meal option id: (hotel id, price)}`` across hotels, for checking ownership per request."""
+    meal_option_ids = set(meal_option_ids)
+    if not meal_option_ids:
+        return {}
+    result = await db.execute(select(models.MealOption.id, models.MealOption.hotel_id, models.MealOption.price).filter(
+        models.MealOption.id.in_(meal_option_ids)))
+    return {meal_option_id: (hotel_id, price or 0.0) for meal_option_id, hotel_id, price in result.all()}
+
+
+async def get_diving_prices_by_id(db: AsyncSession,
+                                  diving_package_ids: Iterable[int]) -> Dict[int, Tuple[int, float]]:
+    """``{diving package id: (hotel id, price)}`` across hotels, for checking ownership per request."""
+    diving_package_ids = set(diving_package_ids)
+    if not diving_package_ids:
+        return {}
+    result = await db.execute(select(models.DivingPackage.id, models.Season.hotel_id, models.DivingPackage.price).join(
+        models.Season, models.DivingPackage.season_id == models.Season.id).filter(
+        models.DivingPackage.id.in_(diving_package_ids)))
+    return {diving_package_id: (hotel_id, price) for diving_package_id, hotel_id, price in result.all()}
@@ -0,0 +1,63 @@
+from time import perf_counter
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+import numpy as np
+
+from . import crud, engine, schemas
+from .batch import quote_scenarios
+from app.contracts import crud as contracts_crud
+from app.contracts.season_index import get_season_index
+from app.core.query_debug import query_budget
+from app.dependencies import get_db
+
+router = APIRouter()
+
+
+@router.post('/quotes', response_model=schemas.QuoteResponse, tags=['Quote Operations'])
+async def create_quote(quote_request: schemas.QuoteRequest, db: AsyncSession = Depends(get_db)):
+    db_hotel = await contracts_crud.get_hotel(db, hotel_id=quote_request.hotel_id)
+    if not db_hotel:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Hotel not found"
+        )
+    configurations = quote_request.configurations
+    season_index = await get_season_index(db, quote_request.hotel_id, db_hotel.version)
+    table = await crud.get_rate_table(db, quote_request.hotel_id,
+                                      season_index.overlapping(quote_request.start_date, quote_request.end_date))
+    meal_prices = await crud.get_meal_prices(db, quote_request.hotel_id,
+                                             [c.meal_option_id for c in configurations if c.meal_option_id])
+    diving_prices = await crud.get_diving_prices(db, quote_request.hotel_id,
+                                                 [c.diving_package_id for c in configurations if c.diving_package_id])
+    try:
+        for configuration in configurations:
+            if configuration.meal_option_id and configuration.meal_option_id not in meal_prices:
+                raise engine.QuoteError(f'Meal option {configuration.meal_option_id} does not belong to this hotel')
+            if configuration.diving_package_id and configuration.diving_package_id not in diving_prices:
+                raise engine.QuoteError(
+                    f'Diving package {configuration.diving_package_id} does not belong to this hotel')
+        nights = engine.stay_nights(quote_request.start_date, quote_request.end_date)
+        priced = engine.price_configurations(
+            table, nights, engine.room_counts(table, configurations),
+            np.array([meal_prices.get(c.meal_option_id, 0.0) for c in configurations]),
+            np.array([diving_prices.get(c.diving_package_id, 0.0) for c in configurations]))
+    except engine.QuoteError as error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error)
+        )
+    return {
+        'hotel_id': quote_request.hotel_id,
+        'start_date': quote_request.start_date,
+        'end_date': quote_request.end_date,
+        'quotes': engine.build_quotes(nights, priced),
+    }
+
+
+@router.post('/quotes:batch', response_model=schemas.QuoteBatchResponse, tags=['Quote Operations'])
+@query_budget(6)
+async def create_quotes_batch(batch_request: schemas.QuoteBatchRequest, db: AsyncSession = Depends(get_db)):
+    started = perf_counter()
+    results = await quote_scenarios(db, batch_request.scenarios, nightly=batch_request.nightly)
+    return {'results': results, 'elapsed_ms': (perf_counter() - started) * 1000}
@@ -0,0 +1,235 @@
+"""Vectorized group-quote pricing.
+
+Prices are evaluated as arrays over (configuration, night, room type, occupancy type):
+
+* ``OccupancyRate.rate`` is charged per room per night for the season covering that night.
+* ``MealOption.price`` is charged per guest per night.
+* ``DivingPackage.price`` is charged once per guest for the stay.
+
+A stay is the half-open range ``[start_date, end_date)``, i.e. the check-out night is not charged.
+"""
+from datetime import date
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from app.contracts.models import OccupancyType
+
+OCCUPANCY_TYPES = list(OccupancyType)
+OCCUPANCY_INDEX = {occupancy_type: index for index, occupancy_type in enumerate(OCCUPANCY_TYPES)}
+GUESTS_PER_ROOM = np.array([1, 2, 3, 4], dtype=np.int64)
+
+
+class QuoteError(ValueError):
+    pass
+
+
+class RateTable:
+    """Dense rate array for one hotel, indexed as ``rates[season, room_type, occupancy_type]``.
+
+    Missing rates are stored as NaN so that pricing a room without a rate is detected instead
+    of silently costing nothing.
+    """
+
+    def __init__(self, seasons, room_types, occupancy_rates):
+        seasons = sorted(seasons, key=lambda season: (season.start_date, season.id))
+        self.season_ids = np.array([season.id for season in seasons], dtype=np.int64)
+        self.season_starts = np.array([season.start_date for season in seasons], dtype='datetime64[D]')
+        self.season_ends = np.array([season.end_date for season in seasons], dtype='datetime64[D]')
+        self.room_type_ids = [room_type.id for room_type in room_types]
+        self.room_type_index: Dict[int, int] = {room_type_id: index
+                                                for index, room_type_id in enumerate(self.room_type_ids)}
+        season_index = {season_id: index for index, season_id in enumerate(self.season_ids.tolist())}
+
+        self.rates = np.full((len(seasons), len(self.room_type_ids), len(OCCUPANCY_TYPES)), np.nan)
+        for rate in occupancy_rates:
+            if rate.season_id in season_index and rate.room_type_id in self.room_type_index:
+                self.rates[season_index[rate.season_id], self.room_type_index[rate.room_type_id],
+                           OCCUPANCY_INDEX[OccupancyType(rate.occupancy_type)]] = rate.rate
+        self._update_reach()
+
+    def _update_reach(self):
+        # season_reach[i] is the latest end date among the first i + 1 seasons, so a night after
+        # it is covered by none of them.
+        self.season_reach = np.maximum.accumulate(self.season_ends) if len(self.season_ends) else self.season_ends
+
+    def add_room_type(self, room_type_id: int):
+        """Append a room type without rates."""
+        self.room_type_index[room_type_id] = len(self.room_type_ids)
+        self.room_type_ids.append(room_type_id)
+        self.rates = np.concatenate(
+            (self.rates, np.full((len(self.season_ids), 1, len(OCCUPANCY_TYPES)), np.nan)), axis=1)
+
+    def add_season(self, season):
+        """Insert a season without rates at its sorted position (new ids sort after equal starts)."""
+        start = np.datetime64(season.start_date, 'D')
+        position = int(np.searchsorted(self.season_starts, start, side='right'))
+        self.season_ids = np.insert(self.season_ids, position, season.id)
+        self.season_starts = np.insert(self.season_starts, position, start)
+        self.season_ends = np.insert(self.season_ends, position, np.datetime64(season.end_date, 'D'))
+        self.rates = np.insert(self.rates, position, np.nan, axis=0)
+        self._update_reach()
+
+    def set_rate(self, rate) -> bool:
+        """Store one ``OccupancyRate``-like rate; returns False if its season or room type is not in the table."""
+        seasons = np.flatnonzero(self.season_ids == rate.season_id)
+        if not len(seasons) or rate.room_type_id not in self.room_type_index:
+            return False
+        self.rates[seasons[0], self.room_type_index[rate.room_type_id],
+                   OCCUPANCY_INDEX[OccupancyType(rate.occupancy_type)]] = rate.rate
+        return True
+
+    def covering(self, nights: np.ndarray):
+        """Positions of the seasons covering ``nights`` (latest start wins) and which nights are covered.
+
+        Positions of uncovered nights are 0 and must be masked out with ``covered``.
+        """
+        positions = np.searchsorted(self.season_starts, nights, side='right') - 1
+        covered = positions >= 0
+        covered[covered] = nights[covered] <= self.season_reach[positions[covered]]
+        # The latest season to start may already have ended inside a longer one that started
+        # earlier (a promotion within a full-year season); step back to the latest still running.
+        ended = covered.copy()
+        ended[ended] = nights[ended] > self.season_ends[positions[ended]]
+        while ended.any():
+            positions[ended] -= 1
+            ended[ended] = nights[ended] > self.season_ends[positions[ended]]
+        positions[~covered] = 0
+        return positions, covered
+
+    def season_positions(self, nights: np.ndarray) -> np.ndarray:
+        """Map every night to the position of the covering season (latest start wins on overlap)."""
+        positions, covered = self.covering(nights)
+        if not covered.all():
+            raise QuoteError(f'No season covers {nights[~covered][0]}')
+        return positions
+
+
+def stay_nights(start_date: date, end_date: date) -> np.ndarray:
+    if end_date <= start_date:
+        raise QuoteError('end_date must be after start_date')
+    return np.arange(np.datetime64(start_date, 'D'), np.datetime64(end_date, 'D'))
+
+
+def room_counts(table: RateTable, configurations: Sequence) -> np.ndarray:
+    """Build the ``counts[configuration, room_type, occupancy_type]`` tensor of booked rooms."""
+    counts = np.zeros((len(configurations), len(table.room_type_ids), len(OCCUPANCY_TYPES)), dtype=np.int64)
+    for position, configuration in enumerate(configurations):
+        for selection in configuration.rooms:
+            if selection.room_type_id not in table.room_type_index:
+                raise QuoteError(f'Room type {selection.room_type_id} does not belong to this hotel')
+            counts[position, table.room_type_index[selection.room_type_id],
+                   OCCUPANCY_INDEX[OccupancyType(selection.occupancy_type)]] += selection.rooms
+    return counts
+
+
+def price_configurations(table: RateTable, nights: np.ndarray, counts: np.ndarray,
+                         meal_prices: np.ndarray, diving_prices: np.ndarray) -> Dict[str, np.ndarray]:
+    """Price every configuration over every night in one pass.
+
+    ``counts`` is (configurations, room types, occupancy types); ``meal_prices`` and
+    ``diving_prices`` are per-configuration, per-guest prices (0 when not selected).
+    Returns per-night room and meal arrays shaped (configurations, nights) plus per-configuration
+    guest counts and diving totals.
+    """
+    positions = table.season_positions(nights)
+    nightly_rates = table.rates[positions]
+    missing = np.einsum('nro,cro->cn', np.isnan(nightly_rates).astype(np.int64), counts)
+    if missing.any():
+        configuration, night = np.argwhere(missing)[0]
+        raise QuoteError(f'Configuration {configuration} books a room without a rate on {nights[night]}')
+
+    rooms = np.einsum('nro,cro->cn', np.nan_to_num(nightly_rates), counts)
+    guests = np.einsum('cro,o->c', counts, GUESTS_PER_ROOM)
+    meals = np.broadcast_to((guests * meal_prices)[:, None], rooms.shape)
+    return {
+        'season_ids': table.season_ids[positions],
+        'rooms': rooms,
+        'meals': meals,
+        'guests': guests,
+        'diving': guests * diving_prices,
+    }
+
+
+def price_stays(table: RateTable, stays: Sequence[np.ndarray], owners: np.ndarray, counts: np.ndarray,
+                meal_prices: np.ndarray, diving_prices: np.ndarray):
+    """Price the configurations of many stays at one hotel in one pass.
+
+    ``stays`` holds each stay's nights; ``counts``, ``meal_prices`` and ``diving_prices`` stack
+    the configurations of all stays as in ``price_configurations``, grouped by stay, and
+    ``owners`` maps every configuration to its stay. Rates are summed per season once, then
+    gathered for every (configuration, night) pair. Returns one entry per stay: the
+    ``price_configurations`` arrays for its configurations, or the ``QuoteError`` that stops it.
+    """
+    lengths = np.array([len(nights) for nights in stays], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    positions, covered = table.covering(np.concatenate(stays))
+
+    # Pairs run configuration by configuration, so each stay's pairs are one contiguous block.
+    pair_counts = lengths[owners]
+    pair_offsets = np.concatenate(([0], np.cumsum(pair_counts)))
+    pair_configurations = np.repeat(np.arange(len(owners)), pair_counts)
+    pair_nights = np.arange(pair_offsets[-1]) + np.repeat(offsets[owners] - pair_offsets[:-1], pair_counts)
+    pair_positions = positions[pair_nights]
+
+    season_rooms = np.einsum('cro,sro->cs', counts, np.nan_to_num(table.rates))
+    season_missing = np.einsum('cro,sro->cs', counts, np.isnan(table.rates).astype(np.int64))
+    if len(table.season_ids):
+        rooms = season_rooms[pair_configurations, pair_positions]
+        missing = season_missing[pair_configurations, pair_positions] > 0
+    else:
+        rooms = np.zeros(len(pair_positions))
+        missing = np.zeros(len(pair_positions), dtype=bool)
+    guests = np.einsum('cro,o->c', counts, GUESTS_PER_ROOM)
+
+    bounds = np.searchsorted(owners, np.arange(len(stays) + 1))
+    results: List[object] = []
+    for stay, nights in enumerate(stays):
+        start, end = offsets[stay], offsets[stay + 1]
+        if not covered[start:end].all():
+            results.append(QuoteError(f'No season covers {nights[~covered[start:end]][0]}'))
+            continue
+        first, last = bounds[stay], bounds[stay + 1]
+        shape = (last - first, end - start)
+        stay_missing = missing[pair_offsets[first]:pair_offsets[last]].reshape(shape)
+        if stay_missing.any():
+            configuration, night = np.argwhere(stay_missing)[0]
+            results.append(QuoteError(
+                f'Configuration {configuration} books a room without a rate on {nights[night]}'))
+            continue
+        stay_rooms = rooms[pair_offsets[first]:pair_offsets[last]].reshape(shape)
+        stay_guests = guests[first:last]
+        results.append({
+            'season_ids': table.season_ids[positions[start:end]],
+            'rooms': stay_rooms,
+            'meals': np.broadcast_to((stay_guests * meal_prices[first:last])[:, None], shape),
+            'guests': stay_guests,
+            'diving': stay_guests * diving_prices[first:last],
+        })
+    return results
+
+
+def build_quotes(nights: np.ndarray, priced: Dict[str, np.ndarray], nightly: bool = True) -> List[dict]:
+    """Turn the arrays from ``price_configurations`` into per-configuration quote dicts.
+
+    With ``nightly=False`` only the totals are built and every quote's ``nightly`` is empty.
+    """
+    night_dates = nights.astype(date).tolist() if nightly else []
+    season_ids = priced['season_ids'].tolist()
+    rooms_totals = priced['rooms'].sum(axis=1)
+    meals_totals = priced['meals'].sum(axis=1)
+    totals = rooms_totals + meals_totals + priced['diving']
+    quotes = []
+    for position, (rooms, meals) in enumerate(zip(priced['rooms'].tolist(), priced['meals'].tolist())):
+        quotes.append({
+            'guests': int(priced['guests'][position]),
+            'nightly': [{'night': night, 'season_id': season_id, 'rooms': room_total, 'meals': meal_total,
+                         'total': room_total + meal_total}
+                        for night, season_id, room_total, meal_total in zip(night_dates, season_ids, rooms, meals)]
+            if nightly else [],
+            'rooms_total': float(rooms_totals[position]),
+            'meals_total': float(meals_totals[position]),
+            'diving_total': float(priced['diving'][position]),
+            'total': float(totals[position]),
+        })
+    return quotes
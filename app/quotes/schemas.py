@@ -0,0 +1,91 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
+from datetime import date
+
+from app.contracts.schemas import OccupancyType
+
+# Pricing allocates arrays over configurations x nights, so requests are bounded up front.
+MAX_STAY_NIGHTS = 366
+MAX_CONFIGURATIONS = 50
+MAX_BATCH_SCENARIOS = 5000
+MAX_BATCH_CONFIGURATION_NIGHTS = 250000
+
+
+class RoomSelection(BaseModel):
+    room_type_id: int
+    occupancy_type: OccupancyType
+    rooms: int = Field(1, ge=1)
+
+
+class QuoteConfiguration(BaseModel):
+    rooms: List[RoomSelection] = Field(..., min_length=1)
+    meal_option_id: Optional[int] = None
+    diving_package_id: Optional[int] = None
+
+
+class QuoteRequest(BaseModel):
+    hotel_id: int
+    start_date: date
+    end_date: date
+    configurations: List[QuoteConfiguration] = Field(..., min_length=1, max_length=MAX_CONFIGURATIONS)
+
+    @model_validator(mode='after')
+    def stay_length(self):
+        # An end_date before start_date is left to the engine, which reports it as a QuoteError.
+        assert self.nights <= MAX_STAY_NIGHTS, f'Stays are limited to {MAX_STAY_NIGHTS} nights'
+        return self
+
+    @property
+    def nights(self) -> int:
+        return (self.end_date - self.start_date).days
+
+
+class NightlyPrice(BaseModel):
+    night: date
+    season_id: int
+    rooms: float
+    meals: float
+    total: float
+
+
+class Quote(BaseModel):
+    guests: int
+    nightly: List[NightlyPrice]
+    rooms_total: float
+    meals_total: float
+    diving_total: float
+    total: float
+
+
+class QuoteResponse(BaseModel):
+    hotel_id: int
+    start_date: date
+    end_date: date
+    quotes: List[Quote]
+
+
+class QuoteBatchRequest(BaseModel):
+    scenarios: List[QuoteRequest] = Field(..., min_length=1, max_length=MAX_BATCH_SCENARIOS)
+    nightly: bool = False
+
+    @model_validator(mode='after')
+    def batch_size(self):
+        configuration_nights = sum(len(scenario.configurations) * max(scenario.nights, 0)
+                                   for scenario in self.scenarios)
+        assert configuration_nights <= MAX_BATCH_CONFIGURATION_NIGHTS, (
+            f'A batch is limited to {MAX_BATCH_CONFIGURATION_NIGHTS} configuration nights, got {configuration_nights}')
+        return self
+
+
+class ScenarioQuotes(BaseModel):
+    hotel_id: int
+    start_date: date
+    end_date: date
+    quotes: Optional[List[Quote]] = None
+    error: Optional[str] = None
+    elapsed_ms: float
+
+
+class QuoteBatchResponse(BaseModel):
+    results: List[ScenarioQuotes]
+    elapsed_ms: float
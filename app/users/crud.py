@@ -1,93 +1,136 @@
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from .models import User, UserProfile, UserPreferences
-from .schemas import UserCreate, UpdateUser, UpdateUserStatus, UserPreferencesBase, UserProfileBase
-from app.core.security import get_password_hash
-
-
-def get_user(db: Session, user_id: int):
-    return db.query(User).filter(User.id == user_id).first()
-
-
-def get_user_by_email(db: Session, email: str):
-    return db.query(User).filter(User.email == email).first()
-
-
-def get_user_by_username(db: Session, username: str):
-    return db.query(User).filter(User.username == username).first()
-
-
-def get_users(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(User).offset(skip).limit(limit).all()
-
-
-def create_user(db: Session, user: UserCreate):
-    hashed_password = get_password_hash(user.password)
+from .schemas import ReturnUser, UserCreate, UpdateUser, UpdateUserStatus, UserPreferencesBase, UserProfileBase
+from app.db.errors import violated_constraint
+from app.db.pagination import paginate
+from app.db.projection import child_rows, row_dicts, schema_columns
+from app.core.security import get_password_hash, invalidate_principal
+
+
+# ReturnUser serializes both one-to-one children, which cannot lazy-load on an AsyncSession.
+USER_LOADER_OPTIONS = (
+    selectinload(User.profile),
+    selectinload(User.preferences),
+)
+
+# Duplicate usernames and emails are caught by the unique indexes when the row is written.
+UNIQUE_USER_DETAILS = {
+    'ix_users_email': "Email already registered",
+    'ix_users_username': "Username already registered",
+}
+
+
+async def get_user(db: AsyncSession, user_id: int, options=()):
+    result = await db.execute(select(User).options(*options).filter(User.id == user_id))
+    return result.scalars().first()
+
+
+async def get_user_by_email(db: AsyncSession, email: str, options=()):
+    result = await db.execute(select(User).options(*options).filter(User.email == email))
+    return result.scalars().first()
+
+
+async def get_user_by_username(db: AsyncSession, username: str, options=()):
+    result = await db.execute(select(User).options(*options).filter(User.username == username))
+    return result.scalars().first()
+
+
+async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, options=()):
+    result = await db.execute(paginate(select(User).options(*options), User.id, skip, limit, cursor))
+    return result.scalars().all()
+
+
+async def get_user_rows(db: AsyncSession, skip: int = 0, limit: int = 100,
+                        cursor: Optional[str] = None) -> List[dict]:
+    """The page ``get_users`` would return, as ``ReturnUser`` dicts (see app/db/projection.py)."""
+    users = row_dicts(await db.execute(paginate(select(*schema_columns(User, ReturnUser)), User.id,
+                                                skip, limit, cursor)))
+    user_ids = [user['id'] for user in users]
+    profiles = await child_rows(db, UserProfile, UserProfileBase, UserProfile.user_id, user_ids)
+    preferences = await child_rows(db, UserPreferences, UserPreferencesBase, UserPreferences.user_id, user_ids)
+    for user in users:
+        user['profile'] = profiles[user['id']][0] if profiles[user['id']] else None
+        user['preferences'] = preferences[user['id']][0] if preferences[user['id']] else None
+    return users
+
+
+async def commit_user(db: AsyncSession):
+    try:
+        await db.commit()
+    except IntegrityError as error:
+        await db.rollback()
+        if violated_constraint(error) not in UNIQUE_USER_DETAILS:
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=UNIQUE_USER_DETAILS[violated_constraint(error)]
+        )
+
+
+async def create_user(db: AsyncSession, user: UserCreate):
+    # One unit of work: the children are attached through the relationships, so a single
+    # flush inserts the user (its id comes back via RETURNING) and then the rows that point
+    # to it, and a single commit makes the signup all-or-nothing. Setting both relationships
+    # explicitly, even to None, leaves nothing to lazy-load when the response is serialized.
+    hashed_password = await get_password_hash(user.password)
     db_user = User(username=user.username, email=user.email,
-                   hashed_password=hashed_password)
+                   hashed_password=hashed_password,
+                   profile=UserProfile(first_name=user.profile.first_name,
+                                       last_name=user.profile.last_name,
+                                       phone_number=user.profile.phone_number,
+                                       company_name=user.profile.company_name) if user.profile else None,
+                   preferences=UserPreferences() if user.preferences else None)
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-
-    if user.profile:
-        db_profile = UserProfile(user_id=db_user.id,
-                                 first_name=user.profile.first_name,
-                                 last_name=user.profile.last_name,
-                                 phone_number=user.profile.phone_number,
-                                 company_name=user.profile.company_name)
-        db.add(db_profile)
-        db.commit()
-        db.refresh(db_profile)
-
-    if user.preferences:
-        db_preferences = UserPreferences(user_id=db_user.id)
-        db.add(db_preferences)
-        db.commit()
-        db.refresh(db_preferences)
+    await commit_user(db)
 
     # TODO: Implement account activation workflow using the is_active field in the User model.
 
     return db_user
 
 
-def delete_user(db: Session, user_id: int):
-    db_user = db.query(User).filter(User.id == user_id).first()
-    if db_user:
-        db.delete(db_user)
-        db.commit()
-        return True
-    return False
+async def delete_user(db: AsyncSession, db_user: User):
+    """Delete ``db_user``; load it with ``USER_LOADER_OPTIONS`` so the cascade has its children at hand."""
+    await db.delete(db_user)
+    await db.commit()
+    invalidate_principal(db_user.id)
 
 
-def update_user(db: Session, db_user: User, user_update: UpdateUser):
+async def update_user(db: AsyncSession, db_user: User, user_update: UpdateUser):
     if user_update.username is not None:
         db_user.username = user_update.username
     if user_update.email is not None:
         db_user.email = user_update.email
     if user_update.password is not None:
-        db_user.hashed_password = get_password_hash(user_update.password)
+        db_user.hashed_password = await get_password_hash(user_update.password)
 
-    db.commit()
-    db.refresh(db_user)
+    # Every changed column was set here and sessions keep state on commit, so ``db_user`` is
+    # current without a refresh; load it with USER_LOADER_OPTIONS to serialize it afterwards.
+    await commit_user(db)
+    invalidate_principal(db_user.id)
     return db_user
 
 
-def update_user_status(db: Session, db_user: User, user_update: UpdateUserStatus):
+async def update_user_status(db: AsyncSession, db_user: User, user_update: UpdateUserStatus):
     if user_update.is_active is not None:
         db_user.is_active = user_update.is_active
     if user_update.is_admin is not None:
         db_user.is_admin = user_update.is_admin
 
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    invalidate_principal(db_user.id)
     return db_user
 
 
-def update_user_profile(db: Session, db_user: User, user_update: UserProfileBase):
-    db_profile = db.query(UserProfile).filter(
-        UserProfile.user_id == db_user.id).first()
+async def update_user_profile(db: AsyncSession, db_user: User, user_update: UserProfileBase):
+    """Update ``db_user``'s profile in one commit; ``db_user`` must be loaded with ``USER_LOADER_OPTIONS``."""
+    db_profile = db_user.profile
     if not db_profile:
-        db_profile = UserProfile(user_id=db_user.id)
-        db.add(db_profile)
+        db_profile = db_user.profile = UserProfile()
     if user_update.first_name is not None:
         db_profile.first_name = user_update.first_name
     if user_update.last_name is not None:
@@ -97,20 +140,16 @@ def update_user_profile(db: Session, db_user: User, user_update: UserProfileBase
     if user_update.company_name is not None:
         db_profile.company_name = user_update.company_name
 
-    db.commit()
-    db.refresh(db_user)
-    db.refresh(db_profile)
+    await db.commit()
+    invalidate_principal(db_user.id)
     return db_user
 
 
-def update_user_preferences(db: Session, db_user: User, user_update: UserPreferencesBase):
-    db_preferences = db.query(UserPreferencesBase).filter(
-        UserPreferencesBase.user_id == db_user.id).first()
-    if not db_preferences:
-        db_preferences = UserPreferencesBase(user_id=db_user.id)
-        db.add(db_preferences)
+async def update_user_preferences(db: AsyncSession, db_user: User, user_update: UserPreferencesBase):
+    """Ensure ``db_user`` has preferences; ``db_user`` must be loaded with ``USER_LOADER_OPTIONS``."""
+    if not db_user.preferences:
+        db_user.preferences = UserPreferences()
 
-    db.commit()
-    db.refresh(db_user)
-    db.refresh(db_preferences)
+    await db.commit()
+    invalidate_principal(db_user.id)
     return db_user
@@ -0,0 +1,31 @@
+from fastapi import Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .crud import get_user, USER_LOADER_OPTIONS
+from .models import User
+from app.dependencies import get_db
+
+
+class UserById:
+    """Resolve the ``user_id`` path parameter to its user, loaded with ``options``, or 404.
+
+    FastAPI resolves a dependency once per request, so the endpoint gets the user from a
+    single lookup and hands it to the crud write instead of fetching it again.
+    """
+
+    def __init__(self, options=()):
+        self.options = tuple(options)
+
+    async def __call__(self, user_id: int, db: AsyncSession = Depends(get_db)) -> User:
+        db_user = await get_user(db, user_id=user_id, options=self.options)
+        if db_user is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        return db_user
+
+
+user_by_id = UserById()
+# For endpoints that return ReturnUser, which serializes the profile and preferences.
+user_with_details = UserById(USER_LOADER_OPTIONS)
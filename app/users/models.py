@@ -23,7 +23,7 @@ class UserProfile(Base):
     __tablename__ = 'user_profiles'
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
     first_name = Column(String, default="")
     last_name = Column(String, default="")
     phone_number = Column(String, default="")
@@ -36,7 +36,7 @@ class UserPreferences(Base):
     __tablename__ = 'user_preferences'
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
 
     user = relationship('User', back_populates='preferences')
 
@@ -0,0 +1,48 @@
+"""Compare two ``benchmarks.run`` result files.
+
+    python -m benchmarks.compare baseline.json candidate.json --threshold 10
+
+Prints the change per scenario and exits with status 1 when any scenario's p95 latency grew,
+or its throughput dropped, by more than ``--threshold`` percent.
+"""
+import argparse
+import json
+import sys
+
+
+def change(old, new):
+    if not old or new is None:
+        return None
+    return (new - old) / old * 100
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=10.0, help='allowed regression in percent')
+    args = parser.parse_args()
+
+    with open(args.baseline) as baseline_file, open(args.candidate) as candidate_file:
+        baseline, candidate = json.load(baseline_file), json.load(candidate_file)
+    print(f"baseline {baseline['commit']}  candidate {candidate['commit']}")
+
+    regressions = []
+    for name, new in candidate['results'].items():
+        old = baseline['results'].get(name)
+        if old is None or old['p95_ms'] is None or new['p95_ms'] is None:
+            continue
+        p95_change, rps_change = change(old['p95_ms'], new['p95_ms']), change(old['rps'], new['rps'])
+        print(f"{name:<16} p95 {old['p95_ms']:.2f} -> {new['p95_ms']:.2f} ms ({p95_change:+.1f}%)  "
+              f"rps {old['rps']:.1f} -> {new['rps']:.1f} ({rps_change:+.1f}%)")
+        if (p95_change or 0) > args.threshold or (rps_change or 0) < -args.threshold:
+            regressions.append(name)
+
+    if regressions:
+        print(f"Regressed beyond {args.threshold}%: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""Measure how throughput scales with concurrency on the async and blocking database paths.
+
+    python -m benchmarks.concurrency --levels 1 4 16 64 --sleep-ms 5 --output concurrency.json
+
+Every level runs that many tasks on one event loop for ``--duration`` seconds. Each task
+repeatedly loads a random hotel with ``crud.HOTEL_LOADER_OPTIONS``, as ``GET /hotels/{id}``
+does, along one of two paths:
+
+* ``async`` goes through an ``AsyncSession`` on asyncpg, which is what the routers use;
+* ``blocking`` goes through a synchronous psycopg2 ``Session`` called from the coroutine. That
+  is how the routers worked before they moved to ``AsyncSession``. Every statement blocks the
+  event loop, so no other task runs while it waits on Postgres.
+
+``--sleep-ms`` adds a ``pg_sleep`` to every load to stand in for a slower query. Blocking
+throughput stays flat as concurrency grows. Async throughput grows until the connection pool
+(``DB_POOL_SIZE`` + ``DB_MAX_OVERFLOW``) or the CPU is saturated. Seed the database with
+``benchmarks.seed`` first.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+import numpy as np
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app.contracts import crud, models
+from app.core.config import settings
+from app.db.session import SessionLocal, engine
+from .run import git_commit
+
+PATHS = ('blocking', 'async')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--levels', type=int, nargs='+', default=[1, 4, 16, 64], help='concurrent tasks')
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds per path and level')
+    parser.add_argument('--warmup', type=float, default=1.0, help='seconds per path and level')
+    parser.add_argument('--sleep-ms', type=float, default=0.0, help='pg_sleep added to every load')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='concurrency-results.json')
+    return parser.parse_args()
+
+
+def blocking_engine():
+    url = make_url(settings.database_url).set(drivername='postgresql+psycopg2')
+    return create_engine(url, pool_size=settings.db_pool_size, max_overflow=settings.db_max_overflow)
+
+
+async def load_hotel_ids():
+    async with SessionLocal() as db:
+        result = await db.execute(select(models.Hotel.id).order_by(models.Hotel.id).limit(1000))
+        hotel_ids = result.scalars().all()
+    if not hotel_ids:
+        sys.exit('No hotels found; run python -m benchmarks.seed first.')
+    return hotel_ids
+
+
+async def async_load(hotel_id: int, sleep_seconds: float):
+    async with SessionLocal() as db:
+        if sleep_seconds:
+            await db.execute(select(func.pg_sleep(sleep_seconds)))
+        await crud.get_hotel(db, hotel_id, options=crud.HOTEL_LOADER_OPTIONS)
+
+
+def blocking_loader(sync_engine):
+    async def blocking_load(hotel_id: int, sleep_seconds: float):
+        # The rest of a request (parsing, dependencies, sending) still yields to the loop.
+        await asyncio.sleep(0)
+        with Session(sync_engine) as db:
+            if sleep_seconds:
+                db.execute(select(func.pg_sleep(sleep_seconds)))
+            db.execute(select(models.Hotel).options(*crud.HOTEL_LOADER_OPTIONS).filter(
+                models.Hotel.id == hotel_id)).scalars().first()
+    return blocking_load
+
+
+async def run_level(load, concurrency: int, args, hotel_ids):
+    latencies = []
+
+    async def worker(worker_id: int, until: float, record: bool):
+        rng = random.Random(args.seed * 1000 + worker_id)
+        while time.perf_counter() < until:
+            start = time.perf_counter()
+            await load(rng.choice(hotel_ids), args.sleep_ms / 1000)
+            if record:
+                latencies.append(time.perf_counter() - start)
+
+    for record, seconds in ((False, args.warmup), (True, args.duration)):
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(index, started + seconds, record) for index in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    p50, p95 = (np.percentile(latencies, [50, 95]) * 1000).tolist()
+    return {'requests': len(latencies), 'rps': len(latencies) / elapsed, 'p50_ms': p50, 'p95_ms': p95}
+
+
+async def main(args):
+    hotel_ids = await load_hotel_ids()
+    sync_engine = blocking_engine()
+    loads = {'blocking': blocking_loader(sync_engine), 'async': async_load}
+    results = {name: {} for name in PATHS}
+    try:
+        for concurrency in args.levels:
+            for name in PATHS:
+                results[name][concurrency] = await run_level(loads[name], concurrency, args, hotel_ids)
+            blocking, concurrent = results['blocking'][concurrency], results['async'][concurrency]
+            print(f"{concurrency:>4} tasks  blocking {blocking['rps']:>8.1f} rps  p95 {blocking['p95_ms']:8.2f} ms  "
+                  f"async {concurrent['rps']:>8.1f} rps  p95 {concurrent['p95_ms']:8.2f} ms  "
+                  f"gain {concurrent['rps'] / blocking['rps']:.1f}x")
+    finally:
+        sync_engine.dispose()
+        await engine.dispose()
+
+    report = {'commit': git_commit(), 'sleep_ms': args.sleep_ms, 'duration': args.duration,
+              'pool_size': settings.db_pool_size, 'max_overflow': settings.db_max_overflow, 'results': results}
+    with open(args.output, 'w') as output:
+        json.dump(report, output, indent=2)
+    print(f'Wrote {args.output}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main(parse_args()))
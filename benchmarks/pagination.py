@@ -0,0 +1,99 @@
+"""Check that keyset pages cost the same at any depth, and show what OFFSET pages cost instead.
+
+    python -m benchmarks.pagination --pages 1 10 100 1000 10000 --output pagination.json
+
+Pages of ``--limit`` group contracts are read through ``crud.get_group_contract_rows``, the
+query behind ``GET /hotels/{id}/group_contracts``, but across all hotels so deep pages exist.
+Each page is read in both modes:
+
+* ``offset`` uses ``skip=(page - 1) * limit``, which makes Postgres read and discard every
+  earlier row;
+* ``keyset`` uses the cursor a client holds after paging that far. Cursors are looked up
+  before timing starts.
+
+The run exits with status 1 when the keyset p50 of the deepest page is more than
+``--tolerance`` times the p50 of page 1. Seed the database with ``benchmarks.seed`` first; the
+default page 10,000 needs 100,000 contracts.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+import numpy as np
+from sqlalchemy import func, select
+
+from app.contracts import crud, models
+from app.db.pagination import encode_cursor
+from app.db.session import SessionLocal, engine
+from .run import git_commit
+
+MODES = ('offset', 'keyset')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 10, 100, 1000, 10000])
+    parser.add_argument('--limit', type=int, default=10, help='rows per page')
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--tolerance', type=float, default=1.5,
+                        help='allowed ratio of the deepest keyset p50 to page 1')
+    parser.add_argument('--output', default='pagination-results.json')
+    return parser.parse_args()
+
+
+async def page_cursor(db, page: int, limit: int) -> str:
+    """The cursor a client paging from the start holds for ``page``: the last key of the page before."""
+    if page == 1:
+        return ''
+    result = await db.execute(select(models.GroupContract.id).order_by(models.GroupContract.id).offset(
+        (page - 1) * limit - 1).limit(1))
+    return encode_cursor(result.scalar_one())
+
+
+async def time_page(db, args, **page) -> dict:
+    seconds = []
+    for iteration in range(args.warmup + args.repeat):
+        start = time.perf_counter()
+        rows = await crud.get_group_contract_rows(db, limit=args.limit, **page)
+        if iteration >= args.warmup:
+            seconds.append(time.perf_counter() - start)
+    p50, p95 = (np.percentile(seconds, [50, 95]) * 1000).tolist()
+    return {'p50_ms': p50, 'p95_ms': p95, 'rows': len(rows)}
+
+
+async def main(args):
+    results = {mode: {} for mode in MODES}
+    async with SessionLocal() as db:
+        total = (await db.execute(select(func.count(models.GroupContract.id)))).scalar()
+        deepest = max(args.pages)
+        if total < deepest * args.limit:
+            sys.exit(f'Page {deepest} needs {deepest * args.limit} group contracts, found {total}; '
+                     'seed more with python -m benchmarks.seed.')
+        for page in sorted(args.pages):
+            cursor = await page_cursor(db, page, args.limit)
+            results['offset'][page] = await time_page(db, args, skip=(page - 1) * args.limit)
+            results['keyset'][page] = await time_page(db, args, cursor=cursor)
+            print(f"page {page:>7}  offset p50 {results['offset'][page]['p50_ms']:8.2f} ms  "
+                  f"p95 {results['offset'][page]['p95_ms']:8.2f} ms  "
+                  f"keyset p50 {results['keyset'][page]['p50_ms']:8.2f} ms  "
+                  f"p95 {results['keyset'][page]['p95_ms']:8.2f} ms")
+    await engine.dispose()
+
+    first, last = results['keyset'][min(args.pages)]['p50_ms'], results['keyset'][deepest]['p50_ms']
+    flat = last <= first * args.tolerance
+    with open(args.output, 'w') as output:
+        json.dump({'commit': git_commit(), 'limit': args.limit, 'repeat': args.repeat, 'contracts': total,
+                   'flat': flat, 'results': results}, output, indent=2)
+    print(f'Wrote {args.output}')
+    if not flat:
+        print(f'Keyset page {deepest} p50 is {last / first:.2f}x page {min(args.pages)}, '
+              f'beyond the {args.tolerance}x tolerance')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,201 @@
+"""Benchmark the users, contracts and quotes APIs and write the results as JSON.
+
+    python -m benchmarks.run --target asgi --output results.json
+    python -m benchmarks.run --target uvicorn --concurrency 32 --duration 20 --output results.json
+
+``asgi`` drives ``app.main:app`` in-process through httpx's ASGI transport, which measures the
+application without any network or server overhead. ``uvicorn`` starts ``uvicorn app.main:app``
+in a subprocess and drives it over TCP, as a client would see it. Each scenario runs
+``--concurrency`` workers for ``--duration`` seconds after a warm-up and reports p50/p95/p99
+latency, throughput and status codes. Seed the database with ``benchmarks.seed`` first and
+compare two result files with ``benchmarks.compare``.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import numpy as np
+from sqlalchemy import select
+
+from app.contracts import models
+from app.db.session import SessionLocal, engine
+from .seed import BENCH_PASSWORD, BENCH_USERNAME, SEASON_START
+
+SCENARIOS = ('login', 'users_me', 'hotels', 'hotel', 'group_contracts', 'quotes_batch')
+QUOTE_BATCH_SIZE = 1000
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', choices=('asgi', 'uvicorn'), default='asgi')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per scenario')
+    parser.add_argument('--warmup', type=float, default=2.0, help='seconds per scenario')
+    parser.add_argument('--workers', type=int, default=1, help='uvicorn worker processes')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='benchmark-results.json')
+    return parser.parse_args()
+
+
+async def load_hotels():
+    """``{hotel id: room type ids}`` for the hotels that have group contracts."""
+    async with SessionLocal() as db:
+        result = await db.execute(select(models.GroupContract.hotel_id).distinct().order_by(
+            models.GroupContract.hotel_id))
+        hotel_ids = result.scalars().all()
+        result = await db.execute(select(models.RoomType.hotel_id, models.RoomType.id).filter(
+            models.RoomType.hotel_id.in_(hotel_ids)))
+        room_types = defaultdict(list)
+        for hotel_id, room_type_id in result.all():
+            room_types[hotel_id].append(room_type_id)
+    await engine.dispose()
+    if not hotel_ids:
+        sys.exit('No hotels with group contracts found; run python -m benchmarks.seed first.')
+    return {hotel_id: room_types[hotel_id] for hotel_id in hotel_ids}
+
+
+async def login(client: httpx.AsyncClient) -> httpx.Response:
+    return await client.post('/login', data={'username': BENCH_USERNAME, 'password': BENCH_PASSWORD})
+
+
+def quote_scenario(rng: random.Random, hotel_ids, hotels) -> dict:
+    hotel_id = rng.choice(hotel_ids)
+    start_date = SEASON_START + timedelta(days=rng.randrange(350))
+    return {'hotel_id': hotel_id, 'start_date': start_date.isoformat(),
+            'end_date': (start_date + timedelta(days=rng.randint(3, 14))).isoformat(),
+            'configurations': [{'rooms': [{'room_type_id': rng.choice(hotels[hotel_id]),
+                                           'occupancy_type': rng.choice(('single', 'double')),
+                                           'rooms': rng.randint(1, 20)}]}
+                               for _ in range(rng.randint(1, 3))]}
+
+
+def scenario_request(name: str, client: httpx.AsyncClient, rng: random.Random, hotels, headers):
+    hotel_ids = list(hotels)
+    if name == 'login':
+        return login(client)
+    if name == 'users_me':
+        return client.get('/users/me/', headers=headers)
+    if name == 'hotels':
+        return client.get('/hotels', params={'limit': 100})
+    if name == 'hotel':
+        return client.get(f'/hotels/{rng.choice(hotel_ids)}')
+    if name == 'quotes_batch':
+        return client.post('/quotes:batch', json={'scenarios': [
+            quote_scenario(rng, hotel_ids, hotels) for _ in range(QUOTE_BATCH_SIZE)]})
+    return client.get(f'/hotels/{rng.choice(hotel_ids)}/group_contracts', params={'limit': 10})
+
+
+async def run_scenario(name: str, client: httpx.AsyncClient, args, hotels, headers):
+    latencies, statuses = [], Counter()
+
+    async def worker(worker_id: int, until: float, record: bool):
+        rng = random.Random(args.seed * 1000 + worker_id)
+        while time.perf_counter() < until:
+            start = time.perf_counter()
+            try:
+                status = (await scenario_request(name, client, rng, hotels, headers)).status_code
+            except httpx.HTTPError as error:
+                status = type(error).__name__
+            if record:
+                latencies.append(time.perf_counter() - start)
+                statuses[str(status)] += 1
+
+    for record, seconds in ((False, args.warmup), (True, args.duration)):
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(index, started + seconds, record) for index in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    p50, p95, p99 = (np.percentile(latencies, [50, 95, 99]) * 1000).tolist() if latencies else (None,) * 3
+    return {
+        'requests': len(latencies),
+        'rps': len(latencies) / elapsed,
+        'p50_ms': p50,
+        'p95_ms': p95,
+        'p99_ms': p99,
+        'statuses': dict(statuses),
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_ready(client: httpx.AsyncClient, server: subprocess.Popen, timeout: float = 30.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if server.poll() is not None:
+            sys.exit(f'uvicorn exited with status {server.returncode}')
+        try:
+            await client.get('/metrics')
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.2)
+    sys.exit('uvicorn did not start in time')
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args):
+    hotels = await load_hotels()
+    server = None
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    if args.target == 'asgi':
+        from app.main import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://benchmark')
+    else:
+        port = free_port()
+        server = subprocess.Popen([sys.executable, '-m', 'uvicorn', 'app.main:app', '--port', str(port),
+                                   '--workers', str(args.workers), '--no-access-log', '--log-level', 'warning'])
+        client = httpx.AsyncClient(base_url=f'http://127.0.0.1:{port}', limits=limits, timeout=30.0)
+
+    results = {}
+    try:
+        async with client:
+            if server is not None:
+                await wait_until_ready(client, server)
+            token = (await login(client)).json()['access_token']
+            headers = {'Authorization': f'Bearer {token}'}
+            for name in args.scenarios:
+                results[name] = await run_scenario(name, client, args, hotels, headers)
+                print(f"{name:<16} {results[name]['rps']:>9.1f} rps  p50 {results[name]['p50_ms']:.2f} ms  "
+                      f"p95 {results[name]['p95_ms']:.2f} ms  p99 {results[name]['p99_ms']:.2f} ms  "
+                      f"{results[name]['statuses']}")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'target': args.target,
+        'concurrency': args.concurrency,
+        'duration': args.duration,
+        'workers': args.workers if args.target == 'uvicorn' else None,
+        'python': platform.python_version(),
+        'results': results,
+    }
+    with open(args.output, 'w') as output:
+        json.dump(report, output, indent=2)
+    print(f'Wrote {args.output}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main(parse_args()))
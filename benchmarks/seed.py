@@ -0,0 +1,99 @@
+"""Seed the database in DATABASE_URL with benchmark volumes.
+
+    python -m benchmarks.seed --hotels 2000 --group-contracts 1000000
+
+Run it once against an empty, migrated database. Rows are generated deterministically from
+``--seed`` and written through ``crud.bulk_insert`` in batches, so memory stays flat however
+many group contracts are requested. It also creates the ``bench`` user that
+``benchmarks.run`` logs in as.
+"""
+import argparse
+import asyncio
+import random
+from datetime import date, timedelta
+
+from app.contracts import crud, models
+from app.contracts.models import OccupancyType
+from app.db.session import SessionLocal, engine
+from app.users import crud as user_crud
+from app.users.schemas import UserCreate
+
+BENCH_USERNAME = 'bench'
+BENCH_EMAIL = 'bench@example.com'
+BENCH_PASSWORD = 'bench-password'
+
+BATCH_SIZE = 50000
+SEASON_START = date(2024, 1, 1)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--hotels', type=int, default=2000)
+    parser.add_argument('--room-types', type=int, default=5, help='per hotel')
+    parser.add_argument('--seasons', type=int, default=4, help='per hotel')
+    parser.add_argument('--group-contracts', type=int, default=1000000, help='in total')
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args()
+
+
+def contract_row(rng: random.Random, index: int, hotel_ids):
+    start_date = SEASON_START + timedelta(days=rng.randrange(365))
+    return {'hotel_id': rng.choice(hotel_ids), 'group_name': f'Group {index}', 'customer': f'Customer {index % 5000}',
+            'travel_agent': f'Agent {index % 300}', 'start_date': start_date,
+            'end_date': start_date + timedelta(days=rng.randint(3, 14)), 'contract': 'Seeded contract'}
+
+
+async def insert_batched(db, model, rows):
+    ids, batch = [], []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            ids.extend(await crud.bulk_insert(db, model, batch))
+            batch = []
+    if batch:
+        ids.extend(await crud.bulk_insert(db, model, batch))
+    return ids
+
+
+async def seed(args):
+    rng = random.Random(args.seed)
+    season_days = 365 // args.seasons
+    async with SessionLocal() as db:
+        hotel_ids = await insert_batched(db, models.Hotel, (
+            {'name': f'Benchmark Hotel {index:06d}', 'location': f'Location {index % 50}',
+             'description': 'Seeded for benchmarks', 'is_active': True}
+            for index in range(args.hotels)))
+        print(f'{len(hotel_ids)} hotels')
+
+        room_type_ids = await insert_batched(db, models.RoomType, (
+            {'hotel_id': hotel_id, 'name': f'Room type {index}', 'number_of_rooms': rng.randint(5, 60)}
+            for hotel_id in hotel_ids for index in range(args.room_types)))
+        season_ids = await insert_batched(db, models.Season, (
+            {'hotel_id': hotel_id, 'name': f'Season {index}',
+             'start_date': SEASON_START + timedelta(days=index * season_days),
+             'end_date': SEASON_START + timedelta(days=(index + 1) * season_days - 1)}
+            for hotel_id in hotel_ids for index in range(args.seasons)))
+        print(f'{len(room_type_ids)} room types, {len(season_ids)} seasons')
+
+        # Room types and seasons were inserted hotel by hotel, so hotel i owns slices i of both.
+        rate_count = len(await insert_batched(db, models.OccupancyRate, (
+            {'room_type_id': room_type_id, 'season_id': season_id, 'occupancy_type': occupancy_type,
+             'rate': round(rng.uniform(80, 400), 2)}
+            for position in range(len(hotel_ids))
+            for room_type_id in room_type_ids[position * args.room_types:(position + 1) * args.room_types]
+            for season_id in season_ids[position * args.seasons:(position + 1) * args.seasons]
+            for occupancy_type in OccupancyType)))
+        print(f'{rate_count} occupancy rates')
+
+        contract_count = len(await insert_batched(db, models.GroupContract, (
+            contract_row(rng, index, hotel_ids) for index in range(args.group_contracts))))
+        print(f'{contract_count} group contracts')
+
+        if not await user_crud.get_user_by_username(db, BENCH_USERNAME):
+            await user_crud.create_user(db, UserCreate(username=BENCH_USERNAME, email=BENCH_EMAIL,
+                                                       password=BENCH_PASSWORD))
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(seed(parse_args()))
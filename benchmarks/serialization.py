@@ -0,0 +1,110 @@
+"""Compare the two ways of serving ``GET /hotels?limit=100`` and write the results as JSON.
+
+    python -m benchmarks.serialization --repeat 50 --output serialization.json
+
+``orm`` is the response_model path: ``crud.get_hotels`` loads ORM objects with
+``HOTEL_LOADER_OPTIONS``, and FastAPI's own ``serialize_response`` validates them against the
+route's ``List[schemas.Hotel]`` before ``JSONResponse`` encodes them. ``projection`` is the path
+the endpoint uses: ``crud.get_hotel_rows`` selects schema-shaped rows and ``FastJSONResponse``
+encodes them as they are. Both run against the same page of the seeded database. Load and
+serialize times are reported separately. The run fails if the two bodies decode to different
+documents.
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+from app.contracts import crud
+from app.core.responses import FastJSONResponse
+from app.db.session import SessionLocal, engine
+from app.main import app
+
+PATHS = ('orm', 'projection')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--limit', type=int, default=100, help='hotels per page')
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--output', default='serialization-results.json')
+    return parser.parse_args()
+
+
+def hotels_route():
+    return next(route for route in app.routes if getattr(route, 'path', None) == '/hotels' and 'GET' in route.methods)
+
+
+async def orm_path(db, limit: int):
+    start = time.perf_counter()
+    hotels = await crud.get_hotels(db, limit=limit, options=crud.HOTEL_LOADER_OPTIONS)
+    loaded = time.perf_counter()
+    content = await serialize_response(field=hotels_route().response_field, response_content=hotels)
+    return JSONResponse(content).body, loaded - start, time.perf_counter() - loaded
+
+
+async def projection_path(db, limit: int):
+    start = time.perf_counter()
+    hotels = await crud.get_hotel_rows(db, limit=limit)
+    loaded = time.perf_counter()
+    return FastJSONResponse(hotels).body, loaded - start, time.perf_counter() - loaded
+
+
+def canonical(value):
+    """``value`` with every list of records sorted by id; neither path promises an order for them."""
+    if isinstance(value, dict):
+        return {key: canonical(item) for key, item in value.items()}
+    if isinstance(value, list):
+        items = [canonical(item) for item in value]
+        if all(isinstance(item, dict) and 'id' in item for item in items):
+            items.sort(key=lambda item: item['id'])
+        return items
+    return value
+
+
+def summarize(seconds) -> dict:
+    p50, p95 = (np.percentile(seconds, [50, 95]) * 1000).tolist()
+    return {'mean_ms': float(np.mean(seconds) * 1000), 'p50_ms': p50, 'p95_ms': p95}
+
+
+async def main(args):
+    runners = {'orm': orm_path, 'projection': projection_path}
+    timings = {name: {'load': [], 'serialize': []} for name in PATHS}
+    bodies = {}
+    async with SessionLocal() as db:
+        for iteration in range(args.warmup + args.repeat):
+            for name in PATHS:
+                # A fresh identity map each time, as every request gets its own session.
+                db.expunge_all()
+                body, load, serialize = await runners[name](db, args.limit)
+                bodies[name] = body
+                if iteration >= args.warmup:
+                    timings[name]['load'].append(load)
+                    timings[name]['serialize'].append(serialize)
+    await engine.dispose()
+
+    if canonical(json.loads(bodies['orm'])) != canonical(json.loads(bodies['projection'])):
+        raise SystemExit('The two paths produced different responses')
+    results = {}
+    for name in PATHS:
+        totals = np.add(timings[name]['load'], timings[name]['serialize'])
+        results[name] = {'load': summarize(timings[name]['load']),
+                         'serialize': summarize(timings[name]['serialize']),
+                         'total': summarize(totals), 'bytes': len(bodies[name])}
+        print(f"{name:<11} load p50 {results[name]['load']['p50_ms']:8.2f} ms  "
+              f"serialize p50 {results[name]['serialize']['p50_ms']:8.2f} ms  "
+              f"total p50 {results[name]['total']['p50_ms']:8.2f} ms  p95 {results[name]['total']['p95_ms']:8.2f} ms")
+    print(f"speedup     {results['orm']['total']['p50_ms'] / results['projection']['total']['p50_ms']:.1f}x (p50 total)")
+
+    with open(args.output, 'w') as output:
+        json.dump({'limit': args.limit, 'repeat': args.repeat, 'results': results}, output, indent=2)
+    print(f'Wrote {args.output}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main(parse_args()))
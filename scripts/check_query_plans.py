@@ -0,0 +1,121 @@
+"""Check that the hot query paths are served by indexes, using EXPLAIN against DATABASE_URL.
+
+Each check runs the real crud function against a few seed rows, captures every statement it
+sends (including selectinload follow-ups) and inspects its ``EXPLAIN (FORMAT JSON)`` plan.
+Sequential scans are disabled for the session, so even a near-empty development database
+reports whether an index can serve the query: a ``Seq Scan`` that survives means none can.
+The seed rows are rolled back at the end.
+
+    python -m scripts.check_query_plans
+"""
+import asyncio
+import json
+import sys
+from datetime import date
+
+from sqlalchemy import event, text
+
+from app.contracts import crud, models
+from app.contracts.season_index import SeasonInterval
+from app.db.session import SessionLocal, engine
+from app.quotes.crud import get_rate_table
+from app.users import crud as user_crud
+from app.users.models import User, UserPreferences, UserProfile
+
+
+async def seed(db):
+    hotel = models.Hotel(name='query plan check')
+    db.add(hotel)
+    await db.flush()
+    room_type = models.RoomType(hotel_id=hotel.id, name='double')
+    season = models.Season(hotel_id=hotel.id, name='high', start_date=date(2024, 1, 1), end_date=date(2024, 3, 31))
+    user = User(username='query-plan-check', email='query-plan-check@example.com', hashed_password='-')
+    db.add_all([room_type, season, user, models.MealOption(hotel_id=hotel.id, name='breakfast', price=10),
+                models.SpecialOffer(hotel_id=hotel.id, name='offer'),
+                models.BookingPolicy(hotel_id=hotel.id, name='policy'),
+                models.GroupContract(hotel_id=hotel.id, group_name='group', start_date=date(2024, 2, 1))])
+    await db.flush()
+    db.add_all([models.OccupancyRate(room_type_id=room_type.id, season_id=season.id,
+                                     occupancy_type=models.OccupancyType.DOUBLE, rate=100),
+                models.DivingPackage(season_id=season.id, name='dives', price=50),
+                UserProfile(user_id=user.id), UserPreferences(user_id=user.id)])
+    await db.flush()
+    return {'hotel_id': hotel.id, 'room_type_id': room_type.id, 'season': season, 'user_id': user.id}
+
+
+def checks(ids):
+    hotel_id, room_type_id, season, user_id = ids['hotel_id'], ids['room_type_id'], ids['season'], ids['user_id']
+    return {
+        'hotel with nested collections': lambda db: crud.get_hotel(db, hotel_id, options=crud.HOTEL_LOADER_OPTIONS),
+        'room types by hotel': lambda db: crud.get_room_types(db, hotel_id, options=crud.ROOM_TYPE_LOADER_OPTIONS),
+        'meal options by hotel': lambda db: crud.get_meal_options(db, hotel_id),
+        'special offers by hotel': lambda db: crud.get_special_offers(db, hotel_id),
+        'booking policies by hotel': lambda db: crud.get_booking_policies(db, hotel_id),
+        'diving packages by season': lambda db: crud.get_diving_packages(db, season.id),
+        'occupancy rates by room type and season': lambda db: crud.get_occupancy_rates(db, room_type_id, season.id),
+        'group contracts by hotel and start date': lambda db: crud.get_group_contracts(
+            db, hotel_id=hotel_id, start_date='2024-02-01'),
+        'seasons by hotel': lambda db: crud.get_seasons(db, hotel_id, options=crud.SEASON_LOADER_OPTIONS),
+        'seasons overlapping dates': lambda db: crud.get_seasons(
+            db, hotel_id, start_date=date(2024, 2, 1), end_date=date(2024, 2, 8)),
+        'rate table for quotes': lambda db: get_rate_table(
+            db, hotel_id, [SeasonInterval(season.id, season.start_date, season.end_date)]),
+        'user with profile and preferences': lambda db: user_crud.get_user(
+            db, user_id, options=user_crud.USER_LOADER_OPTIONS),
+    }
+
+
+def scans(plan):
+    yield plan
+    for child in plan.get('Plans', ()):
+        yield from scans(child)
+
+
+async def explain(db, statement, parameters):
+    connection = await db.connection()
+    value = (await connection.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {statement}', parameters)).scalar()
+    return (json.loads(value) if isinstance(value, str) else value)[0]['Plan']
+
+
+async def run_check(db, check):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', capture)
+    try:
+        await check(db)
+    finally:
+        event.remove(engine.sync_engine, 'before_cursor_execute', capture)
+
+    seq_scans, indexes = [], []
+    for statement, parameters in statements:
+        for node in scans(await explain(db, statement, parameters)):
+            if node['Node Type'] == 'Seq Scan':
+                seq_scans.append(node['Relation Name'])
+            elif 'Index Name' in node:
+                indexes.append(node['Index Name'])
+    return seq_scans, indexes
+
+
+async def main() -> int:
+    failures = 0
+    async with SessionLocal() as db:
+        try:
+            await db.execute(text('SET LOCAL enable_seqscan = off'))
+            for name, check in checks(await seed(db)).items():
+                seq_scans, indexes = await run_check(db, check)
+                if seq_scans:
+                    failures += 1
+                    print(f'FAIL  {name}: sequential scan on {", ".join(sorted(set(seq_scans)))}')
+                else:
+                    print(f'ok    {name}: {", ".join(dict.fromkeys(indexes))}')
+        finally:
+            await db.rollback()
+    await engine.dispose()
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
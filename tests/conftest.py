@@ -0,0 +1,128 @@
+"""Shared fixtures for the API tests.
+
+The tests run against the Postgres database named by ``TEST_DATABASE_URL``. Its tables are
+created when the session starts and dropped at the end, so never point it at a database you
+care about. Without it, every test that needs the database is skipped.
+
+Every request made by a test is checked against its endpoint's ``@query_budget`` in strict
+mode, so exceeding a budget fails the test that made the request.
+"""
+import asyncio
+import os
+from contextlib import contextmanager
+from datetime import date
+from uuid import uuid4
+
+import pytest
+
+TEST_DATABASE_URL = os.environ.get('TEST_DATABASE_URL')
+# Settings are read on import, so this has to happen before the app is imported. Without a
+# test database, point the app at an address that is never connected to instead of at .env.
+os.environ['DATABASE_URL'] = TEST_DATABASE_URL or 'postgresql://test-database-not-configured/test'
+os.environ.setdefault('SECRET_KEY', 'test-secret-key')
+os.environ.setdefault('ALGORITHM', 'HS256')
+os.environ.setdefault('ACCESS_TOKEN_EXPIRE_MINUTES', '30')
+os.environ['QUERY_DEBUG'] = 'true'
+os.environ['QUERY_DEBUG_STRICT'] = 'true'
+
+import httpx  # noqa: E402
+from sqlalchemy import event, text  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+
+from app.db.base_class import Base  # noqa: E402
+from app.db.session import engine, get_async_database_url  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+async def _create_schema(url: str):
+    schema_engine = create_async_engine(get_async_database_url(url))
+    async with schema_engine.begin() as connection:
+        # The extensions the migrations install for the trigram and date range indexes.
+        for extension in ('pg_trgm', 'btree_gist'):
+            await connection.execute(text(f'CREATE EXTENSION IF NOT EXISTS {extension}'))
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    await schema_engine.dispose()
+
+
+async def _drop_schema(url: str):
+    schema_engine = create_async_engine(get_async_database_url(url))
+    async with schema_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+    await schema_engine.dispose()
+
+
+@pytest.fixture(scope='session')
+def database():
+    if not TEST_DATABASE_URL:
+        pytest.skip('TEST_DATABASE_URL is not set')
+    asyncio.run(_create_schema(TEST_DATABASE_URL))
+    yield
+    asyncio.run(_drop_schema(TEST_DATABASE_URL))
+
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+
+@pytest.fixture
+async def client(database):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test') as client:
+        yield client
+    # Pooled connections belong to this test's event loop; the next test starts a new one.
+    await engine.dispose()
+
+
+def unique_name(prefix: str) -> str:
+    """Tables are shared by the whole session, so names with unique constraints get a suffix."""
+    return f'{prefix}{uuid4().hex[:12]}'
+
+
+@pytest.fixture
+def count_statements():
+    """``with count_statements() as statements:`` collects every statement sent inside the block."""
+    @contextmanager
+    def counting():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, 'before_cursor_execute', record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine.sync_engine, 'before_cursor_execute', record)
+    return counting
+
+
+@pytest.fixture
+def make_hotel(client):
+    """Create a hotel through the API with ``children`` of every nested catalog resource; returns its id."""
+    async def make(children: int = 0) -> int:
+        response = await client.post('/hotels', json={'name': unique_name('Hotel '), 'location': 'Test'})
+        assert response.status_code == 200, response.text
+        hotel_id = response.json()['id']
+        if not children:
+            return hotel_id
+        response = await client.post(f'/hotels/{hotel_id}/seasons', json={
+            'hotel_id': hotel_id, 'name': 'Season', 'start_date': '2025-01-01', 'end_date': '2025-12-31'})
+        season_id = response.json()['id']
+        for index in range(children):
+            response = await client.post(f'/hotels/{hotel_id}/room_types', json={
+                'hotel_id': hotel_id, 'name': f'Room {index}', 'number_of_rooms': 10})
+            room_type_id = response.json()['id']
+            await client.post('/occupancy_rates', json={
+                'room_type_id': room_type_id, 'season_id': season_id, 'occupancy_type': 'double', 'rate': 100})
+            await client.post(f'/hotels/{hotel_id}/meal_options', json={
+                'hotel_id': hotel_id, 'name': f'Meal {index}', 'price': 10})
+            await client.post(f'/hotels/{hotel_id}/special_offers', json={
+                'hotel_id': hotel_id, 'name': f'Offer {index}'})
+            await client.post(f'/hotels/{hotel_id}/booking_policies', json={
+                'hotel_id': hotel_id, 'name': f'Policy {index}'})
+            await client.post(f'/hotels/{hotel_id}/group_contracts', json={
+                'hotel_id': hotel_id, 'group_name': f'Group {index}', 'customer': 'Customer',
+                'start_date': date(2025, 2, 1).isoformat(), 'end_date': date(2025, 2, 5).isoformat()})
+        return hotel_id
+    return make
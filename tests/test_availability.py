@@ -0,0 +1,142 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from app.contracts.availability import HotelAvailability, NightTree
+
+pytestmark = pytest.mark.anyio
+
+ROOM_TYPE_ID = 1
+FEB_1 = date(2025, 2, 1)
+
+
+def night(day: int) -> date:
+    return FEB_1 + timedelta(days=day)
+
+
+def brute_force_peak(stays, start: date, end: date) -> int:
+    """Most rooms held on any night of [start, end), counted night by night."""
+    nights = [start + timedelta(days=offset) for offset in range((end - start).days)]
+    return max((sum(rooms for stay_start, stay_end, rooms in stays if stay_start <= day < stay_end)
+                for day in nights), default=0)
+
+
+def test_night_tree_sums_overlapping_ranges():
+    tree = NightTree(FEB_1, 64)
+    tree.allocate(night(0), night(10), 3)
+    tree.allocate(night(5), night(15), 4)
+    tree.allocate(night(7), night(8), 2)
+    assert tree.peak_between(night(0), night(5)) == 3
+    assert tree.peak_between(night(0), night(7)) == 7
+    assert tree.peak_between(night(7), night(8)) == 9
+    assert tree.peak_between(night(10), night(15)) == 4
+    assert tree.peak_between(night(15), night(64)) == 0
+
+
+def test_adjacent_stays_do_not_overlap():
+    # Checking out on the night another group checks in frees the rooms for it.
+    availability = HotelAvailability(version=1, capacities={ROOM_TYPE_ID: 10})
+    availability.allocate(ROOM_TYPE_ID, night(0), night(4), 10)
+    availability.allocate(ROOM_TYPE_ID, night(4), night(8), 10)
+    assert availability.booked(ROOM_TYPE_ID, night(0), night(8)) == 10
+    assert availability.free(ROOM_TYPE_ID, night(3), night(4)) == 0
+    assert availability.free(ROOM_TYPE_ID, night(8), night(9)) == 10
+
+
+def test_allocations_outside_the_tree_regrow_it():
+    availability = HotelAvailability(version=1, capacities={ROOM_TYPE_ID: 20})
+    availability.allocate(ROOM_TYPE_ID, night(0), night(10), 5)
+    origin = availability._trees[ROOM_TYPE_ID].origin
+
+    # One stay before the origin and one far past the first tree's 64 nights.
+    availability.allocate(ROOM_TYPE_ID, night(-30), night(2), 4)
+    availability.allocate(ROOM_TYPE_ID, night(400), night(410), 7)
+    tree = availability._trees[ROOM_TYPE_ID]
+    assert tree.origin < origin
+    assert tree.covers(night(-30), night(410))
+
+    assert availability.booked(ROOM_TYPE_ID, night(-30), night(0)) == 4
+    assert availability.booked(ROOM_TYPE_ID, night(0), night(2)) == 9
+    assert availability.booked(ROOM_TYPE_ID, night(2), night(10)) == 5
+    assert availability.booked(ROOM_TYPE_ID, night(10), night(400)) == 0
+    assert availability.booked(ROOM_TYPE_ID, night(405), night(500)) == 7
+    # Ranges reaching past the tree are clamped rather than read out of bounds.
+    assert availability.booked(ROOM_TYPE_ID, night(-1000), night(1000)) == 9
+
+
+def test_unknown_or_uncapped_room_types():
+    availability = HotelAvailability(version=1, capacities={ROOM_TYPE_ID: None})
+    availability.allocate(ROOM_TYPE_ID, night(0), night(2), 3)
+    assert availability.booked(ROOM_TYPE_ID, night(0), night(2)) == 3
+    assert availability.free(ROOM_TYPE_ID, night(0), night(2)) is None
+    assert availability.booked(ROOM_TYPE_ID + 1, night(0), night(2)) == 0
+
+
+def test_availability_matches_a_night_by_night_count():
+    rng = random.Random(20250201)
+    availability = HotelAvailability(version=1, capacities={ROOM_TYPE_ID: 1000})
+    stays = []
+    for _ in range(200):
+        start = night(rng.randrange(-100, 300))
+        stay = (start, start + timedelta(days=rng.randrange(1, 30)), rng.randrange(1, 5))
+        stays.append(stay)
+        availability.allocate(ROOM_TYPE_ID, *stay)
+    for _ in range(200):
+        start = night(rng.randrange(-120, 320))
+        end = start + timedelta(days=rng.randrange(1, 60))
+        assert availability.booked(ROOM_TYPE_ID, start, end) == brute_force_peak(stays, start, end)
+
+
+@pytest.fixture
+async def room_type(client, make_hotel):
+    """``(hotel_id, room_type_id)`` of a hotel whose one room type has 10 rooms."""
+    hotel_id = await make_hotel(children=1)
+    return hotel_id, (await client.get(f'/hotels/{hotel_id}/room_types')).json()[0]['id']
+
+
+async def book(client, hotel_id: int, room_type_id: int, start: date, end: date, rooms: int):
+    return await client.post(f'/hotels/{hotel_id}/group_contracts', json={
+        'hotel_id': hotel_id, 'group_name': 'Divers', 'customer': 'Customer',
+        'start_date': start.isoformat(), 'end_date': end.isoformat(),
+        'room_allocations': [{'room_type_id': room_type_id, 'rooms': rooms}]})
+
+
+async def booked_rooms(client, hotel_id: int, start: date, end: date) -> int:
+    response = await client.get(f'/hotels/{hotel_id}/availability',
+                                params={'start_date': start.isoformat(), 'end_date': end.isoformat()})
+    assert response.status_code == 200, response.text
+    return response.json()[0]['booked']
+
+
+async def test_room_allocations_are_checked_against_capacity(client, room_type):
+    hotel_id, room_type_id = room_type
+    response = await book(client, hotel_id, room_type_id, night(0), night(4), 6)
+    assert response.status_code == 200, response.text
+
+    response = await book(client, hotel_id, room_type_id, night(3), night(6), 5)
+    assert response.status_code == 409
+    assert response.json()['detail'] == (f'Room type {room_type_id} has 4 rooms free between '
+                                         f'{night(3)} and {night(6)}, 5 requested')
+
+    # Checking in on the night the first group checks out fits the full capacity.
+    response = await book(client, hotel_id, room_type_id, night(4), night(6), 10)
+    assert response.status_code == 200, response.text
+    assert await booked_rooms(client, hotel_id, night(0), night(4)) == 6
+    assert await booked_rooms(client, hotel_id, night(0), night(6)) == 10
+
+
+async def test_room_allocations_of_another_hotel_are_rejected(client, make_hotel, room_type):
+    other_hotel_id, room_type_id = await make_hotel(), room_type[1]
+    response = await book(client, other_hotel_id, room_type_id, night(0), night(4), 1)
+    assert response.status_code == 400
+    assert response.json()['detail'] == f'Room type {room_type_id} does not belong to this hotel'
+
+
+@pytest.mark.parametrize('nights', [0, -1])
+async def test_room_allocations_need_a_stay_of_at_least_one_night(client, room_type, nights):
+    hotel_id, room_type_id = room_type
+    response = await book(client, hotel_id, room_type_id, night(4), night(4 + nights), 1)
+    assert response.status_code == 400
+    assert response.json()['detail'] == 'end_date must be after start_date'
+    assert await booked_rooms(client, hotel_id, night(0), night(8)) == 0
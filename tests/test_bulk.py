@@ -0,0 +1,91 @@
+import pytest
+from sqlalchemy import insert, update
+
+from app.contracts import crud, models
+from app.db.session import SessionLocal
+from tests.test_documents import write_elsewhere
+
+pytestmark = pytest.mark.anyio
+
+
+async def post_bulk(client, path, rows, status_code=200):
+    response = await client.post(path, json=rows)
+    assert response.status_code == status_code, response.text
+    return response.json()
+
+
+async def test_bulk_creates_rows_in_input_order(client, make_hotel):
+    hotel_id = await make_hotel()
+    room_type_ids = (await post_bulk(client, f'/hotels/{hotel_id}/room_types:bulk', [
+        {'hotel_id': hotel_id, 'name': f'Room {index}', 'number_of_rooms': 5} for index in range(3)]))['ids']
+    season_ids = (await post_bulk(client, f'/hotels/{hotel_id}/seasons:bulk', [
+        {'hotel_id': hotel_id, 'name': 'Low', 'start_date': '2025-01-01', 'end_date': '2025-05-31'},
+        {'hotel_id': hotel_id, 'name': 'High', 'start_date': '2025-06-01', 'end_date': '2025-12-31'}]))['ids']
+    meal_option_ids = (await post_bulk(client, f'/hotels/{hotel_id}/meal_options:bulk', [
+        {'hotel_id': hotel_id, 'name': 'Breakfast', 'price': 10}]))['ids']
+    rate_ids = (await post_bulk(client, '/occupancy_rates:bulk', [
+        {'room_type_id': room_type_id, 'season_id': season_id, 'occupancy_type': 'double', 'rate': rate}
+        for rate, (room_type_id, season_id) in enumerate(
+            ((r, s) for s in season_ids for r in room_type_ids), start=100)]))['ids']
+
+    assert [r['name'] for r in (await client.get(f'/hotels/{hotel_id}/room_types')).json()] == [
+        'Room 0', 'Room 1', 'Room 2']
+    assert [r['id'] for r in (await client.get(f'/hotels/{hotel_id}/room_types')).json()] == room_type_ids
+    assert [s['name'] for s in (await client.get(f'/hotels/{hotel_id}/seasons')).json()] == ['Low', 'High']
+    assert [m['id'] for m in (await client.get(f'/hotels/{hotel_id}/meal_options')).json()] == meal_option_ids
+    assert len(rate_ids) == 6
+
+    matrix = (await client.get(f'/hotels/{hotel_id}/rate_matrix')).json()
+    double = matrix['occupancy_types'].index('double')
+    assert [[rates[double] for rates in row] for row in matrix['rates']] == [[100, 101, 102], [103, 104, 105]]
+
+
+async def test_bulk_occupancy_rates_reject_unknown_ids(client, make_hotel):
+    hotel_id = await make_hotel(children=1)
+    room_type_id = (await client.get(f'/hotels/{hotel_id}/room_types')).json()[0]['id']
+    season_id = (await client.get(f'/hotels/{hotel_id}/seasons')).json()[0]['id']
+    missing_id = 2**31 - 1
+
+    detail = (await post_bulk(client, '/occupancy_rates:bulk', [
+        {'room_type_id': room_type_id, 'season_id': season_id, 'occupancy_type': 'single', 'rate': 80},
+        {'room_type_id': missing_id, 'season_id': season_id, 'occupancy_type': 'single', 'rate': 80}],
+        status_code=400))['detail']
+    assert detail == f'Unknown room types [{missing_id}] or seasons []'
+
+    detail = (await post_bulk(client, '/occupancy_rates:bulk', [
+        {'room_type_id': room_type_id, 'season_id': missing_id, 'occupancy_type': 'single', 'rate': 80}],
+        status_code=400))['detail']
+    assert detail == f'Unknown room types [] or seasons [{missing_id}]'
+
+    # Nothing of the rejected batches was written.
+    rates = (await client.get(f'/room_types/{room_type_id}/seasons/{season_id}/occupancy_rates')).json()
+    assert [r['occupancy_type'] for r in rates] == ['double']
+
+
+@pytest.mark.parametrize('path', ['/hotels/{hotel_id}/room_types:bulk', '/hotels/{hotel_id}/seasons:bulk',
+                                  '/hotels/{hotel_id}/meal_options:bulk', '/occupancy_rates:bulk'])
+async def test_empty_bulk_payload_is_rejected(client, make_hotel, path):
+    hotel_id = await make_hotel(children=1)
+    etag = (await client.get(f'/hotels/{hotel_id}/rate_matrix')).headers['etag']
+    await post_bulk(client, path.format(hotel_id=hotel_id), [], status_code=422)
+    assert (await client.get(f'/hotels/{hotel_id}/rate_matrix')).headers['etag'] == etag
+
+
+@pytest.mark.parametrize('create', [
+    lambda db, hotel_id: crud.create_room_types(db, room_types=[], hotel_id=hotel_id),
+    lambda db, hotel_id: crud.create_seasons(db, seasons=[], hotel_id=hotel_id),
+])
+async def test_empty_bulk_create_leaves_the_rate_matrix_current(client, make_hotel, create):
+    hotel_id = await make_hotel(children=1)
+    assert len((await client.get(f'/hotels/{hotel_id}/rate_matrix')).json()['room_type_ids']) == 1
+
+    async with SessionLocal() as db:
+        assert await create(db, hotel_id) == []
+
+    # A room type added by another worker moves the hotel to the next version; the cached matrix
+    # must not already claim that version.
+    await write_elsewhere(
+        insert(models.RoomType).values(hotel_id=hotel_id, name='Suite', number_of_rooms=2),
+        update(models.Hotel).where(models.Hotel.id == hotel_id).values(version=models.Hotel.version + 1))
+    matrix = (await client.get(f'/hotels/{hotel_id}/rate_matrix')).json()
+    assert len(matrix['room_type_ids']) == 2
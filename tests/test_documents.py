@@ -0,0 +1,49 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import insert, update
+
+from app.contracts import models
+from app.db.session import SessionLocal
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def group_contract(client, make_hotel):
+    """The one group contract (2025-02-01 to 2025-02-05) of a hotel with a full-year season."""
+    hotel_id = await make_hotel(children=1)
+    return (await client.get(f'/hotels/{hotel_id}/group_contracts')).json()[0]
+
+
+async def write_elsewhere(*statements):
+    """Commit ``statements`` from a session of their own, as a write through another worker would."""
+    async with SessionLocal() as db:
+        for statement in statements:
+            await db.execute(statement)
+        await db.commit()
+
+
+@pytest.mark.parametrize('format', ['html', 'text'])
+async def test_document_of_a_season_without_a_name(client, group_contract, format):
+    hotel_id = group_contract['hotel_id']
+    await write_elsewhere(
+        update(models.Season).where(models.Season.hotel_id == hotel_id).values(name=None),
+        update(models.Hotel).where(models.Hotel.id == hotel_id).values(version=models.Hotel.version + 1))
+    response = await client.get(f"/group_contracts/{group_contract['id']}/document", params={'format': format})
+    assert response.status_code == 200
+    assert '2025-01-01 to 2025-12-31' in response.text
+
+
+async def test_document_shows_seasons_added_by_another_process(client, group_contract):
+    path = f"/group_contracts/{group_contract['id']}/document"
+    assert 'Carnival' not in (await client.get(path)).text
+
+    hotel_id = group_contract['hotel_id']
+    await write_elsewhere(
+        insert(models.Season).values(hotel_id=hotel_id, name='Carnival', start_date=date(2025, 2, 3),
+                                     end_date=date(2025, 2, 10)),
+        update(models.Hotel).where(models.Hotel.id == hotel_id).values(version=models.Hotel.version + 1))
+    response = await client.get(path)
+    assert response.status_code == 200
+    assert 'Carnival' in response.text
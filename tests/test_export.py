@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+
+import pytest
+
+from app.db import export
+from tests.test_hotels import MISSING_HOTEL_ID
+
+pytestmark = pytest.mark.anyio
+
+
+async def get_export(client, path, format):
+    response = await client.get(path, params={'format': format})
+    assert response.status_code == 200, response.text
+    assert response.headers['content-type'].startswith(export.MEDIA_TYPES[export.ExportFormat(format)])
+    assert response.headers['content-disposition'].endswith(f'.{format}"')
+    if format == 'csv':
+        return list(csv.DictReader(io.StringIO(response.text)))
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+@pytest.fixture
+async def exported_hotel(client, make_hotel):
+    """A hotel with two room types, two group contracts and a double rate for each room type."""
+    return await make_hotel(children=2)
+
+
+@pytest.mark.parametrize('format', ['csv', 'ndjson'])
+async def test_export_group_contracts(client, exported_hotel, format):
+    rows = await get_export(client, f'/hotels/{exported_hotel}/group_contracts/export', format)
+    assert [row['group_name'] for row in rows] == ['Group 0', 'Group 1']
+    assert {row['start_date'] for row in rows} == {'2025-02-01'}
+    assert {str(row['hotel_id']) for row in rows} == {str(exported_hotel)}
+
+
+@pytest.mark.parametrize('format', ['csv', 'ndjson'])
+async def test_export_occupancy_rates(client, exported_hotel, format):
+    rows = await get_export(client, f'/hotels/{exported_hotel}/occupancy_rates/export', format)
+    assert [(row['room_type_name'], row['occupancy_type'], float(row['rate'])) for row in rows] == [
+        ('Room 0', 'double', 100), ('Room 1', 'double', 100)]
+    assert {row['season_name'] for row in rows} == {'Season'}
+
+
+@pytest.mark.parametrize('format', ['csv', 'ndjson'])
+async def test_export_spanning_several_partitions(client, exported_hotel, monkeypatch, format):
+    monkeypatch.setattr(export, 'EXPORT_BATCH_SIZE', 1)
+    rows = await get_export(client, f'/hotels/{exported_hotel}/group_contracts/export', format)
+    assert [row['group_name'] for row in rows] == ['Group 0', 'Group 1']
+
+
+async def test_csv_export_of_no_rows_has_a_header(client, make_hotel):
+    response = await client.get(f'/hotels/{await make_hotel()}/group_contracts/export')
+    assert response.status_code == 200
+    assert response.text.splitlines()[0].split(',')[:2] == ['id', 'hotel_id']
+    assert len(response.text.splitlines()) == 1
+
+
+@pytest.mark.parametrize('resource', ['group_contracts', 'occupancy_rates'])
+async def test_export_of_a_missing_hotel(client, resource):
+    response = await client.get(f'/hotels/{MISSING_HOTEL_ID}/{resource}/export')
+    assert response.status_code == 404
+    assert response.json() == {'detail': 'Hotel not found'}
+
+
+async def test_export_rejects_an_unknown_format(client, exported_hotel):
+    response = await client.get(f'/hotels/{exported_hotel}/group_contracts/export', params={'format': 'xml'})
+    assert response.status_code == 422
@@ -0,0 +1,162 @@
+import pytest
+from sqlalchemy import update
+
+from app.contracts import models
+from app.db.pagination import encode_cursor
+from app.db.session import SessionLocal
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_read_hotels_query_count_does_not_grow_with_the_page(client, make_hotel, count_statements):
+    single = await make_hotel(children=1)
+    with count_statements() as statements:
+        response = await client.get('/hotels', params={'cursor': encode_cursor(single - 1), 'limit': 1})
+    assert response.status_code == 200
+    assert [hotel['id'] for hotel in response.json()] == [single]
+    baseline = len(statements)
+
+    hotel_ids = [await make_hotel(children=3) for _ in range(4)]
+    with count_statements() as statements:
+        response = await client.get('/hotels', params={'cursor': encode_cursor(hotel_ids[0] - 1), 'limit': 4})
+    hotels = response.json()
+    assert [hotel['id'] for hotel in hotels] == hotel_ids
+    assert all(len(hotel['room_types']) == 3 and len(hotel['room_types'][0]['occupancy_rates']) == 1
+               and len(hotel['group_contracts']) == 3 for hotel in hotels)
+    assert len(statements) == baseline
+
+
+async def test_read_hotel_query_count_does_not_grow_with_the_catalog(client, make_hotel, count_statements):
+    small, large = await make_hotel(children=1), await make_hotel(children=5)
+    with count_statements() as small_statements:
+        assert (await client.get(f'/hotels/{small}')).status_code == 200
+    with count_statements() as large_statements:
+        response = await client.get(f'/hotels/{large}')
+    assert len(response.json()['meal_options']) == 5
+    assert len(large_statements) == len(small_statements)
+
+    # Revalidating a current copy only reads the hotel's version.
+    with count_statements() as statements:
+        response = await client.get(f'/hotels/{large}', headers={'If-None-Match': response.headers['etag']})
+    assert response.status_code == 304
+    assert len(statements) == 1
+
+
+async def test_catalog_page_etags_depend_on_the_query(client, make_hotel):
+    hotel_id = await make_hotel(children=2)
+    path = f'/hotels/{hotel_id}/room_types'
+    first_page = await client.get(path, params={'limit': 1})
+    both = await client.get(path, params={'limit': 2})
+    assert len(first_page.json()) == 1 and len(both.json()) == 2
+    assert first_page.headers['etag'] != both.headers['etag']
+
+    # A validator for one page does not revalidate another.
+    response = await client.get(path, params={'limit': 2}, headers={'If-None-Match': first_page.headers['etag']})
+    assert response.status_code == 200
+    assert response.json() == both.json()
+
+    # The order of the parameters does not matter.
+    response = await client.get(f'{path}?skip=0&limit=1')
+    etag = response.headers['etag']
+    response = await client.get(f'{path}?limit=1&skip=0', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+
+
+async def test_catalog_cache_misses_after_a_write_from_another_process(client, make_hotel):
+    hotel_id = await make_hotel(children=1)
+    paths = (f'/hotels/{hotel_id}', f'/hotels/{hotel_id}/room_types')
+    etags = [(await client.get(path)).headers['etag'] for path in paths]
+
+    # Another worker's write reaches this one only through the version it bumps.
+    async with SessionLocal() as db:
+        await db.execute(update(models.RoomType).where(models.RoomType.hotel_id == hotel_id).values(name='Suite'))
+        await db.execute(update(models.Hotel).where(models.Hotel.id == hotel_id).values(
+            version=models.Hotel.version + 1))
+        await db.commit()
+
+    hotel, room_types = [await client.get(path) for path in paths]
+    assert hotel.json()['room_types'][0]['name'] == 'Suite'
+    assert room_types.json()[0]['name'] == 'Suite'
+    assert hotel.headers['etag'] != etags[0] and room_types.headers['etag'] != etags[1]
+
+
+MISSING_HOTEL_ID = 2 ** 31 - 1
+MISSING_SEASON_ID = 2 ** 31 - 1
+
+SUB_RESOURCES = {
+    'room_types': {'name': 'Double', 'number_of_rooms': 10},
+    'meal_options': {'name': 'Half board', 'price': 10},
+    'special_offers': {'name': 'Early bird'},
+    'booking_policies': {'name': 'Deposit'},
+    'group_contracts': {'group_name': 'Group', 'customer': 'Customer', 'start_date': '2025-02-01',
+                        'end_date': '2025-02-05'},
+    'seasons': {'name': 'Season', 'start_date': '2025-01-01', 'end_date': '2025-12-31'},
+}
+
+
+@pytest.mark.parametrize('resource', SUB_RESOURCES)
+async def test_writes_under_a_missing_hotel_are_not_found(client, resource):
+    response = await client.post(f'/hotels/{MISSING_HOTEL_ID}/{resource}',
+                                 json={'hotel_id': MISSING_HOTEL_ID, **SUB_RESOURCES[resource]})
+    assert response.status_code == 404
+    assert response.json()['detail'] == 'Hotel not found'
+
+
+@pytest.mark.parametrize('resource', SUB_RESOURCES)
+async def test_writes_use_the_hotel_in_the_path(client, make_hotel, resource):
+    hotel_id, other_hotel_id = await make_hotel(), await make_hotel()
+    response = await client.post(f'/hotels/{hotel_id}/{resource}',
+                                 json={'hotel_id': other_hotel_id, **SUB_RESOURCES[resource]})
+    assert response.status_code == 200, response.text
+    assert response.json()['hotel_id'] == hotel_id
+
+
+@pytest.mark.parametrize('path', ['availability?start_date=2025-01-01&end_date=2025-01-02', 'rate_matrix'])
+async def test_hotel_reports_of_a_missing_hotel_are_not_found(client, path):
+    response = await client.get(f'/hotels/{MISSING_HOTEL_ID}/{path}')
+    assert response.status_code == 404
+    assert response.json()['detail'] == 'Hotel not found'
+
+
+async def test_duplicate_hotel_name_is_rejected(client, make_hotel):
+    hotel_id, other_hotel_id = await make_hotel(), await make_hotel()
+    name = (await client.get(f'/hotels/{hotel_id}')).json()['name']
+
+    response = await client.post('/hotels', json={'name': name, 'location': 'Elsewhere'})
+    assert response.status_code == 400
+    assert response.json()['detail'] == 'Hotel name already exists'
+
+    response = await client.put(f'/hotels/{other_hotel_id}', json={'name': name})
+    assert response.status_code == 400
+    assert response.json()['detail'] == 'Hotel name already exists'
+    # The rejected rename rolled back and left the hotel writable.
+    other_name = (await client.get(f'/hotels/{other_hotel_id}')).json()['name']
+    assert other_name != name
+    response = await client.put(f'/hotels/{other_hotel_id}', json={'name': other_name, 'location': 'Moved'})
+    assert response.status_code == 200, response.text
+    assert response.json()['location'] == 'Moved'
+
+
+async def test_diving_package_under_a_missing_season_is_not_found(client):
+    response = await client.post(f'/seasons/{MISSING_SEASON_ID}/diving_packages',
+                                 json={'season_id': MISSING_SEASON_ID, 'name': 'Reef', 'price': 50})
+    assert response.status_code == 404
+    assert response.json()['detail'] == 'Season not found'
+
+
+async def test_diving_package_uses_the_season_in_the_path(client, make_hotel):
+    hotel_id, other_hotel_id = await make_hotel(children=1), await make_hotel(children=1)
+    season_id = (await client.get(f'/hotels/{hotel_id}/seasons')).json()[0]['id']
+    other_season_id = (await client.get(f'/hotels/{other_hotel_id}/seasons')).json()[0]['id']
+    etag = (await client.get(f'/hotels/{hotel_id}')).headers['etag']
+    other_etag = (await client.get(f'/hotels/{other_hotel_id}')).headers['etag']
+
+    response = await client.post(f'/seasons/{season_id}/diving_packages',
+                                 json={'season_id': other_season_id, 'name': 'Reef', 'price': 50})
+    assert response.status_code == 200, response.text
+    assert response.json()['season_id'] == season_id
+    assert [p['name'] for p in (await client.get(f'/seasons/{season_id}/diving_packages')).json()] == ['Reef']
+    assert (await client.get(f'/seasons/{other_season_id}/diving_packages')).json() == []
+    # Only the hotel of the path's season moves to a new version.
+    assert (await client.get(f'/hotels/{hotel_id}')).headers['etag'] != etag
+    assert (await client.get(f'/hotels/{other_hotel_id}')).headers['etag'] == other_etag
@@ -0,0 +1,35 @@
+import pytest
+
+from tests.test_users import create_user
+
+pytestmark = pytest.mark.anyio
+
+
+async def scrape(client) -> dict:
+    response = await client.get('/metrics')
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain')
+    samples = {}
+    for line in response.text.splitlines():
+        if line and not line.startswith('#'):
+            series, value = line.rsplit(' ', 1)
+            samples[series] = float(value)
+    return samples
+
+
+def increase(before: dict, after: dict, series: str) -> float:
+    return after.get(series, 0.0) - before.get(series, 0.0)
+
+
+@pytest.mark.parametrize('route', ['/users/{user_id}/', '/hotels/{hotel_id}'])
+async def test_routers_update_request_and_database_counters(client, make_hotel, route):
+    path = route.format(user_id=(await create_user(client))['id'], hotel_id=await make_hotel())
+    before = await scrape(client)
+    for _ in range(3):
+        assert (await client.get(path)).status_code == 200
+    after = await scrape(client)
+
+    assert increase(before, after, f'http_requests_total{{method="GET",route="{route}",status="200"}}') == 3
+    assert increase(before, after, f'http_request_duration_seconds_count{{method="GET",route="{route}"}}') == 3
+    assert increase(before, after, f'db_request_queries_count{{method="GET",route="{route}"}}') == 3
+    assert increase(before, after, f'db_queries_total{{route="{route}"}}') >= 3
@@ -0,0 +1,39 @@
+import base64
+
+import pytest
+from fastapi import HTTPException
+
+from app.db.pagination import decode_cursor, encode_cursor
+
+pytestmark = pytest.mark.anyio
+
+INVALID_CURSORS = [
+    'not base64!',
+    base64.urlsafe_b64encode(b'\xff\xfe').decode(),
+    base64.urlsafe_b64encode(b'{"id": 1').decode(),
+    encode_cursor('abc'),
+    encode_cursor('12'),
+    encode_cursor(1.5),
+    encode_cursor(True),
+    encode_cursor(None),
+    encode_cursor([1]),
+    encode_cursor(2 ** 31),
+]
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(42)) == 42
+
+
+@pytest.mark.parametrize('cursor', INVALID_CURSORS)
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize('cursor', INVALID_CURSORS)
+async def test_invalid_cursor_is_a_bad_request(client, cursor):
+    response = await client.get('/hotels', params={'cursor': cursor})
+    assert response.status_code == 400
+    assert response.json()['detail'] == 'Invalid cursor'
@@ -0,0 +1,31 @@
+import httpx
+import pytest
+
+from app.core.query_debug import QueryBudgetExceeded
+from app.main import app
+from tests.test_users import create_user
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def read_user_budget(monkeypatch):
+    """Set the ``@query_budget`` of ``GET /users/{user_id}/`` for one test."""
+    route = next(route for route in app.routes
+                 if getattr(route, 'path', None) == '/users/{user_id}/' and 'GET' in route.methods)
+    return lambda budget: monkeypatch.setattr(route.endpoint, 'query_budget', budget)
+
+
+async def test_exceeded_budget_fails_the_request(client, read_user_budget):
+    path = f"/users/{(await create_user(client))['id']}/"
+    assert (await client.get(path)).status_code == 200
+
+    read_user_budget(0)
+    with pytest.raises(QueryBudgetExceeded, match='budget is 0'):
+        await client.get(path)
+
+    # A client that does not see the application's exceptions gets a 500, not the 200 body.
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url='http://test') as other_client:
+        response = await other_client.get(path)
+    assert response.status_code == 500
@@ -0,0 +1,138 @@
+from collections import namedtuple
+from datetime import date
+
+import numpy as np
+import pytest
+
+from app.contracts import crud, season_index
+from app.contracts.season_index import SeasonIndex
+from app.db.session import SessionLocal
+from app.quotes.engine import RateTable, stay_nights
+
+pytestmark = pytest.mark.anyio
+
+Season = namedtuple('Season', ['id', 'start_date', 'end_date'])
+
+# A full-year season with a March promotion inside it.
+YEAR = Season(1, date(2025, 1, 1), date(2025, 12, 31))
+MARCH = Season(2, date(2025, 3, 1), date(2025, 3, 31))
+
+
+def test_covering_falls_back_to_enclosing_season():
+    table = RateTable([YEAR, MARCH], [], [])
+    positions, covered = table.covering(stay_nights(date(2025, 2, 27), date(2025, 4, 3)))
+    assert covered.all()
+    season_ids = table.season_ids[positions].tolist()
+    assert season_ids == [1, 1] + [2] * 31 + [1, 1]
+
+    positions, covered = table.covering(stay_nights(date(2024, 12, 31), date(2025, 1, 2)))
+    assert covered.tolist() == [False, True]
+
+
+def test_covering_after_adding_a_nested_season():
+    table = RateTable([YEAR], [], [])
+    table.add_season(MARCH)
+    positions, covered = table.covering(np.array(['2025-03-15', '2025-04-05'], dtype='datetime64[D]'))
+    assert covered.all()
+    assert table.season_ids[positions].tolist() == [2, 1]
+
+
+def test_season_index_falls_back_to_enclosing_season():
+    index = SeasonIndex([MARCH, YEAR])
+    assert index.season_for(date(2025, 3, 15)).id == 2
+    assert index.season_for(date(2025, 4, 5)).id == 1
+    assert index.season_for(date(2026, 1, 1)) is None
+    assert [season.id for season in index.overlapping(date(2025, 4, 5), date(2025, 4, 8))] == [1]
+    assert [season.id for season in index.overlapping(date(2025, 3, 30), date(2025, 4, 3))] == [1, 2]
+
+
+@pytest.fixture
+async def nested_seasons_hotel(client, make_hotel):
+    """A hotel whose room costs 100 a night all year and 150 during a March promotion."""
+    hotel_id = await make_hotel()
+    room_type_id = (await client.post(f'/hotels/{hotel_id}/room_types', json={
+        'hotel_id': hotel_id, 'name': 'Double', 'number_of_rooms': 10})).json()['id']
+    for season, rate in ((YEAR, 100), (MARCH, 150)):
+        season_id = (await client.post(f'/hotels/{hotel_id}/seasons', json={
+            'hotel_id': hotel_id, 'name': f'Season {season.id}', 'start_date': season.start_date.isoformat(),
+            'end_date': season.end_date.isoformat()})).json()['id']
+        await client.post('/occupancy_rates', json={
+            'room_type_id': room_type_id, 'season_id': season_id, 'occupancy_type': 'double', 'rate': rate})
+    return {'hotel_id': hotel_id, 'start_date': '2025-03-30', 'end_date': '2025-04-03',
+            'configurations': [{'rooms': [{'room_type_id': room_type_id, 'occupancy_type': 'double'}]}]}
+
+
+async def test_batch_quote_across_the_end_of_a_nested_season(client, nested_seasons_hotel):
+    response = await client.post('/quotes:batch', json={'scenarios': [nested_seasons_hotel], 'nightly': True})
+    assert response.status_code == 200
+    result = response.json()['results'][0]
+    assert result['error'] is None
+    quote = result['quotes'][0]
+    assert [night['rooms'] for night in quote['nightly']] == [150, 150, 100, 100]
+    assert quote['rooms_total'] == 500
+
+
+async def test_quote_after_a_nested_season_uses_the_enclosing_one(client, nested_seasons_hotel):
+    response = await client.post('/quotes', json={**nested_seasons_hotel, 'start_date': '2025-04-05',
+                                                  'end_date': '2025-04-08'})
+    assert response.status_code == 200, response.text
+    quote = response.json()['quotes'][0]
+    assert [night['rooms'] for night in quote['nightly']] == [100, 100, 100]
+
+
+@pytest.mark.parametrize('changes', [
+    {'end_date': '2026-04-01'},
+    {'configurations': [{'rooms': [{'room_type_id': 1, 'occupancy_type': 'double'}]}] * 51},
+])
+async def test_oversized_quote_is_rejected(client, nested_seasons_hotel, changes):
+    response = await client.post('/quotes', json={**nested_seasons_hotel, **changes})
+    assert response.status_code == 422
+
+
+async def test_oversized_batch_is_rejected(client, nested_seasons_hotel):
+    response = await client.post('/quotes:batch', json={'scenarios': [nested_seasons_hotel] * 5001})
+    assert response.status_code == 422
+
+    # 1,000 stays of 300 nights stay under the scenario limit but not the total.
+    scenario = {**nested_seasons_hotel, 'start_date': '2025-01-01', 'end_date': '2025-10-28'}
+    response = await client.post('/quotes:batch', json={'scenarios': [scenario] * 1000})
+    assert response.status_code == 422
+    assert 'configuration nights' in response.text
+    response = await client.post('/quotes:batch', json={'scenarios': [scenario] * 10})
+    assert response.status_code == 200
+
+
+async def add_april_season(client, scenario: dict, rate: float = 200):
+    hotel_id, room_type_id = scenario['hotel_id'], scenario['configurations'][0]['rooms'][0]['room_type_id']
+    season_id = (await client.post(f'/hotels/{hotel_id}/seasons', json={
+        'hotel_id': hotel_id, 'name': 'April', 'start_date': '2025-04-01', 'end_date': '2025-04-30'})).json()['id']
+    await client.post('/occupancy_rates', json={
+        'room_type_id': room_type_id, 'season_id': season_id, 'occupancy_type': 'double', 'rate': rate})
+
+
+async def quote_april_rooms(client, scenario: dict):
+    response = await client.post('/quotes', json={**scenario, 'start_date': '2025-04-05', 'end_date': '2025-04-07'})
+    assert response.status_code == 200, response.text
+    return [night['rooms'] for night in response.json()['quotes'][0]['nightly']]
+
+
+async def test_season_write_invalidates_the_season_index(client, nested_seasons_hotel):
+    hotel_id = nested_seasons_hotel['hotel_id']
+    assert await quote_april_rooms(client, nested_seasons_hotel) == [100, 100]
+    assert season_index._indexes.get(hotel_id) is not None
+
+    await add_april_season(client, nested_seasons_hotel)
+    assert season_index._indexes.get(hotel_id) is None
+    assert await quote_april_rooms(client, nested_seasons_hotel) == [200, 200]
+
+
+async def test_season_index_loaded_before_a_write_is_not_served_after_it(client, nested_seasons_hotel):
+    hotel_id = nested_seasons_hotel['hotel_id']
+    async with SessionLocal() as db:
+        version = await crud.get_hotel_version(db, hotel_id)
+    stale = SeasonIndex([YEAR, MARCH])
+
+    await add_april_season(client, nested_seasons_hotel)
+    # A load that read the seasons before the write stores them after its invalidation.
+    season_index._indexes.set(hotel_id, (version, stale))
+    assert await quote_april_rooms(client, nested_seasons_hotel) == [200, 200]
@@ -0,0 +1,75 @@
+from collections import namedtuple
+from datetime import date
+
+import pytest
+from sqlalchemy import insert, update
+
+from app.contracts import models, rate_matrix
+from app.db.session import SessionLocal
+from app.quotes.engine import RateTable
+
+pytestmark = pytest.mark.anyio
+
+Season = namedtuple('Season', ['id', 'start_date', 'end_date'])
+RoomType = namedtuple('RoomType', ['id'])
+
+# Matrices cached by the unit tests below; no hotel has a negative id.
+HOTEL_ID = -1
+
+
+@pytest.fixture
+def cached_matrix():
+    table = RateTable([Season(1, date(2025, 1, 1), date(2025, 12, 31))], [RoomType(10)], [])
+    rate_matrix._matrices.set(HOTEL_ID, (3, table))
+    yield table
+    rate_matrix._matrices.pop(HOTEL_ID)
+
+
+def test_patches_skip_rows_a_reload_already_holds(cached_matrix):
+    rate_matrix.add_room_types({HOTEL_ID: 4}, [10, 11])
+    rate_matrix.add_seasons({HOTEL_ID: 5}, [Season(1, date(2025, 1, 1), date(2025, 12, 31)),
+                                            Season(2, date(2025, 3, 1), date(2025, 3, 31))])
+    assert cached_matrix.room_type_ids == [10, 11]
+    assert cached_matrix.season_ids.tolist() == [1, 2]
+    assert rate_matrix._matrices.get(HOTEL_ID) == (5, cached_matrix)
+
+
+def test_patches_drop_a_matrix_that_missed_a_write(cached_matrix):
+    # Version 4 was written elsewhere, so this write commits version 5.
+    rate_matrix.add_room_types({HOTEL_ID: 5}, [11])
+    assert rate_matrix._matrices.get(HOTEL_ID) is None
+    assert cached_matrix.room_type_ids == [10]
+
+
+async def test_rate_matrix_reloads_after_a_write_from_another_process(client, make_hotel):
+    hotel_id = await make_hotel(children=1)
+    response = await client.get(f'/hotels/{hotel_id}/rate_matrix')
+    assert len(response.json()['room_type_ids']) == 1
+
+    # Another worker's write reaches this one only through the version it bumps.
+    async with SessionLocal() as db:
+        await db.execute(insert(models.RoomType).values(hotel_id=hotel_id, name='Suite', number_of_rooms=1))
+        await db.execute(update(models.Hotel).where(models.Hotel.id == hotel_id).values(
+            version=models.Hotel.version + 1))
+        await db.commit()
+
+    response = await client.get(f'/hotels/{hotel_id}/rate_matrix')
+    assert len(response.json()['room_type_ids']) == 2
+    assert len(response.json()['rates'][0]) == 2
+
+
+async def test_rate_matrix_follows_local_writes(client, make_hotel):
+    hotel_id = await make_hotel(children=1)
+    assert (await client.get(f'/hotels/{hotel_id}/rate_matrix')).status_code == 200
+    response = await client.post(f'/hotels/{hotel_id}/seasons', json={
+        'hotel_id': hotel_id, 'name': 'March', 'start_date': '2025-03-01', 'end_date': '2025-03-31'})
+    season_id = response.json()['id']
+    room_type_id = (await client.post(f'/hotels/{hotel_id}/room_types', json={
+        'hotel_id': hotel_id, 'name': 'Suite', 'number_of_rooms': 1})).json()['id']
+    await client.post('/occupancy_rates', json={
+        'room_type_id': room_type_id, 'season_id': season_id, 'occupancy_type': 'single', 'rate': 80})
+
+    matrix = (await client.get(f'/hotels/{hotel_id}/rate_matrix')).json()
+    assert len(matrix['season_ids']) == 2 and matrix['room_type_ids'][-1] == room_type_id
+    season = matrix['season_ids'].index(season_id)
+    assert matrix['rates'][season][-1][matrix['occupancy_types'].index('single')] == 80
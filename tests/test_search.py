@@ -0,0 +1,48 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def searchable_hotel(client, make_hotel):
+    """A hotel whose group contracts are named for the searches below."""
+    hotel_id = await make_hotel()
+    for group_name, customer, travel_agent in (('Blue Lagoon Divers', 'Marta Ruiz', None),
+                                               ('Coral Reef Club', 'Lagoon Travel', 'Atoll Tours'),
+                                               ('Mountain Hikers', 'Peter Berg', 'Summit Agency')):
+        response = await client.post(f'/hotels/{hotel_id}/group_contracts', json={
+            'hotel_id': hotel_id, 'group_name': group_name, 'customer': customer, 'travel_agent': travel_agent,
+            'start_date': '2025-02-01', 'end_date': '2025-02-05'})
+        assert response.status_code == 200, response.text
+    return hotel_id
+
+
+async def search(client, hotel_id: int, term: str):
+    response = await client.get('/group_contracts/search', params={'q': term, 'hotel_id': hotel_id})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def test_search_matches_substrings_of_any_column(client, searchable_hotel):
+    results = await search(client, searchable_hotel, 'agoo')
+    assert {result['group_name'] for result in results} == {'Blue Lagoon Divers', 'Coral Reef Club'}
+    assert all(result['hotel_id'] == searchable_hotel for result in results)
+
+    results = await search(client, searchable_hotel, 'summit')
+    assert [result['group_name'] for result in results] == ['Mountain Hikers']
+
+
+async def test_search_matches_misspellings_ranked_by_similarity(client, searchable_hotel):
+    results = await search(client, searchable_hotel, 'lagon')
+    assert {result['group_name'] for result in results} == {'Blue Lagoon Divers', 'Coral Reef Club'}
+    assert all(0 < result['score'] <= 1 for result in results)
+    assert results == sorted(results, key=lambda result: -result['score'])
+
+    results = await search(client, searchable_hotel, 'Mountain Hikrs')
+    assert [result['group_name'] for result in results] == ['Mountain Hikers']
+    assert await search(client, searchable_hotel, 'xylophone') == []
+
+
+async def test_search_term_needs_three_characters(client):
+    response = await client.get('/group_contracts/search', params={'q': 'ab'})
+    assert response.status_code == 422
@@ -0,0 +1,81 @@
+import pytest
+
+from app.core import security
+from tests.conftest import unique_name
+
+pytestmark = pytest.mark.anyio
+
+
+async def create_user(client, **fields) -> dict:
+    username = unique_name('user')
+    response = await client.post('/users/', json={'username': username, 'email': f'{username}@example.com',
+                                                  'password': 'secret', **fields})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def login(client, username: str) -> dict:
+    response = await client.post('/login', data={'username': username, 'password': 'secret'})
+    assert response.status_code == 200, response.text
+    return {'Authorization': f"Bearer {response.json()['access_token']}"}
+
+
+async def test_authenticate_as_user_with_profile(client, count_statements):
+    user = await create_user(client, profile={'first_name': 'Ada', 'company_name': 'Reef Tours'}, preferences={})
+    headers = await login(client, user['username'])
+
+    response = await client.get('/users/me/', headers=headers)
+    assert response.status_code == 200
+    assert response.json()['profile']['first_name'] == 'Ada'
+    assert response.json()['preferences'] == {}
+
+    # The principal is cached for the token, so the next request skips the lookup.
+    with count_statements() as statements:
+        assert (await client.get('/users/me/', headers=headers)).json() == response.json()
+    assert statements == []
+
+
+async def test_profile_update_retires_cached_principal(client):
+    user = await create_user(client, profile={'first_name': 'Ada'})
+    headers = await login(client, user['username'])
+    assert (await client.get('/users/me/', headers=headers)).json()['profile']['first_name'] == 'Ada'
+
+    response = await client.put(f"/users/profile/{user['id']}/", json={'first_name': 'Grace'})
+    assert response.status_code == 200
+    assert (await client.get('/users/me/', headers=headers)).json()['profile']['first_name'] == 'Grace'
+
+
+async def test_invalidation_during_lookup_is_not_cached(client, monkeypatch, count_statements):
+    user = await create_user(client)
+    headers = await login(client, user['username'])
+    get_user_by_username = security.crud.get_user_by_username
+
+    async def lookup_racing_a_write(*args, **kwargs):
+        db_user = await get_user_by_username(*args, **kwargs)
+        security.invalidate_principal(db_user.id)
+        return db_user
+
+    monkeypatch.setattr(security.crud, 'get_user_by_username', lookup_racing_a_write)
+    assert (await client.get('/users/me/', headers=headers)).status_code == 200
+    monkeypatch.undo()
+
+    with count_statements() as statements:
+        assert (await client.get('/users/me/', headers=headers)).status_code == 200
+    assert statements
+
+
+@pytest.mark.parametrize('field, detail', [('email', 'Email already registered'),
+                                           ('username', 'Username already registered')])
+async def test_duplicate_user_details_are_rejected(client, field, detail):
+    user, other_user = await create_user(client), await create_user(client)
+
+    username = unique_name('user')
+    fields = {'username': username, 'email': f'{username}@example.com', field: user[field]}
+    response = await client.post('/users/', json={**fields, 'password': 'secret'})
+    assert response.status_code == 400
+    assert response.json()['detail'] == detail
+
+    response = await client.put(f"/users/{other_user['id']}/", json={field: user[field]})
+    assert response.status_code == 400
+    assert response.json()['detail'] == detail
+    assert (await client.get(f"/users/{other_user['id']}/")).json()[field] == other_user[field]